@@ -0,0 +1,93 @@
+"""
+Module: adversarial
+
+An adversarial ("deferred answer") version of WordyModel.
+
+AdversarialWordyModel never commits to an answer up front. After each guess
+it partitions the words that could still be the answer by the feedback code
+(see scoring) they would produce for the guess, and keeps the largest group.
+The player only wins once a single candidate is left and they guess it.
+
+The partition step scores the guess against every candidate in one
+vectorized pass and counts the codes that actually occur with np.unique, so
+even the first guess against the full long word list stays well within
+interactive latency, and long words (whose 3**word_size possible codes don't
+fit in memory as a table) work too.
+"""
+
+import numpy as np
+
+import lexicon
+from models import HardModeError, LetterState, NotAWordError, WordyModel
+from scoring import check_guess_batch, decode_pattern, encode_words
+
+
+class AdversarialWordyModel(WordyModel):
+    """ A WordyModel that picks its answer as late as possible. self.word is
+    always one of the remaining candidates, but it may change after every
+    guess. """
+
+    # instance variables
+    letters: np.ndarray     # uint8 letter matrix of the word list
+    candidates: np.ndarray  # ids of the words that could still be the answer
+
+    def __init__(self, word_size, word_list_filename, preselected_word=None, hard_mode=False):
+        super().__init__(word_size, word_list_filename, preselected_word, hard_mode)
+
+        self.letters = lexicon.derived(self.word_list, 'letters', encode_words)
+        self.candidates = np.arange(len(self.word_list), dtype=np.int32)
+
+    def partition(self, guess: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """ Returns the feedback code that each candidate would give for
+        <guess>, the distinct codes given (in increasing order), and the number
+        of candidates giving each of them.
+
+        Parameters:
+            guess: (str) The guess to score.
+        """
+        guess_letters = encode_words([guess])
+        codes = check_guess_batch(guess_letters, self.letters[self.candidates])
+        patterns, counts = np.unique(codes, return_counts=True)
+        return codes, patterns, counts
+
+    def check_guess(self, guess: str) -> tuple[bool, list[LetterState], dict[str, LetterState]]:
+        """ Checks the given <guess> against the remaining candidates, keeping
+        the largest group of candidates that give the same result, and
+        returns that result (see WordyModel.check_guess).
+
+        The guess is only correct once it is the last remaining candidate.
+
+        Parameters:
+            guess: (str) The guess to check.
+
+        Raises:
+            NotAWordError: When guess is not in the word list.
+            HardModeError: When guess ignores a revealed hint (hard mode only).
+        """
+        if guess not in self.word_list:
+            raise NotAWordError
+
+        if self.hard_mode:
+            violation = self.constraints.violation(guess)
+            if violation is not None:
+                raise HardModeError(violation)
+
+        codes, patterns, counts = self.partition(guess)
+
+        # never give the win away while any other result is possible
+        winning_code = 3 ** self.word_size - 1
+        if len(patterns) > 1:
+            counts[patterns == winning_code] = 0
+        code = int(patterns[np.argmax(counts)])
+
+        self.candidates = self.candidates[codes == code]
+        self.word = self.word_list[int(self.candidates[0])]
+        self.word_letter_positions = self.letter_positions(self.word)
+
+        letters = decode_pattern(code, self.word_size)
+        self.constraints.update(guess, letters)
+        return (code == winning_code, letters, dict(zip(guess, letters)))
+
+    def remaining(self) -> list[str]:
+        """ Returns the words that could still be the answer. """
+        return [self.word_list[int(i)] for i in self.candidates]
@@ -0,0 +1,261 @@
+"""
+Module: benchmarks
+
+Reproducible benchmarks for the model and view hot paths.
+
+Each benchmark is timed with timeit: after a warmup that picks how many
+calls make up a sample, several samples are taken and the best one is
+reported as seconds per operation, along with the spread of the samples.
+Results can be saved as a JSON baseline and later runs compared against it;
+any benchmark that got slower by more than the noise measured in both runs
+(or than a fixed --threshold) is reported as a regression (and the exit
+status is 1).
+
+    python benchmarks.py --save benchmark_baseline.json
+    python benchmarks.py --compare benchmark_baseline.json
+
+View benchmarks need an X display. If DISPLAY isn't set, a virtual display is
+started with Xvfb when it is installed; otherwise the view benchmarks are
+skipped.
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+import timeit
+from typing import Callable, Optional
+
+import lexicon
+from models import WordyModel, score_cache, score_guess, score_with_positions
+
+WORD_FILES = {"short": "short_wordlist.txt", "long": "long_wordlist.txt"}
+WORD_SIZES = (4, 5, 7)
+BOARD_SIZES = ((6, 5), (10, 8), (20, 12))  # (num_guesses, word_size)
+
+# samples taken of each benchmark
+REPEAT = 7
+
+# a benchmark only counts as slower when it is this many times the spread of
+# both runs slower, and never for less than MIN_THRESHOLD
+NOISE_MULTIPLE = 3
+MIN_THRESHOLD = 0.05
+
+# a benchmark: the code to time, and the number of operations each call makes
+Case = tuple[Callable[[], object], int]
+
+
+def time_cases(cases: dict[str, Case], repeat: int = REPEAT) -> dict[str, tuple[float, float]]:
+    """ Returns the best time (in seconds) per operation of each case, and
+    the spread of its samples: how far their median is above the best one,
+    as a fraction of it.
+
+    Each sample is enough calls to take at least 0.2 seconds (found with
+    timeit's autorange), and is preceded by an untimed call to warm up what
+    the case uses. The samples are taken in rounds of one sample per case,
+    so a stretch of time when the machine is busy slows down one sample of
+    several cases rather than every sample of one case.
+
+    Parameters:
+        cases (dict[str, Case]): The benchmarks, by name.
+        repeat (int): The number of samples to take of each case.
+    """
+    timers = {name: timeit.Timer(func) for name, (func, _) in cases.items()}
+    numbers = {name: timer.autorange()[0] for name, timer in timers.items()}
+
+    samples: dict[str, list[float]] = {name: [] for name in cases}
+    for _ in range(repeat):
+        for name, (func, _) in cases.items():
+            func()
+            samples[name].append(timers[name].timeit(numbers[name]))
+
+    results = {}
+    for name, (_, ops) in cases.items():
+        times = sorted(samples[name])
+        results[name] = (times[0] / (numbers[name] * ops), times[len(times) // 2] / times[0] - 1)
+    return results
+
+
+def model_cases(filename: str, word_size: int) -> dict[str, Case]:
+    """ Returns the model benchmarks for the words of length <word_size> in
+    the file named <filename>. """
+    model = WordyModel(word_size, filename)
+    guesses = list(model.word_list[:200])
+
+    def cold_load():
+        lexicon.clear_cache()
+        model.set_word_list(filename)
+
+    def check_guesses():
+        # every guess is scored, whatever an earlier benchmark left in the
+        # shared cache
+        score_cache.clear()
+        for guess in guesses:
+            model.check_guess(guess)
+
+    return {
+        "set_word_list_cold": (cold_load, 1),
+        "set_word_list_warm": (lambda: model.set_word_list(filename), 1),
+        "check_guess": (check_guesses, len(guesses)),
+        "letter_positions": (lambda: [model.letter_positions(guess) for guess in guesses], len(guesses)),
+        "score_guess": (lambda: [score_guess(guess, model.word) for guess in guesses], len(guesses)),
+        "score_with_positions": (lambda: [score_with_positions(guess, model.word_letter_positions)
+                                          for guess in guesses], len(guesses)),
+        "score_cache_hit": (lambda: [score_cache.score(guess, model.word) for guess in guesses], len(guesses)),
+    }
+
+
+def model_benchmarks() -> dict[str, tuple[float, float]]:
+    """ Times WordyModel.set_word_list, check_guess and letter_positions, and
+    the ways of scoring a guess. """
+    cases = {}
+    for list_name, filename in WORD_FILES.items():
+        for word_size in WORD_SIZES:
+            for case, func in model_cases(filename, word_size).items():
+                cases[f"{case}/{list_name}/size{word_size}"] = func
+    return time_cases(cases)
+
+
+def start_virtual_display() -> Optional[subprocess.Popen]:
+    """ Makes sure an X display is available, starting Xvfb if needed.
+
+    Returns:
+        (subprocess.Popen | None) The Xvfb process that was started (to be
+        terminated by the caller), or None if no process was started.
+
+    Raises:
+        RuntimeError: When there is no display and Xvfb isn't installed.
+    """
+    if os.environ.get("DISPLAY"):
+        return None
+    if shutil.which("Xvfb") is None:
+        raise RuntimeError("no DISPLAY and Xvfb is not installed")
+
+    display = ":99"
+    xvfb = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x1024x24"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    os.environ["DISPLAY"] = display
+    return xvfb
+
+
+def view_cases(root, settings: dict, num_guesses: int, word_size: int) -> dict[str, Case]:
+    """ Returns the view benchmarks for a board of the given size, drawn in
+    the Tk window <root>. """
+    from models import LetterState
+    from views import GuessesFrame
+
+    board_settings = copy.deepcopy(settings)
+    board_settings['num_guesses'] = num_guesses
+    board_settings['word_size'] = word_size
+    board_settings['ui']['guesses']['process_wait_time'] = 0
+
+    def build():
+        frame = GuessesFrame(root, board_settings)
+        root.update_idletasks()
+        frame.destroy()
+
+    frame = GuessesFrame(root, board_settings)
+    states = [LetterState.CORRECT, LetterState.MISPLACED, LetterState.INCORRECT] * word_size
+    shift = [0]
+
+    def show_result():
+        # change every letter on each call, so no update is skipped
+        shift[0] = (shift[0] + 1) % 3
+        frame.show_guess_result(0, states[shift[0]:shift[0] + word_size])
+        root.update_idletasks()
+
+    return {"guesses_frame_init": (build, 1), "show_guess_result": (show_result, 1)}
+
+
+def view_benchmarks(settings: dict) -> dict[str, tuple[float, float]]:
+    """ Times GuessesFrame construction and show_guess_result for each of the
+    board sizes. """
+    import tkinter as tk
+
+    root = tk.Tk()
+    try:
+        cases = {}
+        for num_guesses, word_size in BOARD_SIZES:
+            for case, func in view_cases(root, settings, num_guesses, word_size).items():
+                cases[f"{case}/{num_guesses}x{word_size}"] = func
+        return time_cases(cases)
+    finally:
+        root.destroy()
+
+
+def noise_threshold(spread: float, baseline_spread: float) -> float:
+    """ Returns the slowdown (as a fraction) that stands out from the noise
+    of two runs whose samples had the given spreads. """
+    return max(MIN_THRESHOLD, NOISE_MULTIPLE * (spread + baseline_spread))
+
+
+def compare(results: dict[str, tuple[float, float]], baseline: dict[str, tuple[float, float]],
+            threshold: Optional[float] = None) -> list[str]:
+    """ Returns a description of each benchmark in <results> that is slower
+    than in <baseline> by more than <threshold> (a fraction, e.g. 0.2 for
+    20%), or by more than the noise of both runs if <threshold> is None. """
+    regressions = []
+    for name, (seconds, spread) in sorted(results.items()):
+        if name not in baseline:
+            continue
+        before, before_spread = baseline[name]
+        limit = noise_threshold(spread, before_spread) if threshold is None else threshold
+        if seconds > before * (1 + limit):
+            regressions.append(f"{name}: {before * 1e6:.1f}us -> {seconds * 1e6:.1f}us "
+                               f"(+{100 * (seconds / before - 1):.0f}%, limit +{100 * limit:.0f}%)")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Wordy model and view hot paths.")
+    parser.add_argument("--save", metavar="FILE", help="save the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare the results with a JSON baseline")
+    parser.add_argument("--threshold", type=float,
+                        help="slowdown (as a fraction) that counts as a regression "
+                             "(default: worked out from the spread of each benchmark)")
+    parser.add_argument("--skip-views", action="store_true", help="don't run the view benchmarks")
+    args = parser.parse_args()
+
+    with open("settings.json", 'r') as settings_file:
+        settings = json.load(settings_file)
+
+    results = model_benchmarks()
+
+    if not args.skip_views:
+        xvfb = None
+        try:
+            xvfb = start_virtual_display()
+            results.update(view_benchmarks(settings))
+        except Exception as e:
+            print(f"skipping view benchmarks: {e}", file=sys.stderr)
+        finally:
+            if xvfb is not None:
+                xvfb.terminate()
+
+    for name, (seconds, spread) in sorted(results.items()):
+        print(f"{name:45} {seconds * 1e6:12.2f} us  (spread {100 * spread:4.1f}%)")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({"python": platform.python_version(),
+                       "platform": platform.platform(),
+                       "results": {name: seconds for name, (seconds, _) in results.items()},
+                       "spread": {name: spread for name, (_, spread) in results.items()}},
+                      f, indent=4, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            saved = json.load(f)
+        # baselines saved before spreads were recorded count as noiseless
+        baseline = {name: (seconds, saved.get("spread", {}).get(name, 0.0))
+                    for name, seconds in saved["results"].items()}
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        sys.exit(1 if regressions else 0)
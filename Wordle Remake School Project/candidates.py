@@ -0,0 +1,62 @@
+"""
+Module: candidates
+
+Incremental tracking of the answers that are still possible during a game.
+
+A CandidateSet starts with every word in the word list and is narrowed after
+each guess using only that guess's result: the new set is the old set ANDed
+with the words consistent with the result (see pattern_index), so the cost
+of a guess doesn't grow with the number of guesses already made.
+"""
+
+from typing import Sequence
+
+from models import LetterState
+from pattern_index import PatternIndex
+
+
+class CandidateSet:
+    """ The words that could still be the answer, as a bitset over a
+    PatternIndex. """
+
+    # instance variables
+    index: PatternIndex  # index of the word list
+    bits: int            # bitset of the remaining candidates
+
+    def __init__(self, index: PatternIndex) -> None:
+        self.index = index
+        self.bits = index.all_words
+
+    def narrow(self, guess: str, letter_states: Sequence[LetterState]) -> None:
+        """ Keeps only the candidates that would have produced <letter_states>
+        for <guess>.
+
+        Parameters:
+            guess (str): The word that was guessed.
+            letter_states (Sequence[LetterState]): The result of the guess, as
+                returned by WordyModel.check_guess.
+        """
+        self.bits = self.index.consistent_with(guess, letter_states, self.bits)
+
+    def reset(self) -> None:
+        """ Makes every word a candidate again. """
+        self.bits = self.index.all_words
+
+    @property
+    def count(self) -> int:
+        """ The number of remaining candidates. """
+        return self.bits.bit_count()
+
+    def sample(self, size: int) -> list[str]:
+        """ Returns up to <size> of the remaining candidates, in word list
+        order. """
+        words = []
+        bits = self.bits
+        while bits and len(words) < size:
+            low = bits & -bits
+            words.append(self.index.words[low.bit_length() - 1])
+            bits ^= low
+        return words
+
+    def __len__(self) -> int:
+        return self.count
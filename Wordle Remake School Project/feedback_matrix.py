@@ -0,0 +1,197 @@
+"""
+Module: feedback_matrix
+
+Precomputed feedback codes for every (guess, answer) pair of a word list.
+
+Hints, solvers and the adversarial mode all need to know the feedback pattern
+(see scoring) that each guess would produce against each possible answer.
+load_feedback_matrix builds that matrix once, in parallel across CPU cores,
+saves it as a .npy file next to the word file, and memory-maps it on later
+runs. The cache file name includes a digest of the word list, so a changed
+word list is never matched with a stale matrix, and a cache file that can't
+be read is rebuilt.
+"""
+
+import glob
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence
+
+import numpy as np
+
+import lexicon
+from models import WordyModel
+from scoring import check_guess_batch, encode_words, pattern_dtype
+
+
+# upper bound on the number of letters scored per chunk, which keeps the
+# temporary arrays of check_guess_batch to a few tens of MB
+_CHUNK_LETTERS = 4_000_000
+
+# word lists smaller than this are scored in-process; starting a pool of
+# worker processes costs more than it saves
+_MIN_PARALLEL_WORDS = 2_000
+
+# letter matrix of the words being scored, set in each worker process
+_worker_letters: Optional[np.ndarray] = None
+
+# maps cache file name to the loaded (memory-mapped) matrix
+_loaded: dict[str, np.ndarray] = {}
+_loaded_lock = threading.Lock()
+
+
+def _init_worker(letters: np.ndarray) -> None:
+    global _worker_letters
+    _worker_letters = letters
+
+
+def _score_rows(letters: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """ Scores guesses letters[start:stop] against every word in <letters>. """
+    return check_guess_batch(letters[start:stop, None, :], letters[None, :, :])
+
+
+def _score_rows_in_worker(bounds: tuple[int, int]) -> np.ndarray:
+    return _score_rows(_worker_letters, *bounds)
+
+
+def build_feedback_matrix(words: Sequence[str], processes: Optional[int] = None) -> np.ndarray:
+    """ Returns the matrix of feedback codes for every pair of words, where
+    entry [g, a] is the code for guessing words[g] when the answer is
+    words[a].
+
+    Rows are scored in chunks; large word lists spread the chunks over a
+    pool of worker processes. The workers are spawned rather than forked,
+    since this is often called from a background thread (e.g. for a hint)
+    and forking a process that has other threads running can deadlock.
+
+    Parameters:
+        words (Sequence[str]): Same-sized words (e.g. a model's word_list).
+        processes (int): Number of worker processes to use, or None to use
+            one per CPU core.
+    """
+    letters = encode_words(words)
+    num_words = len(words)
+    word_size = letters.shape[1] if num_words else 0
+
+    matrix = np.empty((num_words, num_words), dtype=pattern_dtype(word_size))
+    if num_words == 0:
+        return matrix
+
+    rows_per_chunk = max(1, _CHUNK_LETTERS // (num_words * word_size))
+    chunks = [(start, min(start + rows_per_chunk, num_words))
+              for start in range(0, num_words, rows_per_chunk)]
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes <= 1 or num_words < _MIN_PARALLEL_WORDS or len(chunks) == 1:
+        for start, stop in chunks:
+            matrix[start:stop] = _score_rows(letters, start, stop)
+    else:
+        with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker, initargs=(letters,)) as pool:
+            for (start, stop), rows in zip(chunks, pool.map(_score_rows_in_worker, chunks)):
+                matrix[start:stop] = rows
+
+    return matrix
+
+
+def feedback_matrix_path(word_list_file: str, word_size: int, words: Sequence[str]) -> str:
+    """ Returns the name of the cache file for the feedback matrix of
+    <words>, which is stored next to <word_list_file>. The digest of the
+    words in the name is only worked out once per word list (see
+    lexicon.derived).
+
+    Parameters:
+        word_list_file (str): Name of the file the words were loaded from.
+        word_size (int): The length of the words.
+        words (Sequence[str]): The words in the matrix, in order.
+    """
+    digest = lexicon.derived(words, 'digest',
+                             lambda words: hashlib.sha1('\n'.join(words).encode('utf-8')).hexdigest()[:16])
+    return f"{word_list_file}.{word_size}-{digest}.feedback.npy"
+
+
+def _remove_stale_caches(word_list_file: str, word_size: int, current: str) -> None:
+    """ Deletes cached matrices for older versions of the word list. """
+    for path in glob.glob(glob.escape(f"{word_list_file}.{word_size}-") + "*.feedback.npy"):
+        if path != current:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _read_cache(path: str, num_words: int) -> Optional[np.ndarray]:
+    """ Returns the matrix saved in <path>, memory-mapped, or None if the
+    file is missing, damaged or the wrong size. """
+    try:
+        matrix = np.load(path, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    if matrix.shape != (num_words, num_words):
+        return None
+    return matrix
+
+
+def _write_cache(path: str, matrix: np.ndarray) -> bool:
+    """ Saves <matrix> to <path>, returning whether it could be written.
+
+    The matrix is written to a temporary file of its own and then renamed,
+    so processes saving the same matrix at once never write to one file.
+    """
+    directory, name = os.path.split(path)
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix=name + '.', suffix='.tmp', dir=directory or '.')
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, matrix)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def load_feedback_matrix(model: WordyModel, processes: Optional[int] = None) -> np.ndarray:
+    """ Returns the feedback matrix for the model's word list (see
+    build_feedback_matrix), with rows and columns in word_list order.
+
+    The matrix is loaded from its cache file with mmap if it exists and can
+    be read; otherwise it is built and saved to the cache file first. If the
+    cache file cannot be written, the matrix is kept in memory only.
+
+    Parameters:
+        model (WordyModel): The model whose word list to use.
+        processes (int): Number of worker processes for a cold build, or
+            None to use one per CPU core.
+    """
+    path = feedback_matrix_path(model.word_list_file, model.word_size, model.word_list)
+
+    with _loaded_lock:
+        matrix = _loaded.get(path)
+        if matrix is not None:
+            return matrix
+
+        num_words = len(model.word_list)
+        matrix = _read_cache(path, num_words)
+        if matrix is None:
+            matrix = build_feedback_matrix(model.word_list, processes)
+            if _write_cache(path, matrix):
+                _remove_stale_caches(model.word_list_file, model.word_size, path)
+                # map the saved copy so the built one can be freed
+                saved = _read_cache(path, num_words)
+                if saved is not None:
+                    matrix = saved
+
+        _loaded[path] = matrix
+        return matrix
@@ -0,0 +1,198 @@
+"""
+Module: instrumentation
+
+Optional latency instrumentation for the Wordy app.
+
+instrument() wraps the hot paths of a model and view in timers, before the
+controller is created:
+
+    key_handler        handling a batch of key presses (on-screen, physical
+                       or pasted; see WordyController.handle_pending_keys)
+    key_to_paint       from handling key presses until Tk is idle again,
+                       i.e. the change has been drawn
+    check_guess        WordyModel.check_guess
+    show_guess_result  starting the reveal of a guess
+    guess_reveal       from starting the reveal of a guess until it is done
+    set_key_colors     updating the keyboard colors
+
+Every timing goes into a log-scale histogram, and (up to a limit) into a
+list of trace events that can be saved in the Chrome trace-event format and
+opened in chrome://tracing or Perfetto.
+
+Nothing is wrapped unless instrument() is called, so when the
+instrumentation is turned off (the default; see "trace_file" in
+settings.json) it costs nothing at all.
+"""
+
+import functools
+import json
+import threading
+import time
+from array import array
+from typing import Any, Callable, Optional
+
+
+class LatencyHistogram:
+    """ Counts of durations in log-scale buckets: each power of two (in ns)
+    is split into SUB_BUCKETS buckets, so a bucket is at most 1/SUB_BUCKETS
+    of its value wide. Recording a duration is a couple of integer
+    operations. """
+
+    SUB_BITS = 2
+    SUB_BUCKETS = 1 << SUB_BITS
+
+    # instance variables
+    counts: array  # number of durations in each bucket
+    count: int     # number of durations recorded
+    total: int     # sum of the durations (ns)
+    max: int       # longest duration (ns)
+
+    def __init__(self) -> None:
+        self.counts = array('Q', [0]) * (64 * self.SUB_BUCKETS)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @classmethod
+    def bucket(cls, ns: int) -> int:
+        """ Returns the bucket of a duration of <ns> nanoseconds. """
+        bits = ns.bit_length()
+        if bits <= cls.SUB_BITS:
+            return ns
+        return (bits - cls.SUB_BITS) * cls.SUB_BUCKETS + ((ns >> (bits - cls.SUB_BITS - 1)) & (cls.SUB_BUCKETS - 1))
+
+    @classmethod
+    def bucket_limit(cls, bucket: int) -> int:
+        """ Returns the longest duration (ns) that falls in <bucket>. """
+        if bucket < cls.SUB_BUCKETS:
+            return bucket
+        shift, sub = divmod(bucket, cls.SUB_BUCKETS)
+        return ((cls.SUB_BUCKETS + sub + 1) << (shift - 1)) - 1
+
+    def record(self, ns: int) -> None:
+        """ Adds a duration of <ns> nanoseconds. """
+        self.counts[self.bucket(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, fraction: float) -> int:
+        """ Returns (an upper bound of) the duration in ns that <fraction>
+        (e.g. 0.99) of the recorded durations don't exceed. """
+        if self.count == 0:
+            return 0
+        rank = max(1, round(fraction * self.count))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.bucket_limit(bucket), self.max)
+        return self.max
+
+
+class Tracer:
+    """ Collects the timings of named stages. """
+
+    # instance variables
+    start: int                               # perf_counter_ns when the tracer was created
+    histograms: dict[str, LatencyHistogram]  # stage -> its durations
+    events: list[dict[str, Any]]             # trace events, in the Chrome trace-event format
+    max_events: int                          # trace events kept (histograms count every timing)
+
+    def __init__(self, max_events: int = 100_000) -> None:
+        self.start = time.perf_counter_ns()
+        self.histograms = {}
+        self.events = []
+        self.max_events = max_events
+
+    def record(self, stage: str, start: int, end: int) -> None:
+        """ Records that <stage> ran from <start> to <end> (perf_counter_ns
+        values). """
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = LatencyHistogram()
+        histogram.record(end - start)
+
+        if len(self.events) < self.max_events:
+            self.events.append({"name": stage, "ph": "X", "pid": 1, "tid": threading.get_ident(),
+                                "ts": (start - self.start) / 1000, "dur": (end - start) / 1000})
+
+    def timed(self, stage: str, func: Callable) -> Callable:
+        """ Returns <func> wrapped so that every call is recorded as <stage>. """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(stage, start, time.perf_counter_ns())
+
+        return wrapper
+
+    def save_trace(self, filename: str) -> None:
+        """ Writes the trace events to <filename> as Chrome trace-event JSON. """
+        with open(filename, 'w') as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+    def summary(self) -> str:
+        """ Returns a table of the count and latency percentiles of each
+        stage. """
+        lines = [f"{'stage':20} {'count':>8} {'mean':>10} {'p50':>10} {'p99':>10} {'max':>10}"]
+        for stage, histogram in sorted(self.histograms.items()):
+            mean = histogram.total / histogram.count
+            lines.append(f"{stage:20} {histogram.count:8} {mean / 1e6:8.3f}ms "
+                         f"{histogram.percentile(0.5) / 1e6:8.3f}ms {histogram.percentile(0.99) / 1e6:8.3f}ms "
+                         f"{histogram.max / 1e6:8.3f}ms")
+        return '\n'.join(lines)
+
+
+def instrument(model: Any, view: Any, tracer: Tracer) -> None:
+    """ Wraps the hot paths of <model> and <view> (see the module docstring)
+    so they are recorded in <tracer>. Must be called before the controller
+    is created.
+
+    Parts the view doesn't have (e.g. a NullView has no keyboard frame or
+    window) are left out.
+    """
+    model.check_guess = tracer.timed("check_guess", model.check_guess)
+
+    window = getattr(view, 'window', None)
+
+    def time_key(handler: Callable[[], None]) -> Callable[[], None]:
+        handler = tracer.timed("key_handler", handler)
+        if window is None:
+            return handler
+
+        def key_pressed():
+            start = time.perf_counter_ns()
+            handler()
+            # idle callbacks run in order, so this one runs after the redraw
+            window.after_idle(lambda: tracer.record("key_to_paint", start, time.perf_counter_ns()))
+
+        return key_pressed
+
+    # every key press reaches the controller through guard_input, so time the
+    # handlers it guards (they run once the view lets the input through)
+    guard_input = view.guard_input
+    view.guard_input = lambda handler: guard_input(time_key(handler))
+
+    keyboard_frame = getattr(view, 'keyboard_frame', None)
+    if keyboard_frame is not None:
+        keyboard_frame.set_key_colors = tracer.timed("set_key_colors", keyboard_frame.set_key_colors)
+
+    guess_frame = getattr(view, 'guess_frame', None)
+    if guess_frame is not None:
+        show_guess_result = tracer.timed("show_guess_result", guess_frame.show_guess_result)
+
+        def timed_show_guess_result(guess_num, results, on_complete: Optional[Callable[[], None]] = None):
+            start = time.perf_counter_ns()
+
+            def reveal_done():
+                tracer.record("guess_reveal", start, time.perf_counter_ns())
+                if on_complete is not None:
+                    on_complete()
+
+            show_guess_result(guess_num, results, reveal_done)
+
+        guess_frame.show_guess_result = timed_show_guess_result
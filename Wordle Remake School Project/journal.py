@@ -0,0 +1,208 @@
+"""
+Module: journal
+
+Append-only binary journal of played games.
+
+Every accepted guess and every game end is written as a fixed-size binary
+record, so a journal can be scanned (see stats) without parsing anything or
+re-playing games. Records hold word ids (see lexicon.word_id), packed
+feedback codes (see models.encode_pattern) and timestamps.
+
+Records are buffered in memory and written in blocks. The journal is a
+directory of segment files, journal.000001.bin, journal.000002.bin, ...;
+each time a journal is opened it starts a new segment, and a segment is
+closed once it holds segment_records records, so no file is ever rewritten
+and segments can be read (or scanned in parallel) while the journal is in
+use.
+
+Layout (all integers little-endian):
+    header: magic (8 bytes), version (u16), word size (u8), padding (1 byte),
+            id of the next game when the segment was started (u32)
+    record: kind (u8), guess number (u8), padding (2 bytes), game id (u32),
+            word id (u32), code (u64), timestamp in ns since the epoch (u64)
+
+The code is a u64 since feedback codes of words of 21 letters or more don't
+fit in 32 bits. Version 1 segments, which stored it as a u32, can still be
+read.
+
+For a GUESS record the word is the guess and the code its feedback code; for
+a GAME_END record the guess number is the number of guesses made, the word
+is the answer, and the code is 1 if the game was won (0 if it was lost).
+"""
+
+import os
+import struct
+import time
+from typing import BinaryIO, Iterator, Optional
+
+JOURNAL_MAGIC = b'WORDYJNL'
+JOURNAL_VERSION = 2
+HEADER = struct.Struct('<8sHBxI')
+RECORD = struct.Struct('<BBxxIIQQ')
+
+# record layout of each version that can be read
+_RECORDS = {1: struct.Struct('<BBxxIIIQ'), 2: RECORD}
+
+# record kinds
+GUESS = 1
+GAME_END = 2
+
+SEGMENT_PREFIX = "journal."
+SEGMENT_SUFFIX = ".bin"
+
+
+def segment_paths(directory: str) -> list[str]:
+    """ Returns the paths of the journal segments in <directory>, oldest
+    first. """
+    if not os.path.isdir(directory):
+        return []
+    names = [name for name in os.listdir(directory)
+             if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)]
+    return [os.path.join(directory, name) for name in sorted(names)]
+
+
+def read_records(path: str, chunk_records: int = 65536) -> Iterator[tuple[int, int, int, int, int, int]]:
+    """ Yields the records of one segment as (kind, guess number, game id,
+    word id, code, timestamp) tuples, reading the file in chunks.
+
+    A partial record at the end (e.g. from a crash while writing) is
+    ignored.
+
+    Raises:
+        ValueError: When the file is not a journal segment.
+    """
+    with open(path, 'rb') as f:
+        magic, version, _, _ = HEADER.unpack(f.read(HEADER.size))
+        if magic != JOURNAL_MAGIC or version not in _RECORDS:
+            raise ValueError(f"{path} is not a Wordy journal segment")
+        record = _RECORDS[version]
+
+        while True:
+            chunk = f.read(record.size * chunk_records)
+            usable = len(chunk) - len(chunk) % record.size
+            if usable:
+                yield from record.iter_unpack(memoryview(chunk)[:usable])
+            if len(chunk) < record.size * chunk_records:
+                break
+
+
+class Journal:
+    """ Writes game records to a journal directory. """
+
+    # instance variables
+    directory: str        # the journal directory
+    word_size: int        # size of the words the ids refer to
+    segment_records: int  # records per segment
+    buffer_records: int   # records buffered before they are written
+    next_game_id: int     # id of the next game started
+    buffer: bytearray     # records not written yet
+    segment: Optional[BinaryIO]  # the open segment file (None until the first write)
+    segment_number: int   # number of the open (or next) segment
+    records_in_segment: int    # records in the open segment
+
+    def __init__(self, directory: str, word_size: int, segment_records: int = 1 << 20,
+                 buffer_records: int = 256) -> None:
+        self.directory = directory
+        self.word_size = word_size
+        self.segment_records = segment_records
+        self.buffer_records = buffer_records
+        self.buffer = bytearray()
+        self.segment = None
+        self.records_in_segment = 0
+
+        os.makedirs(directory, exist_ok=True)
+        paths = segment_paths(directory)
+        self.segment_number = 1
+        self.next_game_id = 1
+        if paths:
+            last = os.path.basename(paths[-1])
+            self.segment_number = int(last[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]) + 1
+            self.next_game_id = self._last_game_id(paths) + 1
+
+    def _last_game_id(self, paths: list[str]) -> int:
+        """ Returns the highest game id used so far, or 0 if there is none.
+
+        Games started before the newest segment have lower ids than the one
+        in its header, and games started since then have their records in
+        it, so only the newest segment needs to be read.
+        """
+        with open(paths[-1], 'rb') as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return 0
+        last_id = HEADER.unpack(header)[3] - 1
+        for record in read_records(paths[-1]):
+            last_id = max(last_id, record[2])
+        return last_id
+
+    def new_game(self) -> int:
+        """ Returns the id of a new game. """
+        game_id = self.next_game_id
+        self.next_game_id += 1
+        return game_id
+
+    def _append(self, kind: int, guess_num: int, game_id: int, word_id: int, code: int) -> None:
+        self.buffer += RECORD.pack(kind, guess_num, game_id, word_id, code, time.time_ns())
+        if len(self.buffer) >= RECORD.size * self.buffer_records:
+            self.flush()
+
+    def record_guess(self, game_id: int, guess_num: int, word_id: int, code: int) -> None:
+        """ Records a guess.
+
+        Parameters:
+            game_id (int): The game (see new_game).
+            guess_num (int): The number of the guess in the game (from 0).
+            word_id (int): Word id of the guess.
+            code (int): Feedback code of the guess.
+        """
+        self._append(GUESS, guess_num, game_id, word_id, code)
+
+    def record_game_end(self, game_id: int, num_guesses: int, answer_id: int, won: bool) -> None:
+        """ Records the end of a game.
+
+        Parameters:
+            game_id (int): The game (see new_game).
+            num_guesses (int): The number of guesses made.
+            answer_id (int): Word id of the answer.
+            won (bool): Whether the answer was guessed.
+        """
+        self._append(GAME_END, num_guesses, game_id, answer_id, 1 if won else 0)
+
+    def flush(self) -> None:
+        """ Writes the buffered records to the segment files. """
+        start = 0
+        while start < len(self.buffer):
+            if self.segment is None:
+                path = os.path.join(self.directory, f"{SEGMENT_PREFIX}{self.segment_number:06d}{SEGMENT_SUFFIX}")
+                self.segment = open(path, 'xb')
+                self.segment.write(HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, self.word_size, self.next_game_id))
+                self.records_in_segment = 0
+
+            count = min((len(self.buffer) - start) // RECORD.size, self.segment_records - self.records_in_segment)
+            end = start + count * RECORD.size
+            with memoryview(self.buffer) as view:
+                self.segment.write(view[start:end])
+            self.records_in_segment += count
+            start = end
+
+            if self.records_in_segment >= self.segment_records:
+                self.segment.close()
+                self.segment = None
+                self.segment_number += 1
+
+        self.buffer.clear()
+        if self.segment is not None:
+            self.segment.flush()
+
+    def close(self) -> None:
+        """ Writes the buffered records and closes the open segment. """
+        self.flush()
+        if self.segment is not None:
+            self.segment.close()
+            self.segment = None
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
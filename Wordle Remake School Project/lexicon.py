@@ -0,0 +1,373 @@
+"""
+Module: lexicon
+
+Process-wide cache of the word lists used by WordyModel.
+
+Loading a word list means scanning every line of the word file, which is the
+most expensive part of starting a game. The registry in this module reads
+each file once per (file, modification time), in a single pass that buckets
+the words of every length, and hands the resulting immutable word data to
+every model that asks for it, whatever its word size. If the file changes on
+disk, its modification time changes too, and the next request reloads it.
+
+Word files can also be compiled into a binary lexicon (see compile_lexicon),
+which is opened with mmap instead of being parsed:
+
+    python lexicon.py long_wordlist.txt long_wordlist.lex
+
+A compiled lexicon can be used anywhere a text word file can (e.g. as the
+word_list_file in settings.json).
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import threading
+from typing import Any, Callable, Iterable, Iterator, Sequence, Union
+
+
+class WordList(Sequence[str]):
+    """ An immutable, ordered list of words with a hashed membership index.
+
+    Indexing and iteration work like a tuple (so random.choice can pick from
+    it), while the <in> operator is a set lookup instead of a linear scan.
+    """
+
+    # instance variables
+    words: tuple[str, ...]    # the words, in file order
+    index: frozenset[str]     # the same words, for O(1) membership tests
+    derived: dict[str, Any]   # data built from the words (see derived)
+
+    __slots__ = ('words', 'index', 'derived')
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self.words = tuple(words)
+        self.index = frozenset(self.words)
+        self.derived = {}
+
+    def __getitem__(self, i):
+        return self.words[i]
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.words)
+
+    def __contains__(self, word: object) -> bool:
+        return word in self.index
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, WordList):
+            return self.words == other.words
+        return self.words == other
+
+    def __hash__(self) -> int:
+        return hash(self.words)
+
+    def __repr__(self) -> str:
+        return f"WordList({len(self.words)} words)"
+
+
+# Layout of a compiled lexicon file (all integers little-endian):
+#   header:  magic (8 bytes), version (u16), number of buckets (u16), reserved (u32)
+#   buckets: one entry per word length: word size (u16), padding (2 bytes),
+#            number of words (u32), offset of the first record (u64)
+#   records: for each bucket, <count> ASCII words of exactly <word size>
+#            bytes each, sorted so that they can be binary searched
+LEXICON_MAGIC = b'WORDYLEX'
+LEXICON_VERSION = 1
+_HEADER = struct.Struct('<8sHHI')
+_BUCKET = struct.Struct('<HxxIQ')
+
+
+class MappedWordList(Sequence[str]):
+    """ A read-only list of same-sized words stored as fixed-width records in
+    a memory-mapped compiled lexicon.
+
+    Membership tests are a binary search over the raw records, so checking a
+    guess never builds any str objects. Since the records live in the page
+    cache, every process that maps the same file shares them.
+    """
+
+    # instance variables
+    buffer: mmap.mmap        # the mapped lexicon file
+    offset: int              # offset of the first record in the buffer
+    count: int               # number of records (words)
+    word_size: int           # width of each record
+    derived: dict[str, Any]  # data built from the words (see derived)
+
+    __slots__ = ('buffer', 'offset', 'count', 'word_size', 'derived')
+
+    def __init__(self, buffer: mmap.mmap, offset: int, count: int, word_size: int) -> None:
+        self.buffer = buffer
+        self.offset = offset
+        self.count = count
+        self.word_size = word_size
+        self.derived = {}
+
+    def _record(self, i: int) -> bytes:
+        start = self.offset + i * self.word_size
+        return self.buffer[start:start + self.word_size]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.count))]
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("word index out of range")
+        return self._record(i).decode('ascii')
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str) or len(word) != self.word_size:
+            return False
+        try:
+            key = word.encode('ascii')
+        except UnicodeEncodeError:
+            return False
+        return self.find(key) >= 0
+
+    def find(self, key: bytes) -> int:
+        """ Returns the index of the record equal to <key>, or -1 if there is
+        no such record.
+
+        Parameters:
+            key (bytes): The encoded word to search for.
+        """
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = self._record(mid)
+            if record < key:
+                lo = mid + 1
+            elif record > key:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def __repr__(self) -> str:
+        return f"MappedWordList({self.count} words of size {self.word_size})"
+
+
+class CompiledLexicon:
+    """ A compiled lexicon file, opened with mmap. """
+
+    # instance variables
+    filename: str                       # name of the compiled file
+    buffer: mmap.mmap                   # the mapped file contents
+    buckets: dict[int, MappedWordList]  # word size -> words of that size
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+
+        with open(filename, 'rb') as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, num_buckets, _ = _HEADER.unpack_from(self.buffer, 0)
+        if magic != LEXICON_MAGIC:
+            raise ValueError(f"{filename} is not a compiled lexicon")
+        if version != LEXICON_VERSION:
+            raise ValueError(f"{filename} has unsupported lexicon version {version}")
+
+        self.buckets = {}
+        for i in range(num_buckets):
+            word_size, count, offset = _BUCKET.unpack_from(self.buffer, _HEADER.size + i * _BUCKET.size)
+            self.buckets[word_size] = MappedWordList(self.buffer, offset, count, word_size)
+
+    def words(self, word_size: int) -> MappedWordList:
+        """ Returns the words of length <word_size> (possibly none). """
+        if word_size not in self.buckets:
+            return MappedWordList(self.buffer, 0, 0, word_size)
+        return self.buckets[word_size]
+
+
+class TextLexicon:
+    """ A text word file, loaded into per-length buckets in a single pass. """
+
+    # instance variables
+    filename: str                 # name of the word file
+    buckets: dict[int, WordList]  # word size -> words of that size
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self.buckets = {size: WordList(words) for size, words in load_buckets(filename).items()}
+
+    def words(self, word_size: int) -> WordList:
+        """ Returns the words of length <word_size> (possibly none). """
+        if word_size not in self.buckets:
+            return WordList(())
+        return self.buckets[word_size]
+
+
+def load_buckets(filename: str) -> dict[int, list[str]]:
+    """ Reads the word file <filename> once, grouping its words by length.
+
+    Each word is stripped of surrounding whitespace and lowercased; blank
+    lines, repeated words and words with anything but the letters a-z (which
+    can't be typed on the keyboard, e.g. "cross-bun") are skipped. Words keep
+    their file order within each bucket.
+
+    Parameters:
+        filename (str): Name of the file containing a list of valid words.
+
+    Returns:
+        (dict[int, list[str]]) Mapping from word length to the words of that
+        length.
+    """
+    buckets: dict[int, list[str]] = {}
+    seen = set()
+    with open(filename, 'r') as f:
+        for word in f:
+            word = word.strip().lower()
+            if word and word not in seen and word.isascii() and word.isalpha():
+                seen.add(word)
+                buckets.setdefault(len(word), []).append(word)
+    return buckets
+
+
+def is_compiled_lexicon(filename: str) -> bool:
+    """ Returns whether the file named <filename> is a compiled lexicon. """
+    with open(filename, 'rb') as f:
+        return f.read(len(LEXICON_MAGIC)) == LEXICON_MAGIC
+
+
+def compile_lexicon(source: str, dest: str) -> None:
+    """ Compiles the text word file <source> into a binary lexicon <dest>.
+
+    Words are normalized the same way as load_buckets does, then sorted
+    within each length bucket.
+
+    Parameters:
+        source (str): Name of the text file with one word per line.
+        dest (str): Name of the compiled lexicon file to write.
+    """
+    buckets = load_buckets(source)
+
+    sizes = sorted(buckets)
+    offset = _HEADER.size + len(sizes) * _BUCKET.size
+
+    tmp_dest = dest + '.tmp'
+    with open(tmp_dest, 'wb') as f:
+        f.write(_HEADER.pack(LEXICON_MAGIC, LEXICON_VERSION, len(sizes), 0))
+        for size in sizes:
+            f.write(_BUCKET.pack(size, len(buckets[size]), offset))
+            offset += size * len(buckets[size])
+        for size in sizes:
+            f.write(''.join(sorted(buckets[size])).encode('ascii'))
+    os.replace(tmp_dest, dest)
+
+
+# maps (absolute path, mtime in ns) to the loaded lexicon for that file
+_registry: dict[tuple[str, int], Union[TextLexicon, CompiledLexicon]] = {}
+_registry_lock = threading.Lock()
+
+
+def get_lexicon(filename: str) -> Union[TextLexicon, CompiledLexicon]:
+    """ Returns the loaded lexicon for the file named <filename>.
+
+    The file is only read (or mapped) the first time it is requested, or
+    when it has been modified since it was last loaded. Every caller gets
+    the same lexicon object.
+
+    Parameters:
+        filename (str): Name of a text word file or a compiled lexicon.
+    """
+    path = os.path.abspath(filename)
+    key = (path, os.stat(path).st_mtime_ns)
+
+    with _registry_lock:
+        lex = _registry.get(key)
+        if lex is None:
+            if is_compiled_lexicon(path):
+                lex = CompiledLexicon(path)
+            else:
+                lex = TextLexicon(path)
+
+            # drop entries for older versions of the same file
+            for old_key in [k for k in _registry if k[0] == path]:
+                del _registry[old_key]
+
+            _registry[key] = lex
+
+    return lex
+
+
+def get_word_list(filename: str, word_size: int) -> Union[WordList, MappedWordList]:
+    """ Returns the words of length <word_size> in the file named <filename>.
+
+    Words of every length are loaded together, so models with different word
+    sizes are served from the same read of the file. Every caller gets the
+    same (immutable) WordList. If <filename> is a compiled lexicon, the words
+    are a MappedWordList over the mapped file instead.
+
+    Parameters:
+        filename (str): Name of the file containing a list of valid words.
+        word_size (int): Length of the words to keep.
+
+    Returns:
+        (WordList | MappedWordList) The words of the given size.
+    """
+    return get_lexicon(filename).words(word_size)
+
+
+def derived(words: Sequence[str], key: str, build: Callable[[Sequence[str]], Any]) -> Any:
+    """ Returns the data <build> computes from <words> (e.g. an index over
+    them), building it only the first time <key> is asked for.
+
+    The data is kept on the word list itself, so every model sharing the
+    list shares it too, and it is dropped along with the list when the word
+    file is reloaded. Other sequences have nowhere to keep it, so it is
+    built on every call.
+
+    Parameters:
+        words (Sequence[str]): A word list (e.g. from get_word_list).
+        key (str): Name of the data, unique for each kind of data.
+        build (Callable): Function computing the data from <words>.
+    """
+    if not isinstance(words, (WordList, MappedWordList)):
+        return build(words)
+
+    data = words.derived.get(key)
+    if data is None:
+        # two threads may both build it, but only one result is ever kept
+        data = words.derived.setdefault(key, build(words))
+    return data
+
+
+def word_id(words: Sequence[str], word: str) -> int:
+    """ Returns the id of <word> (its index in <words>), or -1 if it isn't in
+    the list.
+
+    The word -> id map of a list is only built the first time it is needed
+    (see derived); a MappedWordList is binary searched instead.
+
+    Parameters:
+        words (Sequence[str]): A word list (e.g. from get_word_list).
+        word (str): The word to look up.
+    """
+    if isinstance(words, MappedWordList):
+        return words.find(word.encode('ascii')) if word in words else -1
+
+    ids = derived(words, 'word_ids', lambda words: {w: i for i, w in enumerate(words)})
+    return ids.get(word, -1)
+
+
+def clear_cache() -> None:
+    """ Removes all the cached lexicons. """
+    with _registry_lock:
+        _registry.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile a word file into a binary lexicon.")
+    parser.add_argument("source", help="text file with one word per line")
+    parser.add_argument("dest", help="name of the compiled lexicon to write")
+    args = parser.parse_args()
+
+    compile_lexicon(args.source, args.dest)
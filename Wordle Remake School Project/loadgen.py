@@ -0,0 +1,108 @@
+"""
+Module: loadgen
+
+Load generator for the Wordy game server (see server).
+
+Opens a number of connections to the server, and on each one plays complete
+games back to back: a random valid word is guessed until the game is over.
+It then reports the p50/p99 latency of the guess requests and how many
+sessions (complete games) per second were played.
+
+    python server.py &
+    python loadgen.py --connections 50 --games 20
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Sequence
+
+import lexicon
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """ Returns the value at <fraction> (e.g. 0.99) of <sorted_values>, using
+    the nearest rank. """
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class LoadReport:
+    """ Latencies and counts collected by the load generator. """
+
+    # instance variables
+    latencies: list[float]  # seconds taken by each guess request
+    sessions: int           # games played to the end
+    seconds: float          # wall clock time taken
+
+    def __init__(self) -> None:
+        self.latencies = []
+        self.sessions = 0
+        self.seconds = 0.0
+
+    def __str__(self) -> str:
+        latencies = sorted(self.latencies)
+        rate = self.sessions / self.seconds if self.seconds > 0 else float('inf')
+        return (f"{self.sessions} sessions, {len(latencies)} guesses in {self.seconds:.2f}s "
+                f"({rate:.1f} sessions/s)\n"
+                f"guess latency: p50 {percentile(latencies, 0.5) * 1000:.2f}ms, "
+                f"p99 {percentile(latencies, 0.99) * 1000:.2f}ms")
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, message: dict) -> dict:
+    """ Sends one request and returns the reply. """
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+    reply = json.loads(await reader.readline())
+    if not reply.get("ok"):
+        raise RuntimeError(reply.get("error"))
+    return reply
+
+
+async def play_games(host: str, port: int, games: int, words: Sequence[str], report: LoadReport) -> None:
+    """ Plays <games> games, one after another, on a new connection. """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(games):
+            session = (await request(reader, writer, {"op": "new"}))["session"]
+            over = False
+            while not over:
+                start = time.perf_counter()
+                reply = await request(reader, writer, {"op": "guess", "session": session,
+                                                       "word": random.choice(words)})
+                report.latencies.append(time.perf_counter() - start)
+                over = reply["over"]
+            await request(reader, writer, {"op": "end", "session": session})
+            report.sessions += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run(host: str, port: int, connections: int, games: int, words: Sequence[str]) -> LoadReport:
+    """ Plays <games> games on each of <connections> concurrent connections
+    and returns the report. """
+    report = LoadReport()
+    start = time.perf_counter()
+    await asyncio.gather(*(play_games(host, port, games, words, report) for _ in range(connections)))
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate load against a Wordy game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--connections", type=int, default=50, help="concurrent connections")
+    parser.add_argument("--games", type=int, default=20, help="games played per connection")
+    args = parser.parse_args()
+
+    with open("settings.json", 'r') as settings_file:
+        settings = json.load(settings_file)
+    words = list(lexicon.get_word_list(settings['word_list_file'], settings['word_size']))
+
+    print(asyncio.run(run(args.host, args.port, args.connections, args.games, words)))
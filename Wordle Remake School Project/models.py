@@ -1,25 +1,271 @@
 import random
+import sys
+import threading
+from collections import OrderedDict
 from enum import Enum, auto
-from typing import Optional
+from typing import Optional, Sequence
+
+import lexicon
 
 class NotAWordError(ValueError):
     pass
 
+class HardModeError(ValueError):
+    """ Raised when a guess doesn't use the hints revealed so far (in hard
+    mode). The message says which hint was ignored. """
+    pass
+
 class LetterState(Enum):
     INCORRECT = auto()
     MISPLACED = auto()
     CORRECT = auto()
 
 
+def score_guess(guess: str, word: str) -> list[LetterState]:
+    """ Returns the state of each letter of <guess> when the answer is <word>.
+
+    A letter is CORRECT if <word> has the same letter at the same position,
+    MISPLACED if the letter appears elsewhere in <word>, and INCORRECT
+    otherwise.
+
+    Parameters:
+        guess (str): The guessed word.
+        word (str): The answer word.
+    """
+    letters = []
+    for ch in range(len (guess)):
+        if guess[ch] == word[ch]:
+            letters+=[LetterState.CORRECT]
+        elif guess[ch] in word:
+            letters+=[LetterState.MISPLACED]
+        else:
+            letters+=[LetterState.INCORRECT]
+    return letters
+
+
+# value of each letter state in a feedback code: a base-3 number whose digit
+# i is the state of letter i (see scoring)
+PATTERN_DIGITS = {LetterState.INCORRECT: 0, LetterState.MISPLACED: 1, LetterState.CORRECT: 2}
+_DIGIT_STATES = [LetterState.INCORRECT, LetterState.MISPLACED, LetterState.CORRECT]
+
+
+def encode_pattern(letter_states: Sequence[LetterState]) -> int:
+    """ Returns the feedback code for a list of letter states (e.g. as
+    returned by WordyModel.check_guess).
+
+    Parameters:
+        letter_states (Sequence[LetterState]): The state of each letter.
+    """
+    code = 0
+    for state in reversed(letter_states):
+        code = code * 3 + PATTERN_DIGITS[state]
+    return code
+
+
+def decode_pattern(code: int, word_size: int) -> list[LetterState]:
+    """ Returns the list of letter states encoded in the feedback <code>.
+
+    Parameters:
+        code (int): A feedback code.
+        word_size (int): The number of letters in the scored word.
+    """
+    code = int(code)
+    letter_states = []
+    for _ in range(word_size):
+        code, digit = divmod(code, 3)
+        letter_states.append(_DIGIT_STATES[digit])
+    return letter_states
+
+
+def score_with_positions(guess: str, word_letter_positions: dict[str, list[int]]) -> list[LetterState]:
+    """ Returns the same letter states as score_guess, using the answer's
+    precomputed letter positions (see WordyModel.letter_positions) instead
+    of scanning the answer for every letter of <guess>.
+
+    Parameters:
+        guess (str): The guessed word.
+        word_letter_positions (dict[str, list[int]]): The positions of each
+            letter in the answer word.
+    """
+    letters = []
+    for i, letter in enumerate(guess):
+        positions = word_letter_positions.get(letter)
+        if positions is None:
+            letters.append(LetterState.INCORRECT)
+        elif i in positions:
+            letters.append(LetterState.CORRECT)
+        else:
+            letters.append(LetterState.MISPLACED)
+    return letters
+
+
+class ScoreCache:
+    """ A least recently used cache of scored (guess, answer) pairs, bounded
+    by an estimate of the memory its entries take.
+
+    Results are stored as shared tuples (there are at most 3 ** word size
+    different ones), so an entry costs little more than its key. The cache
+    counts hits, misses and evictions to show how well it is working.
+
+    The cache can be shared between threads (e.g. the server's sessions and
+    its hint workers); every update of the entries and counters holds a lock.
+    """
+
+    # estimated bytes per entry on top of its key: the dict slot and the
+    # OrderedDict link
+    ENTRY_OVERHEAD = 120
+
+    # instance variables
+    max_bytes: int    # memory bound of the cache
+    size: int         # estimated memory used by the entries
+    hits: int         # lookups that found a cached result
+    misses: int       # lookups that had to score the guess
+    evictions: int    # entries dropped to stay under max_bytes
+    entries: OrderedDict[tuple[str, str], tuple[LetterState, ...]]  # least recently used first
+    results: dict[tuple[LetterState, ...], tuple[LetterState, ...]]  # shared copy of each result
+    lock: threading.Lock  # held while the entries or counters change
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.results = {}
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        """ Empties the cache and resets the statistics. """
+        with self.lock:
+            self.entries = OrderedDict()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def entry_size(self, key: tuple[str, str]) -> int:
+        """ Returns the estimated memory used by the entry for <key>. """
+        return sys.getsizeof(key) + sys.getsizeof(key[0]) + sys.getsizeof(key[1]) + self.ENTRY_OVERHEAD
+
+    def score(self, guess: str, word: str,
+              word_letter_positions: Optional[dict[str, list[int]]] = None) -> list[LetterState]:
+        """ Returns the state of each letter of <guess> when the answer is
+        <word> (see score_guess), scoring it only if it isn't cached.
+
+        Parameters:
+            guess (str): The guessed word.
+            word (str): The answer word.
+            word_letter_positions (dict[str, list[int]]): The positions of
+                each letter in <word>, if already known.
+        """
+        key = (guess, word)
+        with self.lock:
+            result = self.entries.get(key)
+            if result is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return list(result)
+            self.misses += 1
+
+        # scored without the lock; if another thread scores the same pair
+        # meanwhile, both store the same result
+        if word_letter_positions is None:
+            letters = score_guess(guess, word)
+        else:
+            letters = score_with_positions(guess, word_letter_positions)
+
+        result = tuple(letters)
+        with self.lock:
+            if key not in self.entries:
+                self.size += self.entry_size(key)
+            self.entries[key] = self.results.setdefault(result, result)
+            while self.size > self.max_bytes and self.entries:
+                old_key, _ = self.entries.popitem(last=False)
+                self.size -= self.entry_size(old_key)
+                self.evictions += 1
+        return letters
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """ The fraction of lookups that were answered from the cache. """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __str__(self) -> str:
+        return (f"{len(self)} entries ({self.size / 1024:.0f} of {self.max_bytes / 1024:.0f} KiB), "
+                f"{self.hits} hits, {self.misses} misses ({100 * self.hit_rate:.1f}% hit rate), "
+                f"{self.evictions} evictions")
+
+
+# scoring cache shared by every model (and the automated players)
+score_cache = ScoreCache()
+
+
+class HardModeConstraints:
+    """ The hints revealed so far in a game, which every hard mode guess must
+    use: letters found in the right place must stay there, and letters found
+    in the wrong place must be used again.
+
+    The constraints are updated from each guess's scored letter states, so a
+    new guess is checked in O(word size) instead of by replaying every
+    earlier guess.
+    """
+
+    # instance variables
+    required_at: list[Optional[str]]  # letter that must be at each position (None if unknown)
+    required_letters: set[str]        # letters that must appear somewhere
+
+    def __init__(self, word_size: int) -> None:
+        self.required_at = [None] * word_size
+        self.required_letters = set()
+
+    def update(self, guess: str, letter_states: list[LetterState]) -> None:
+        """ Adds the hints revealed by a guess.
+
+        Parameters:
+            guess (str): The guessed word.
+            letter_states (list[LetterState]): The state of each letter, as
+                returned by score_guess.
+        """
+        for position, (letter, state) in enumerate(zip(guess, letter_states)):
+            if state == LetterState.CORRECT:
+                self.required_at[position] = letter
+            elif state == LetterState.MISPLACED:
+                self.required_letters.add(letter)
+
+    def violation(self, guess: str) -> Optional[str]:
+        """ Returns a message describing the first hint that <guess> ignores,
+        or None if it uses all of them.
+
+        Parameters:
+            guess (str): The guess to check.
+        """
+        for position, letter in enumerate(self.required_at):
+            if letter is not None and guess[position] != letter:
+                return f"Letter {position + 1} must be {letter.upper()}"
+
+        for letter in sorted(self.required_letters):
+            if letter not in guess:
+                return f"Guess must contain {letter.upper()}"
+
+        return None
+
+
 class WordyModel:
 
     # instance variables
     word_size: int  # size of the word
-    word_list: list[str]  # list of valid words
+    word_list: Sequence[str]  # list of valid words (shared, read-only)
+    word_list_file: str  # name of the file the word list was loaded from
     word: str  # the "hidden" word
+    word_letter_positions: dict[str, list[int]]  # the positions of each letter in word
+    hard_mode: bool  # whether guesses must use all the hints revealed so far
+    constraints: HardModeConstraints  # the hints revealed so far
 
-    def __init__(self, word_size, word_list_filename, preselected_word=None):
+    def __init__(self, word_size, word_list_filename, preselected_word=None, hard_mode=False):
         self.word_size = word_size
+        self.hard_mode = hard_mode
+        self.constraints = HardModeConstraints(word_size)
 
         self.word_list = []
         self.set_word_list(word_list_filename)
@@ -27,23 +273,22 @@ class WordyModel:
         self.word = None
         self.set_word(preselected_word)
 
-        self.word_letter_positions = self.letter_positions(self.word)
-
     def set_word_list(self, filename: str) -> None:
         """ Sets the word_list instance variable based on all the words of the
         given size (self.word_size) in the word file with name <filename>.
 
+        The words come from the process-wide lexicon cache, so the file is
+        only read once no matter how many models use it. The resulting list
+        supports fast membership tests (e.g. in check_guess): a hash lookup
+        for text word files, or a binary search when <filename> is a compiled
+        lexicon.
+
         Parameters:
             self (WordyModel): The object being modified.
             filename (str): name of the file containing a list of valid words.
         """
-        self.word_list = []
-
-        with open(filename, 'r') as f:
-            for word in f:
-                word = word.strip()
-                if len(word) == self.word_size:
-                    self.word_list.append(word)
+        self.word_list_file = filename
+        self.word_list = lexicon.get_word_list(filename, self.word_size)
 
         if len(self.word_list) == 0:
             raise RuntimeError(f"No words of length {self.word_size} found in {filename}")
@@ -66,10 +311,11 @@ class WordyModel:
         else:
             if len(preselected_word) != self.word_size:
                 raise ValueError("preselected word isn't of the correct size")
-            elif self.word in self.word_list:
+            elif preselected_word not in self.word_list:
                 raise NotAWordError("preselected word is not in the word list")
             else:
                 self.word = preselected_word
+        self.word_letter_positions = self.letter_positions(self.word)
 
 
     def check_guess(self, guess: str) -> tuple[bool, list[LetterState], dict[str, LetterState]]:
@@ -82,27 +328,54 @@ class WordyModel:
         (3) A dictionary that associates each letter in the guess with its
         state.
 
+        In hard mode, the guess must also use every hint revealed by earlier
+        guesses.
+
         Parameters:
             guess: (str) The guess to check.
+
+        Raises:
+            NotAWordError: When guess is not in the word list.
+            HardModeError: When guess ignores a revealed hint (hard mode only).
         """
         if guess not in self.word_list:
             raise NotAWordError
 
-        letters = []
-        letterStates = {}
-        for ch in range(len (guess)):
-            if guess[ch] == self.word[ch]:
-                letters+=[LetterState.CORRECT]
-                letterStates [guess[ch]] = LetterState.CORRECT
-            elif guess[ch] in self.word:
-                letters+=[LetterState.MISPLACED]
-                letterStates [guess[ch]] = LetterState.MISPLACED
-            else:
-                letters+=[LetterState.INCORRECT]
-                letterStates [guess[ch]] = LetterState.INCORRECT
-        return (guess == self.word, letters, letterStates) # TODO: implement this method and remove this line
+        if self.hard_mode:
+            violation = self.constraints.violation(guess)
+            if violation is not None:
+                raise HardModeError(violation)
+
+        letters = score_cache.score(guess, self.word, self.word_letter_positions)
+        self.constraints.update(guess, letters)
+        letterStates = dict(zip(guess, letters))
+        return (guess == self.word, letters, letterStates)
         
 
+    def find_words(self, constraints: list[tuple[str, Optional[int], LetterState]]) -> list[str]:
+        """ Returns the words in the word list that satisfy every constraint,
+        using the positional bitset index of the word list.
+
+        Each constraint is a (letter, position, state) triple, where state is
+        CORRECT (letter is at position), MISPLACED (the word contains the
+        letter, but not at position, which may be None) or INCORRECT (the
+        word doesn't contain the letter; position is ignored). For example,
+
+            model.find_words([('s', 0, LetterState.CORRECT),
+                              ('e', 2, LetterState.MISPLACED),
+                              ('a', None, LetterState.INCORRECT)])
+
+        Parameters:
+            constraints: (list[tuple[str, Optional[int], LetterState]]) The
+                constraints to satisfy.
+        """
+        # imported here since pattern_index itself imports this module
+        from pattern_index import get_pattern_index
+
+        index = get_pattern_index(self.word_list)
+        return index.words_in(index.query(constraints))
+
+
     def letter_positions(self, word: str) -> dict[str, list[int]]:
         """ Returns a mapping between letters and the indexes at which the
         letter appears in the word.
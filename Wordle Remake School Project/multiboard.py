@@ -0,0 +1,176 @@
+"""
+Module: multiboard
+
+Multi-board Wordy: every guess is played on 4, 8 or 16 boards at once, each
+with its own hidden word, and the game is won once every board is solved.
+
+MultiWordyModel scores a guess against all the unsolved answers in one
+batched operation (see scoring), and combines the per-board letter states
+for the keyboard. MultiWordyController plays the usual WordyController rules
+with it; the view side is views.MultiGuessesCanvas, which draws all the
+boards on a single canvas.
+"""
+
+import random
+from typing import TYPE_CHECKING, Optional, Sequence
+
+import numpy as np
+
+from journal import Journal
+from models import LetterState, NotAWordError, WordyModel
+from scoring import check_guess_batch, decode_pattern, encode_words
+from stats import GameStats
+from wordy import WordyController
+
+if TYPE_CHECKING:
+    from views import WordyView
+
+
+# how informative each state is, for combining key colors across boards
+_STATE_PRIORITY = {LetterState.INCORRECT: 0, LetterState.MISPLACED: 1, LetterState.CORRECT: 2}
+
+# guesses allowed on top of one per board, so every board can be solved
+EXTRA_GUESSES = 5
+
+
+def adjust_settings(settings: dict) -> list[str]:
+    """ Adjusts <settings> (as loaded from settings.json) for a multi-board
+    game, and returns a message for each setting that was changed, so that
+    none of them is changed silently.
+
+    Parameters:
+        settings (dict): The game settings; settings['boards'] > 1.
+    """
+    messages = []
+    boards = settings['boards']
+
+    min_guesses = boards + EXTRA_GUESSES
+    if settings['num_guesses'] < min_guesses:
+        messages.append(f"num_guesses raised from {settings['num_guesses']} to {min_guesses}, "
+                        f"so that all {boards} boards can be solved")
+        settings['num_guesses'] = min_guesses
+
+    if settings.get('hard_mode', False):
+        messages.append("hard_mode is not supported with more than one board, and is turned off")
+        settings['hard_mode'] = False
+
+    if settings.get('mode', 'classic') != 'classic':
+        messages.append(f"mode {settings['mode']!r} is not supported with more than one board, "
+                        f"so the classic mode is played")
+        settings['mode'] = 'classic'
+
+    return messages
+
+
+def combine_key_states(key_states: Sequence[dict[str, LetterState]]) -> dict[str, LetterState]:
+    """ Combines the key states of several boards into one keyboard: each
+    letter gets its most informative state on any board (CORRECT, then
+    MISPLACED, then INCORRECT).
+
+    Parameters:
+        key_states (Sequence[dict[str, LetterState]]): The key states of each
+            board, as returned by WordyModel.check_guess.
+    """
+    combined = {}
+    for states in key_states:
+        for letter, state in states.items():
+            if letter not in combined or _STATE_PRIORITY[state] > _STATE_PRIORITY[combined[letter]]:
+                combined[letter] = state
+    return combined
+
+
+class MultiWordyModel(WordyModel):
+    """ A WordyModel with several hidden words. self.word is the first
+    unsolved one. """
+
+    # instance variables
+    num_boards: int          # number of boards (hidden words)
+    answer_words: list[str]  # the hidden word of each board
+    answers: np.ndarray      # uint8 letter matrix of answer_words
+    solved: np.ndarray       # whether each board has been solved
+
+    def __init__(self, word_size, word_list_filename, num_boards, preselected_words=None):
+        """ Creates a model with <num_boards> hidden words, which are either
+        <preselected_words> or distinct random words from the word list.
+
+        Raises:
+            ValueError: When the wrong number of preselected words is given,
+                or one of them isn't of the correct size.
+            NotAWordError: When a preselected word is not in the word list.
+        """
+        if preselected_words is not None and len(preselected_words) != num_boards:
+            raise ValueError("need one preselected word per board")
+
+        super().__init__(word_size, word_list_filename)
+        self.num_boards = num_boards
+
+        if preselected_words is None:
+            self.answer_words = random.sample(list(self.word_list), num_boards)
+        else:
+            for word in preselected_words:
+                self.set_word(word)
+            self.answer_words = list(preselected_words)
+
+        self.answers = encode_words(self.answer_words)
+        self.solved = np.zeros(num_boards, dtype=bool)
+        self.word = self.answer_words[0]
+        self.word_letter_positions = self.letter_positions(self.word)
+
+    def check_guess(self, guess: str) -> tuple[bool, list[Optional[list[LetterState]]], dict[str, LetterState]]:
+        """ Checks the given <guess> against every unsolved board, returning
+        three things.
+
+        (1) Whether every board is now solved
+        (2) For each board, the list of LetterState for the guess, or None if
+        the board was already solved
+        (3) The key states, combined across the boards that were scored
+
+        Parameters:
+            guess: (str) The guess to check.
+
+        Raises:
+            NotAWordError: When guess is not in the word list.
+        """
+        if guess not in self.word_list:
+            raise NotAWordError
+
+        codes = check_guess_batch(encode_words([guess]), self.answers)
+        winning_code = 3 ** self.word_size - 1
+
+        results = []
+        for board, code in enumerate(codes):
+            if self.solved[board]:
+                results.append(None)
+            else:
+                results.append(decode_pattern(code, self.word_size))
+
+        self.solved |= codes == winning_code
+
+        unsolved = np.flatnonzero(~self.solved)
+        if len(unsolved) > 0:
+            self.word = self.answer_words[unsolved[0]]
+            self.word_letter_positions = self.letter_positions(self.word)
+
+        key_states = combine_key_states([dict(zip(guess, letters)) for letters in results if letters is not None])
+        return (bool(self.solved.all()), results, key_states)
+
+
+class MultiWordyController(WordyController):
+    """ A WordyController for a MultiWordyModel. Hints and candidate counts
+    are single-board features, so they are turned off, and so are the
+    journal and statistics: a journal record holds one result and one
+    answer, so multi-board games are not recorded at all. """
+
+    def __init__(self, view: "WordyView", model: "MultiWordyModel", settings: dict,
+                 journal: Optional[Journal] = None, stats: Optional[GameStats] = None) -> None:
+        super().__init__(view, model, settings)
+
+    def record_guess(self, word: str, results: list[Optional[list[LetterState]]]) -> None:
+        # results holds one list of letter states per board
+        self.guess_history.append((word, results))
+
+    def show_candidates(self) -> None:
+        pass
+
+    def show_hint(self, e):
+        self.view.display_message ("No hints with more than one board")
@@ -0,0 +1,125 @@
+"""
+Module: pattern_index
+
+Positional bitset index for pattern and constraint queries over a word list.
+
+Every word in a list gets an id (its position in the list), and a set of
+words is a Python int used as a bitset: bit i is set if word i is in the set.
+The index keeps one bitset per (position, letter) and one per (letter,
+minimum count), so a query such as "s at position 0, contains e but not at
+position 2, no a or t" is a handful of bitwise ANDs instead of a scan of the
+word list.
+
+Constraints use the same LetterState vocabulary that WordyModel.check_guess
+returns: (letter, position, state) where
+    CORRECT:   the letter is at that position
+    MISPLACED: the word contains the letter, but not at that position (the
+               position may be None to only require the letter)
+    INCORRECT: the word doesn't contain the letter (the position is ignored)
+"""
+
+from typing import Iterable, Optional, Sequence
+
+import lexicon
+from models import LetterState
+
+
+Constraint = tuple[str, Optional[int], LetterState]
+
+
+class PatternIndex:
+    """ Bitsets of word ids for each (position, letter) and letter count. """
+
+    # instance variables
+    words: Sequence[str]                 # the indexed words; bit i stands for words[i]
+    all_words: int                       # bitset with every word
+    at: list[dict[str, int]]             # at[position][letter] -> words with letter at position
+    count_at_least: dict[tuple[str, int], int]  # (letter, n) -> words with letter at least n times
+
+    def __init__(self, words: Sequence[str]) -> None:
+        self.words = words
+        self.all_words = (1 << len(words)) - 1
+
+        num_bytes = (len(words) + 7) // 8
+        at_bits: list[dict[str, bytearray]] = []
+        count_bits: dict[tuple[str, int], bytearray] = {}
+
+        for i, word in enumerate(words):
+            byte, bit = divmod(i, 8)
+            counts: dict[str, int] = {}
+            for position, letter in enumerate(word):
+                if position == len(at_bits):
+                    at_bits.append({})
+                at_bits[position].setdefault(letter, bytearray(num_bytes))[byte] |= 1 << bit
+                counts[letter] = counts.get(letter, 0) + 1
+            for letter, count in counts.items():
+                for n in range(1, count + 1):
+                    count_bits.setdefault((letter, n), bytearray(num_bytes))[byte] |= 1 << bit
+
+        self.at = [{letter: int.from_bytes(bits, 'little') for letter, bits in position.items()}
+                   for position in at_bits]
+        self.count_at_least = {key: int.from_bytes(bits, 'little') for key, bits in count_bits.items()}
+
+    def with_letter_at(self, position: int, letter: str) -> int:
+        """ Returns the bitset of words with <letter> at <position>. """
+        if position >= len(self.at):
+            return 0
+        return self.at[position].get(letter, 0)
+
+    def containing(self, letter: str, count: int = 1) -> int:
+        """ Returns the bitset of words that contain <letter> at least <count>
+        times. """
+        return self.count_at_least.get((letter, count), 0)
+
+    def constraint_bits(self, letter: str, position: Optional[int], state: LetterState) -> int:
+        """ Returns the bitset of words that satisfy one constraint (see the
+        module docstring). """
+        if state == LetterState.CORRECT:
+            return self.with_letter_at(position, letter)
+        elif state == LetterState.MISPLACED:
+            bits = self.containing(letter)
+            if position is not None:
+                bits &= ~self.with_letter_at(position, letter)
+            return bits
+        else:
+            return self.all_words & ~self.containing(letter)
+
+    def query(self, constraints: Iterable[Constraint], bits: Optional[int] = None) -> int:
+        """ Returns the bitset of words that satisfy every constraint.
+
+        Parameters:
+            constraints (Iterable[Constraint]): (letter, position, state) triples.
+            bits (int): Only consider these words (default: every word).
+        """
+        if bits is None:
+            bits = self.all_words
+        for letter, position, state in constraints:
+            bits &= self.constraint_bits(letter, position, state)
+            if not bits:
+                break
+        return bits
+
+    def consistent_with(self, guess: str, letter_states: Sequence[LetterState], bits: Optional[int] = None) -> int:
+        """ Returns the bitset of words that would have produced
+        <letter_states> (as returned by WordyModel.check_guess) for <guess>. """
+        return self.query(((letter, position, state)
+                           for position, (letter, state) in enumerate(zip(guess, letter_states))), bits)
+
+    def words_in(self, bits: int) -> list[str]:
+        """ Returns the words in the bitset <bits>, in word list order. """
+        words = []
+        while bits:
+            low = bits & -bits
+            words.append(self.words[low.bit_length() - 1])
+            bits ^= low
+        return words
+
+
+def get_pattern_index(words: Sequence[str]) -> PatternIndex:
+    """ Returns the pattern index of <words>, building it only the first time
+    it is asked for (see lexicon.derived).
+
+    Parameters:
+        words (Sequence[str]): A word list (e.g. a model's word_list).
+    """
+    return lexicon.derived(words, 'pattern_index', PatternIndex)
@@ -0,0 +1,153 @@
+"""
+Module: prefix_index
+
+A compact prefix index (a minimized DAWG) over a word list.
+
+The index answers "can this partial guess still become a valid word?" while
+the player is typing, in time proportional to the length of the prefix. The
+graph is built with Daciuk's incremental algorithm, which merges identical
+suffixes as it goes, and is then frozen into a few flat arrays so it takes
+far less memory than a trie of dicts (or a set of every prefix).
+"""
+
+from array import array
+from typing import Iterable, Sequence
+
+import lexicon
+
+
+class PrefixIndex:
+    """ A minimized DAWG of words, stored as flat arrays.
+
+    Node n's outgoing edges are edge_labels/edge_targets[first_edge[n]:
+    first_edge[n + 1]], and final[n] says whether a word ends at node n.
+    Node 0 is the root.
+    """
+
+    # instance variables
+    first_edge: array    # index of each node's first edge (plus one past the last edge)
+    edge_labels: bytes   # the letter on each edge
+    edge_targets: array  # the node each edge leads to
+    final: bytearray     # 1 if a word ends at the node, 0 otherwise
+
+    def __init__(self, words: Iterable[str]) -> None:
+        children, final = _build_dawg(sorted(set(words)))
+        self._freeze(children, final)
+
+    def _freeze(self, children: list[dict[str, int]], final: list[bool]) -> None:
+        """ Renumbers the nodes reachable from the root and stores their edges
+        in flat arrays. """
+        order = [0]
+        number = {0: 0}
+        for node in order:
+            for child in children[node].values():
+                if child not in number:
+                    number[child] = len(order)
+                    order.append(child)
+
+        self.first_edge = array('I')
+        self.edge_targets = array('I')
+        labels = bytearray()
+        self.final = bytearray()
+
+        for node in order:
+            self.first_edge.append(len(labels))
+            self.final.append(1 if final[node] else 0)
+            for letter, child in sorted(children[node].items()):
+                labels += letter.encode('latin-1')
+                self.edge_targets.append(number[child])
+        self.first_edge.append(len(labels))
+        self.edge_labels = bytes(labels)
+
+    def _walk(self, prefix: str) -> int:
+        """ Returns the node reached by following <prefix> from the root, or
+        -1 if no word starts with <prefix>. """
+        node = 0
+        for letter in prefix:
+            code = ord(letter)
+            if code > 255:
+                return -1
+            i = self.edge_labels.find(code, self.first_edge[node], self.first_edge[node + 1])
+            if i < 0:
+                return -1
+            node = self.edge_targets[i]
+        return node
+
+    def has_prefix(self, prefix: str) -> bool:
+        """ Returns whether some word in the index starts with <prefix>. """
+        return self._walk(prefix) >= 0
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+        node = self._walk(word)
+        return node >= 0 and self.final[node] == 1
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.final)
+
+    def memory_size(self) -> int:
+        """ Returns the approximate number of bytes used by the index arrays. """
+        return (self.first_edge.itemsize * len(self.first_edge)
+                + self.edge_targets.itemsize * len(self.edge_targets)
+                + len(self.edge_labels) + len(self.final))
+
+
+def _build_dawg(sorted_words: Sequence[str]) -> tuple[list[dict[str, int]], list[bool]]:
+    """ Builds a minimized DAWG from words in sorted order (Daciuk et al.'s
+    incremental algorithm for sorted input).
+
+    Returns:
+        (tuple[list[dict[str, int]], list[bool]]) The children of each node
+        and whether each node is final. Node 0 is the root; some nodes may be
+        unreachable after merging.
+    """
+    children: list[dict[str, int]] = [{}]
+    final = [False]
+    register: dict[tuple, int] = {}
+    unchecked: list[tuple[int, str, int]] = []  # (parent, letter, child) not yet minimized
+    previous = ""
+
+    def minimize(down_to: int) -> None:
+        while len(unchecked) > down_to:
+            parent, letter, child = unchecked.pop()
+            signature = (final[child], tuple(sorted(children[child].items())))
+            if signature in register:
+                children[parent][letter] = register[signature]
+            else:
+                register[signature] = child
+
+    for word in sorted_words:
+        common = 0
+        for a, b in zip(word, previous):
+            if a != b:
+                break
+            common += 1
+
+        minimize(common)
+
+        node = unchecked[-1][2] if unchecked else 0
+        for letter in word[common:]:
+            children.append({})
+            final.append(False)
+            child = len(children) - 1
+            children[node][letter] = child
+            unchecked.append((node, letter, child))
+            node = child
+
+        final[node] = True
+        previous = word
+
+    minimize(0)
+    return children, final
+
+
+def get_prefix_index(words: Sequence[str]) -> PrefixIndex:
+    """ Returns the prefix index of <words>, building it only the first time
+    it is asked for (see lexicon.derived).
+
+    Parameters:
+        words (Sequence[str]): A word list (e.g. a model's word_list).
+    """
+    return lexicon.derived(words, 'prefix_index', PrefixIndex)
@@ -0,0 +1,100 @@
+"""
+Module: scoring
+
+Vectorized (NumPy) scoring of many guesses at once.
+
+WordyModel.check_guess scores one guess against one answer and returns a list
+of LetterState values. The functions here apply the same rules to whole
+arrays of guesses and answers, and return each result as a compact integer
+feedback code: a base-3 number whose digit i is the state of letter i
+(0 = INCORRECT, 1 = MISPLACED, 2 = CORRECT).
+
+Words are passed around as uint8 letter matrices (one row per word, one
+column per letter, 'a' == 0), which encode_words builds from a word list.
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+# the feedback code helpers live in models (they don't need NumPy), and are
+# re-exported here next to the batch scoring
+from models import PATTERN_DIGITS, LetterState, decode_pattern, encode_pattern
+
+
+def pattern_dtype(word_size: int) -> np.dtype:
+    """ Returns the smallest unsigned integer type that holds every feedback
+    code for words of length <word_size>.
+
+    Parameters:
+        word_size (int): The length of the scored words.
+    """
+    num_patterns = 3 ** word_size
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if num_patterns - 1 <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def encode_words(words: Sequence[str]) -> np.ndarray:
+    """ Converts a list of same-sized lowercase words into a uint8 letter
+    matrix.
+
+    Parameters:
+        words (Sequence[str]): The words to encode.
+
+    Returns:
+        (np.ndarray) Array of shape (len(words), word size), where each entry
+        is a letter's offset from 'a'.
+
+    Raises:
+        ValueError: When the words are not all the same length, or contain
+            anything but the letters a-z.
+    """
+    if len(words) == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    word_size = len(words[0])
+    if any(len(word) != word_size for word in words):
+        raise ValueError("all words must be the same size")
+    joined = ''.join(words).encode('ascii')
+
+    letters = np.frombuffer(joined, dtype=np.uint8).reshape(len(words), word_size) - ord('a')
+    # anything below 'a' wraps around, so a single comparison catches it too
+    if np.any(letters >= 26):
+        raise ValueError("words must only contain the letters a-z")
+    return letters
+
+
+def check_guess_batch(guesses: np.ndarray, answers: np.ndarray) -> np.ndarray:
+    """ Scores guesses against answers, returning one feedback code per pair.
+
+    The rules are the same as WordyModel.check_guess: a letter is CORRECT if
+    the answer has the same letter in the same position, MISPLACED if the
+    letter appears elsewhere in the answer, and INCORRECT otherwise.
+
+    <guesses> and <answers> are letter matrices (see encode_words) whose
+    leading dimensions are broadcast against each other, so e.g. passing
+    guesses[:, None, :] and answers[None, :, :] scores every guess against
+    every answer.
+
+    Parameters:
+        guesses (np.ndarray): uint8 letter matrix of guesses, shape (..., k).
+        answers (np.ndarray): uint8 letter matrix of answers, shape (..., k).
+
+    Returns:
+        (np.ndarray) The feedback codes, with the broadcast leading shape.
+    """
+    guesses = np.asarray(guesses, dtype=np.uint8)
+    answers = np.asarray(answers, dtype=np.uint8)
+    word_size = guesses.shape[-1]
+
+    # a letter is present if its bit is set in the answer's letter mask
+    answer_masks = np.bitwise_or.reduce(np.left_shift(np.uint32(1), answers, dtype=np.uint32), axis=-1)
+    present = np.right_shift(answer_masks[..., None], guesses, dtype=np.uint32) & 1
+    correct = guesses == answers
+
+    dtype = pattern_dtype(word_size)
+    digits = present.astype(dtype) + correct.astype(dtype)
+    weights = (3 ** np.arange(word_size)).astype(dtype)
+    return (digits * weights).sum(axis=-1, dtype=dtype)
@@ -0,0 +1,302 @@
+"""
+Module: server
+
+An asyncio game server that hosts many Wordy games over a local socket.
+
+Each session is a headless game: a WordyModel and a WordyController driving a
+SessionView (a NullView that keeps the last guess result), so the server
+plays by exactly the same rules as the Tk app. All sessions share the one
+loaded lexicon and its prefix and pattern indexes, so a new game costs a
+few small objects.
+
+The protocol is JSON lines: the client sends one object per line and gets
+one object per line back, in order. Every request has an "op":
+
+    {"op": "new"}                               -> {"ok": true, "session": 1, "word_size": 5, "num_guesses": 6}
+    {"op": "guess", "session": 1, "word": "..."} -> {"ok": true, "result": [2, 0, 1, 0, 0], "won": false, "over": false}
+    {"op": "hint", "session": 1}                -> {"ok": true, "hint": "..."}
+    {"op": "state", "session": 1}               -> {"ok": true, "guesses": [...], "results": [...], ...}
+    {"op": "end", "session": 1}                 -> {"ok": true}
+
+Results use the feedback code digits (0 = INCORRECT, 1 = MISPLACED,
+2 = CORRECT); once a game is over the answer is included. Failed requests
+get {"ok": false, "error": "..."}, whatever went wrong, and the connection
+stays open.
+
+Backpressure: each connection handles one request at a time and waits for
+its reply to be flushed (writer.drain) before reading the next line, so a
+client that doesn't read its replies stops being read from. The number of
+sessions is capped, and hints (which are computed on a thread pool) are
+limited to a few at a time. Sessions belong to the connection that created
+them and are dropped when it closes.
+
+    python server.py --port 8765
+"""
+
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from models import PATTERN_DIGITS, LetterState, WordyModel
+from prefix_index import get_prefix_index
+from pattern_index import get_pattern_index
+from simulate import NullView
+from wordy import HintSolver, WordyController
+
+
+class ProtocolError(Exception):
+    """ Raised for a request that can't be handled; its message is sent back
+    to the client. """
+    pass
+
+
+class SessionView(NullView):
+    """ A NullView that keeps the result of the last guess, and runs the
+    controller's scheduled callbacks on the asyncio event loop. """
+
+    # instance variables
+    last_result: Optional[list[LetterState]]  # letter states of the last accepted guess
+
+    def __init__(self, settings: dict, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__(settings)
+        self.loop = loop
+        self.last_result = None
+
+    def schedule(self, delay: int, callback: Callable[[], None]) -> None:
+        self.loop.call_later(delay / 1000, callback)
+
+    def display_guess_result(self, guess_num, guess_results, letter_states, on_complete=None) -> None:
+        self.last_result = guess_results
+        super().display_guess_result(guess_num, guess_results, letter_states, on_complete)
+
+
+class Session:
+    """ One game hosted by the server. """
+
+    # instance variables
+    model: WordyModel
+    view: SessionView
+    controller: WordyController
+
+    def __init__(self, settings: dict, loop: asyncio.AbstractEventLoop) -> None:
+        self.model = WordyModel(settings['word_size'], settings['word_list_file'],
+                                hard_mode=settings.get('hard_mode', False))
+        self.view = SessionView(settings, loop)
+        self.controller = WordyController(self.view, self.model, settings)
+
+    def guess(self, word: str) -> dict[str, Any]:
+        """ Plays <word> as the next guess and returns the reply.
+
+        Raises:
+            ProtocolError: When the game is over or the guess is rejected.
+        """
+        if self.view.is_over:
+            raise ProtocolError("game is over")
+
+        controller = self.controller
+        guesses_made = controller.current_guess_num
+        self.view.messages.clear()
+        controller.current_guess = list(word.lower())
+        controller.check_solution()
+
+        if controller.current_guess_num == guesses_made:
+            controller.current_guess = []
+            raise ProtocolError(self.view.messages[-1])
+
+        reply = {"ok": True, "result": [PATTERN_DIGITS[state] for state in self.view.last_result],
+                 "won": controller.guess_history[-1][0] == self.model.word,
+                 "over": self.view.is_over}
+        if self.view.is_over:
+            reply["answer"] = self.model.word
+        return reply
+
+    def hint_task(self) -> Callable[[], tuple["HintSolver", int, str]]:
+        """ Returns a function that computes a hint from the game as it is now,
+        for a worker thread. It returns the solver it used, the number of
+        guesses the solver has observed, and the suggested guess.
+
+        The function only works on copies, so the session itself is only ever
+        touched on the event loop (see install_solver).
+        """
+        solver = None if self.controller.solver is None else self.controller.solver.copy()
+        history = list(self.controller.guess_history)
+
+        def compute_hint():
+            nonlocal solver
+            if solver is None:
+                solver = HintSolver(self.model)
+                for guess, results in history:
+                    solver.observe(guess, results)
+            return solver, len(history), solver.best_guess()
+
+        return compute_hint
+
+    def install_solver(self, solver: "HintSolver", observed: int) -> None:
+        """ Keeps <solver> (which has observed the first <observed> guesses)
+        for later hints, unless the session already has one. """
+        controller = self.controller
+        if controller.solver is None:
+            for guess, results in controller.guess_history[observed:]:
+                solver.observe(guess, results)
+            controller.solver = solver
+
+    def state(self) -> dict[str, Any]:
+        """ Returns the guesses made so far and their results. """
+        history = self.controller.guess_history
+        reply = {"ok": True,
+                 "guesses": [guess for guess, _ in history],
+                 "results": [[PATTERN_DIGITS[state] for state in results] for _, results in history],
+                 "guesses_left": self.controller.NUM_GUESSES - self.controller.current_guess_num,
+                 "over": self.view.is_over}
+        if self.view.is_over:
+            reply["answer"] = self.model.word
+        return reply
+
+
+class GameServer:
+    """ Hosts sessions for any number of connections. """
+
+    # instance variables
+    settings: dict                 # game settings (word_size, num_guesses, word_list_file)
+    max_sessions: int              # sessions allowed at once, across all connections
+    sessions: dict[int, Session]   # the open sessions, by id
+    next_session_id: int           # id of the next session to be created
+    hint_slots: asyncio.Semaphore  # limits the hints computed at once
+    executor: ThreadPoolExecutor   # computes hints off the event loop
+
+    def __init__(self, settings: dict, max_sessions: int = 10000, max_hints: int = 2) -> None:
+        self.settings = settings
+        self.max_sessions = max_sessions
+        self.sessions = {}
+        self.next_session_id = 1
+        self.hint_slots = asyncio.Semaphore(max_hints)
+        self.executor = ThreadPoolExecutor(max_workers=max_hints, thread_name_prefix="wordy-hint")
+
+    def warm_up(self) -> None:
+        """ Loads the lexicon and builds the shared indexes, so the first
+        sessions don't pay for it. """
+        model = WordyModel(self.settings['word_size'], self.settings['word_list_file'])
+        get_prefix_index(model.word_list)
+        get_pattern_index(model.word_list)
+
+    def session(self, request: dict, owned: set[int]) -> Session:
+        session_id = request.get("session")
+        if not isinstance(session_id, int) or session_id not in owned:
+            raise ProtocolError(f"no such session: {session_id}")
+        return self.sessions[session_id]
+
+    async def handle_request(self, request: dict, owned: set[int]) -> dict[str, Any]:
+        """ Handles one request from a connection that owns the sessions in
+        <owned>, and returns the reply.
+
+        Raises:
+            ProtocolError: When the request can't be handled.
+        """
+        op = request.get("op")
+        if op == "new":
+            if len(self.sessions) >= self.max_sessions:
+                raise ProtocolError("server is full")
+            session_id = self.next_session_id
+            self.next_session_id += 1
+            self.sessions[session_id] = Session(self.settings, asyncio.get_running_loop())
+            owned.add(session_id)
+            return {"ok": True, "session": session_id,
+                    "word_size": self.settings['word_size'], "num_guesses": self.settings['num_guesses']}
+
+        elif op == "guess":
+            word = request.get("word")
+            if not isinstance(word, str):
+                raise ProtocolError("guess needs a word")
+            return self.session(request, owned).guess(word)
+
+        elif op == "hint":
+            session = self.session(request, owned)
+            if HintSolver is None:
+                raise ProtocolError("hints are not available")
+            async with self.hint_slots:
+                solver, observed, hint = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, session.hint_task())
+            # the session may have been ended while the hint was computed
+            if self.sessions.get(request["session"]) is session:
+                session.install_solver(solver, observed)
+            return {"ok": True, "hint": hint}
+
+        elif op == "state":
+            return self.session(request, owned).state()
+
+        elif op == "end":
+            self.session(request, owned)
+            owned.discard(request["session"])
+            del self.sessions[request["session"]]
+            return {"ok": True}
+
+        raise ProtocolError(f"unknown op: {op}")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """ Serves one client until it disconnects. """
+        owned: set[int] = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # line longer than the reader's limit
+                    reply = {"ok": False, "error": "request too long"}
+                    writer.write(json.dumps(reply).encode() + b'\n')
+                    break
+                if not line:
+                    break
+
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ProtocolError("request must be a JSON object")
+                    reply = await self.handle_request(request, owned)
+                except json.JSONDecodeError:
+                    reply = {"ok": False, "error": "invalid JSON"}
+                except ProtocolError as e:
+                    reply = {"ok": False, "error": str(e)}
+                except Exception as e:
+                    # a request that breaks the game code fails on its own,
+                    # without taking the client's other sessions down with it
+                    reply = {"ok": False, "error": f"internal error: {type(e).__name__}: {e}"}
+
+                writer.write(json.dumps(reply).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session_id in owned:
+                del self.sessions[session_id]
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> asyncio.AbstractServer:
+        """ Starts listening on <host>:<port> and returns the asyncio server. """
+        return await asyncio.start_server(self.handle_connection, host, port, limit=4096)
+
+
+async def main(args: argparse.Namespace, settings: dict) -> None:
+    server = GameServer(settings, args.max_sessions, args.max_hints)
+    server.warm_up()
+    listener = await server.serve(args.host, args.port)
+    print(f"serving Wordy on {args.host}:{args.port}")
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host Wordy games over a local socket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-sessions", type=int, default=10000, help="sessions allowed at once")
+    parser.add_argument("--max-hints", type=int, default=2, help="hints computed at once")
+    args = parser.parse_args()
+
+    with open("settings.json", 'r') as settings_file:
+        settings = json.load(settings_file)
+
+    try:
+        asyncio.run(main(args, settings))
+    except KeyboardInterrupt:
+        pass
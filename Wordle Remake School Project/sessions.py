@@ -0,0 +1,298 @@
+"""
+Module: sessions
+
+Compact game sessions, for hosting very many (mostly idle) games at once.
+
+A WordyModel plus WordyController per game carries lists, dicts and a
+reference to a whole controller; a CompactSession is just the answer's word
+id and two small integer arrays (the word ids of the guesses and their
+feedback codes, see models.encode_pattern). Everything the sessions have in
+common (the word list and the rules) lives in one shared GameRules.
+
+SessionStore goes a step further and keeps all of its sessions in a few
+contiguous arrays, one slot per session, so a stored session costs a few
+dozen bytes and no Python objects at all. Sessions can be evicted from the
+store to a short bytes record (e.g. to be written to disk) and restored
+from it later.
+"""
+
+import random
+import struct
+from array import array
+from typing import Optional, Sequence
+
+import lexicon
+from models import LetterState, NotAWordError, decode_pattern, encode_pattern, score_cache
+
+# session status values
+PLAYING = 0
+WON = 1
+LOST = 2
+
+# array typecode of the word ids (u32); 'I' is 4 bytes on every common
+# platform, but C only promises 2
+WORD_ID_TYPECODE = next(typecode for typecode in ('I', 'L') if array(typecode).itemsize == 4)
+
+# struct format (standard size) of an unsigned integer of each item size
+_STRUCT_FORMATS = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+
+def code_typecode(word_size: int) -> str:
+    """ Returns the smallest array typecode that holds every feedback code
+    for words of length <word_size>. """
+    num_patterns = 3 ** word_size
+    for typecode in ('B', 'H', 'I'):
+        if num_patterns - 1 < 1 << (8 * array(typecode).itemsize):
+            return typecode
+    return 'Q'
+
+
+class GameRules:
+    """ The word list and rules shared by a group of sessions. """
+
+    # instance variables
+    words: Sequence[str]  # the word list; a word's id is its index
+    word_size: int        # number of letters in each word
+    num_guesses: int      # number of guesses allowed per game
+    code_typecode: str    # array typecode of the feedback codes
+    winning_code: int     # feedback code of a correct guess
+
+    def __init__(self, words: Sequence[str], word_size: int, num_guesses: int) -> None:
+        self.words = words
+        self.word_size = word_size
+        self.num_guesses = num_guesses
+        self.code_typecode = code_typecode(word_size)
+        self.winning_code = 3 ** word_size - 1
+
+    def word_id(self, word: str) -> int:
+        """ Returns the id of <word>.
+
+        Raises:
+            NotAWordError: When word is not in the word list.
+        """
+        word_id = lexicon.word_id(self.words, word)
+        if word_id < 0:
+            raise NotAWordError
+        return word_id
+
+    def random_answer(self) -> int:
+        """ Returns the id of a random word from the word list. """
+        return random.randrange(len(self.words))
+
+    def score(self, guess_id: int, answer_id: int) -> int:
+        """ Returns the feedback code of one guess against one answer. """
+        return encode_pattern(score_cache.score(self.words[guess_id], self.words[answer_id]))
+
+    def letter_states(self, code: int) -> list[LetterState]:
+        """ Returns the letter states encoded in the feedback <code>. """
+        return decode_pattern(code, self.word_size)
+
+
+class CompactSession:
+    """ One game, stored as word ids and feedback codes. """
+
+    __slots__ = ('answer', 'guesses', 'codes', 'status')
+
+    # instance variables
+    answer: int      # word id of the answer
+    guesses: array   # word id of each guess made
+    codes: array     # feedback code of each guess made
+    status: int      # PLAYING, WON or LOST
+
+    def __init__(self, rules: GameRules, answer: Optional[int] = None) -> None:
+        self.answer = rules.random_answer() if answer is None else answer
+        self.guesses = array(WORD_ID_TYPECODE)
+        self.codes = array(rules.code_typecode)
+        self.status = PLAYING
+
+    def guess(self, rules: GameRules, word: str) -> int:
+        """ Plays <word> as the next guess and returns its feedback code.
+
+        Raises:
+            ValueError: When the game is already over.
+            NotAWordError: When word is not in the word list.
+        """
+        if self.status != PLAYING:
+            raise ValueError("game is over")
+
+        guess_id = rules.word_id(word)
+        code = rules.score(guess_id, self.answer)
+        self.guesses.append(guess_id)
+        self.codes.append(code)
+
+        if code == rules.winning_code:
+            self.status = WON
+        elif len(self.guesses) >= rules.num_guesses:
+            self.status = LOST
+        return code
+
+    def history(self, rules: GameRules) -> list[tuple[str, list[LetterState]]]:
+        """ Returns each guess made and its letter states, like
+        WordyController.guess_history. """
+        return [(rules.words[guess_id], rules.letter_states(code))
+                for guess_id, code in zip(self.guesses, self.codes)]
+
+
+# layout of an evicted session, all little-endian: answer (u32), status (u8),
+# number of guesses (u8), then the guess ids (u32 each) and feedback codes
+# (each the size of the rules' code typecode)
+_RECORD_HEADER = struct.Struct('<IBB')
+
+
+class SessionStore:
+    """ Sessions kept in contiguous arrays, addressed by slot number.
+
+    Slot s holds the answer answers[s], the status statuses[s], the number of
+    guesses made counts[s], and the guesses and codes in
+    guesses/codes[s * num_guesses:(s + 1) * num_guesses]. Freed slots are
+    reused by later sessions.
+    """
+
+    # instance variables
+    rules: GameRules      # the rules shared by every session
+    answers: array        # word id of each slot's answer
+    statuses: bytearray   # status of each slot's game
+    counts: bytearray     # number of guesses made in each slot
+    guesses: array        # word ids of the guesses, num_guesses per slot
+    codes: array          # feedback codes of the guesses, num_guesses per slot
+    in_use: bytearray     # 1 if the slot holds a session
+    free: list[int]       # slots that can be reused
+
+    def __init__(self, rules: GameRules) -> None:
+        if rules.num_guesses > 255:
+            raise ValueError("a stored session holds at most 255 guesses")
+
+        self.rules = rules
+        self.answers = array(WORD_ID_TYPECODE)
+        self.statuses = bytearray()
+        self.counts = bytearray()
+        self.guesses = array(WORD_ID_TYPECODE)
+        self.codes = array(rules.code_typecode)
+        self.in_use = bytearray()
+        self.free = []
+
+    def __len__(self) -> int:
+        return len(self.in_use) - len(self.free)
+
+    def _allocate(self) -> int:
+        """ Returns a free slot, growing the arrays if there is none. """
+        if self.free:
+            return self.free.pop()
+
+        num_guesses = self.rules.num_guesses
+        self.answers.append(0)
+        self.statuses.append(PLAYING)
+        self.counts.append(0)
+        self.guesses.extend(array(WORD_ID_TYPECODE, [0]) * num_guesses)
+        self.codes.extend(array(self.rules.code_typecode, [0]) * num_guesses)
+        self.in_use.append(0)
+        return len(self.in_use) - 1
+
+    def _check(self, slot: int) -> None:
+        if not (0 <= slot < len(self.in_use) and self.in_use[slot]):
+            raise KeyError(slot)
+
+    def new_session(self, answer: Optional[int] = None) -> int:
+        """ Starts a game and returns its slot.
+
+        Parameters:
+            answer (int): Word id of the answer, or None for a random word.
+        """
+        slot = self._allocate()
+        self.answers[slot] = self.rules.random_answer() if answer is None else answer
+        self.statuses[slot] = PLAYING
+        self.counts[slot] = 0
+        self.in_use[slot] = 1
+        return slot
+
+    def guess(self, slot: int, word: str) -> int:
+        """ Plays <word> as the next guess of the game in <slot> and returns
+        its feedback code.
+
+        Raises:
+            KeyError: When no session is stored in slot.
+            ValueError: When the game is already over.
+            NotAWordError: When word is not in the word list.
+        """
+        self._check(slot)
+        if self.statuses[slot] != PLAYING:
+            raise ValueError("game is over")
+
+        rules = self.rules
+        guess_id = rules.word_id(word)
+        code = rules.score(guess_id, self.answers[slot])
+
+        n = self.counts[slot]
+        self.guesses[slot * rules.num_guesses + n] = guess_id
+        self.codes[slot * rules.num_guesses + n] = code
+        self.counts[slot] = n + 1
+
+        if code == rules.winning_code:
+            self.statuses[slot] = WON
+        elif n + 1 >= rules.num_guesses:
+            self.statuses[slot] = LOST
+        return code
+
+    def status(self, slot: int) -> int:
+        """ Returns the status (PLAYING, WON or LOST) of the game in <slot>. """
+        self._check(slot)
+        return self.statuses[slot]
+
+    def get(self, slot: int) -> CompactSession:
+        """ Returns a copy of the session in <slot>. """
+        self._check(slot)
+        start = slot * self.rules.num_guesses
+        end = start + self.counts[slot]
+
+        session = CompactSession(self.rules, self.answers[slot])
+        session.guesses = self.guesses[start:end]
+        session.codes = self.codes[start:end]
+        session.status = self.statuses[slot]
+        return session
+
+    def add(self, session: CompactSession) -> int:
+        """ Stores a copy of <session> and returns its slot. """
+        if len(session.guesses) > self.rules.num_guesses:
+            raise ValueError("session has too many guesses")
+
+        slot = self.new_session(session.answer)
+        start = slot * self.rules.num_guesses
+        self.guesses[start:start + len(session.guesses)] = session.guesses
+        self.codes[start:start + len(session.codes)] = session.codes
+        self.counts[slot] = len(session.guesses)
+        self.statuses[slot] = session.status
+        return slot
+
+    def remove(self, slot: int) -> None:
+        """ Frees <slot>, dropping its session. """
+        self._check(slot)
+        self.in_use[slot] = 0
+        self.free.append(slot)
+
+    def evict(self, slot: int) -> bytes:
+        """ Removes the session in <slot> and returns it as a bytes record
+        that restore turns back into a session. The record has the same
+        layout on every platform. """
+        self._check(slot)
+        count = self.counts[slot]
+        start = slot * self.rules.num_guesses
+        end = start + count
+        code_format = _STRUCT_FORMATS[self.codes.itemsize]
+        record = (_RECORD_HEADER.pack(self.answers[slot], self.statuses[slot], count)
+                  + struct.pack(f'<{count}I', *self.guesses[start:end])
+                  + struct.pack(f'<{count}{code_format}', *self.codes[start:end]))
+        self.remove(slot)
+        return record
+
+    def restore(self, record: bytes) -> int:
+        """ Stores the session evicted as <record> and returns its new slot. """
+        answer, status, count = _RECORD_HEADER.unpack_from(record)
+        offset = _RECORD_HEADER.size
+
+        session = CompactSession(self.rules, answer)
+        session.guesses.extend(struct.unpack_from(f'<{count}I', record, offset))
+        offset += 4 * count
+        code_format = _STRUCT_FORMATS[session.codes.itemsize]
+        session.codes.extend(struct.unpack_from(f'<{count}{code_format}', record, offset))
+        session.status = status
+        return self.add(session)
@@ -0,0 +1,293 @@
+"""
+Module: simulate
+
+Headless game simulation for Wordy.
+
+Plays automated games with the real WordyController rules, but against a
+NullView that draws nothing, so no Tk window (or display) is needed. Guesses
+come from pluggable strategies, and games can be spread over a pool of worker
+processes that all share one preloaded lexicon.
+
+Example (one game per 5-letter answer word, using the hint solver):
+
+    python simulate.py --strategy solver --word-size 5
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Sequence
+
+import lexicon
+from models import LetterState, WordyModel, score_guess
+from wordy import WordyController
+
+
+class NullView:
+    """ A stand-in for WordyView that records what the controller does
+    instead of drawing it. """
+
+    # instance variables
+    handlers: dict[str, Callable[[], None]]  # keyboard key -> handler
+    bindings: dict[str, Callable]            # event type -> action
+    messages: list[str]                      # every message displayed
+    is_over: bool                            # whether game_over was called
+    clipboard: str                           # text returned by get_clipboard
+
+    def __init__(self, settings: Optional[dict] = None) -> None:
+        self.settings = settings
+        self.handlers = {}
+        self.bindings = {}
+        self.messages = []
+        self.is_over = False
+        self.clipboard = ""
+
+    def set_key_handler(self, key: str, handler: Callable[[], None]) -> None:
+        self.handlers[key] = handler
+
+    def create_binding(self, event_type: str, action: Callable) -> None:
+        self.bindings[event_type] = action
+
+    def schedule(self, delay: int, callback: Callable[[], None]) -> None:
+        # there is no event loop, so scheduled callbacks never run
+        pass
+
+    def schedule_idle(self, callback: Callable[[], None]) -> None:
+        # nothing else is waiting, so the callback can run right away
+        callback()
+
+    def guard_input(self, handler: Callable[[], None]) -> Callable[[], None]:
+        return handler
+
+    def get_clipboard(self) -> str:
+        return self.clipboard
+
+    def set_letter(self, letter: str, guess_num: int, letter_index: int) -> None:
+        pass
+
+    def display_candidates(self, count: int, sample: list[str]) -> None:
+        pass
+
+    def mark_invalid_guess(self, guess_num: int, invalid: bool) -> None:
+        pass
+
+    def display_guess_result(self, guess_num: int, guess_results: list[LetterState],
+                             letter_states: dict[str, LetterState],
+                             on_complete: Optional[Callable[[], None]] = None) -> None:
+        if on_complete is not None:
+            on_complete()
+
+    def display_message(self, msg: str) -> None:
+        self.messages.append(msg)
+
+    def game_over(self) -> None:
+        self.is_over = True
+
+    def start_gui(self) -> None:
+        pass
+
+    def quit_program(self) -> None:
+        pass
+
+    def press(self, key: str) -> None:
+        """ Simulates pressing the given keyboard key (a-z, "back" or "enter"). """
+        self.handlers[key]()
+
+    def type_word(self, word: str) -> None:
+        """ Simulates typing <word> and pressing ENTER. """
+        for letter in word:
+            self.press(letter)
+        self.press("enter")
+
+
+class GuessStrategy(ABC):
+    """ Base class for automated players. Subclasses choose each guess. """
+
+    processes: Optional[int] = None  # processes for precomputing data, None for one per core
+
+    def new_game(self, model: WordyModel) -> None:
+        """ Called before each game with the model being played. """
+        self.model = model
+
+    @abstractmethod
+    def next_guess(self, history: list[tuple[str, list[LetterState]]]) -> str:
+        """ Returns the next word to guess, given the guesses made so far and
+        their results. """
+
+
+class RandomStrategy(GuessStrategy):
+    """ Guesses a random word that is consistent with every result so far. """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.rng = random.Random(seed)
+
+    def new_game(self, model: WordyModel) -> None:
+        super().new_game(model)
+        self.candidates = list(model.word_list)
+
+    def next_guess(self, history: list[tuple[str, list[LetterState]]]) -> str:
+        # scored directly: these pairs are each needed once, so caching them
+        # would only push the game's own entries out of the shared cache
+        if history:
+            guess, results = history[-1]
+            self.candidates = [word for word in self.candidates if score_guess(guess, word) == results]
+        return self.rng.choice(self.candidates)
+
+
+class SolverStrategy(GuessStrategy):
+    """ Guesses whatever the hint solver suggests (requires NumPy). """
+
+    def new_game(self, model: WordyModel) -> None:
+        from feedback_matrix import load_feedback_matrix
+        from solver import HintSolver
+
+        super().new_game(model)
+        self.solver = HintSolver(model, load_feedback_matrix(model, self.processes))
+
+    def next_guess(self, history: list[tuple[str, list[LetterState]]]) -> str:
+        if history:
+            self.solver.observe(*history[-1])
+        return self.solver.best_guess()
+
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "solver": SolverStrategy,
+}
+
+
+def play_game(answer: str, strategy: GuessStrategy, settings: dict) -> Optional[int]:
+    """ Plays one game against the answer <answer> using <strategy>.
+
+    Parameters:
+        answer (str): The hidden word.
+        strategy (GuessStrategy): The player.
+        settings (dict): Game settings (word_size, num_guesses, word_list_file).
+
+    Returns:
+        (int | None) The number of guesses it took to win, or None if the
+        game was lost.
+    """
+    model = WordyModel(settings['word_size'], settings['word_list_file'], preselected_word=answer)
+    view = NullView(settings)
+    controller = WordyController(view, model, settings)
+    strategy.new_game(model)
+
+    while not view.is_over:
+        guesses_made = controller.current_guess_num
+        view.type_word(strategy.next_guess(controller.guess_history))
+        if controller.current_guess_num == guesses_made:
+            raise RuntimeError(f"Strategy guess was rejected: {view.messages[-1]}")
+
+    if controller.guess_history[-1][0] == answer:
+        return controller.current_guess_num
+    return None
+
+
+class SimulationResult:
+    """ Summary of a batch of simulated games. """
+
+    # instance variables
+    games: int                               # number of games played
+    seconds: float                           # wall clock time taken
+    distribution: Counter[Optional[int]]     # guesses to win -> games (None = lost)
+
+    def __init__(self, outcomes: Sequence[Optional[int]], seconds: float) -> None:
+        self.games = len(outcomes)
+        self.seconds = seconds
+        self.distribution = Counter(outcomes)
+
+    @property
+    def wins(self) -> int:
+        return self.games - self.distribution[None]
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.seconds if self.seconds > 0 else float('inf')
+
+    def __str__(self) -> str:
+        lines = [f"{self.games} games in {self.seconds:.2f}s ({self.games_per_second:.1f} games/s)",
+                 f"won {self.wins} ({100 * self.wins / max(1, self.games):.1f}%)"]
+        for guesses in sorted(k for k in self.distribution if k is not None):
+            lines.append(f"  {guesses}: {self.distribution[guesses]}")
+        lines.append(f"  lost: {self.distribution[None]}")
+        return '\n'.join(lines)
+
+
+# settings and strategy used by each worker process
+_worker_settings: Optional[dict] = None
+_worker_strategy: Optional[GuessStrategy] = None
+
+
+def _init_worker(settings: dict, strategy: GuessStrategy) -> None:
+    global _worker_settings, _worker_strategy
+    _worker_settings = settings
+    _worker_strategy = strategy
+    # every core already runs a worker, so a worker must not start its own pool
+    _worker_strategy.processes = 1
+    lexicon.get_lexicon(settings['word_list_file'])
+
+
+def _play_chunk(answers: Sequence[str]) -> list[Optional[int]]:
+    return [play_game(answer, _worker_strategy, _worker_settings) for answer in answers]
+
+
+def simulate(settings: dict, strategy: GuessStrategy, answers: Optional[Sequence[str]] = None,
+             processes: Optional[int] = None, chunk_size: int = 50) -> SimulationResult:
+    """ Plays one game for each answer word and summarizes the outcomes.
+
+    Parameters:
+        settings (dict): Game settings (word_size, num_guesses, word_list_file).
+        strategy (GuessStrategy): The player (copied to each worker process).
+        answers (Sequence[str]): The answers to play against, or None for
+            every word in the word list.
+        processes (int): Number of worker processes, or None for one per CPU
+            core. With 1, games are played in this process.
+        chunk_size (int): Number of games handed to a worker at a time.
+    """
+    # load the lexicon before forking so that workers inherit it
+    word_list = lexicon.get_word_list(settings['word_list_file'], settings['word_size'])
+    if answers is None:
+        answers = list(word_list)
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    start = time.perf_counter()
+    if processes <= 1:
+        outcomes = [play_game(answer, strategy, settings) for answer in answers]
+    else:
+        chunks = [answers[i:i + chunk_size] for i in range(0, len(answers), chunk_size)]
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(settings, strategy)) as pool:
+            outcomes = [outcome for chunk in pool.map(_play_chunk, chunks) for outcome in chunk]
+
+    return SimulationResult(outcomes, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play automated Wordy games without a GUI.")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="random")
+    parser.add_argument("--word-size", type=int, help="overrides word_size in settings.json")
+    parser.add_argument("--word-list", help="overrides word_list_file in settings.json")
+    parser.add_argument("--processes", type=int, help="number of worker processes (default: one per core)")
+    parser.add_argument("--limit", type=int, help="only play against the first LIMIT answers")
+    args = parser.parse_args()
+
+    with open("settings.json", 'r') as settings_file:
+        settings = json.load(settings_file)
+    if args.word_size is not None:
+        settings['word_size'] = args.word_size
+    if args.word_list is not None:
+        settings['word_list_file'] = args.word_list
+
+    answers = list(lexicon.get_word_list(settings['word_list_file'], settings['word_size']))
+    if args.limit is not None:
+        answers = answers[:args.limit]
+
+    print(simulate(settings, STRATEGIES[args.strategy](), answers, args.processes))
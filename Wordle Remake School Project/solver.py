@@ -0,0 +1,173 @@
+"""
+Module: solver
+
+Entropy-based hint engine for Wordy.
+
+HintSolver keeps track of which words could still be the answer given the
+guesses made so far, and suggests the guess that is expected to narrow those
+candidates down the most (i.e. the one with the highest expected information,
+measured as the entropy of the feedback patterns it would produce).
+
+All the scoring is done with the precomputed feedback matrix (see
+feedback_matrix), so ranking every guess is a matter of counting feedback
+codes per guess, which is done in vectorized chunks.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+import lexicon
+from feedback_matrix import load_feedback_matrix
+from models import LetterState, NotAWordError, WordyModel
+from scoring import encode_pattern
+
+
+# upper bound on the number of pattern counters (guesses x patterns) and
+# scored pairs (guesses x candidates) per chunk when ranking guesses
+_CHUNK_COUNTERS = 4_000_000
+_CHUNK_PAIRS = 4_000_000
+
+
+class HintSolver:
+    """ Suggests guesses for a game played with the given model. """
+
+    # instance variables
+    model: WordyModel       # the model whose word list is used
+    matrix: np.ndarray      # feedback codes, [guess id, answer id] (see lexicon.word_id)
+    candidates: np.ndarray  # ids of the words that could still be the answer
+
+    def __init__(self, model: WordyModel, matrix: Optional[np.ndarray] = None) -> None:
+        self.model = model
+        self.matrix = load_feedback_matrix(model) if matrix is None else matrix
+        self.candidates = np.arange(len(model.word_list), dtype=np.int32)
+
+    def copy(self) -> "HintSolver":
+        """ Returns a solver with the same candidates that can be updated (or
+        used from another thread) independently of this one. The word list
+        and feedback matrix are shared. """
+        solver = HintSolver.__new__(HintSolver)
+        solver.model = self.model
+        solver.matrix = self.matrix
+        solver.candidates = self.candidates
+        return solver
+
+    def observe(self, guess: str, letter_states: Sequence[LetterState]) -> None:
+        """ Narrows the candidates down to the words that would have given
+        <letter_states> for <guess>.
+
+        Parameters:
+            guess (str): The word that was guessed.
+            letter_states (Sequence[LetterState]): The result of the guess, as
+                returned by WordyModel.check_guess.
+
+        Raises:
+            NotAWordError: When guess is not in the word list.
+        """
+        guess_id = lexicon.word_id(self.model.word_list, guess)
+        if guess_id < 0:
+            raise NotAWordError
+        codes = self.matrix[guess_id, self.candidates]
+        self.candidates = self.candidates[codes == encode_pattern(letter_states)]
+
+    def remaining(self) -> list[str]:
+        """ Returns the words that could still be the answer. """
+        return [self.model.word_list[i] for i in self.candidates]
+
+    def expected_information(self, guess_ids: np.ndarray) -> np.ndarray:
+        """ Returns the expected information (in bits) that each of the given
+        guesses would reveal about the current candidates.
+
+        Parameters:
+            guess_ids (np.ndarray): The ids of the guesses to rank.
+        """
+        num_candidates = len(self.candidates)
+        num_patterns = 3 ** self.model.word_size
+        information = np.zeros(len(guess_ids), dtype=np.float64)
+        if num_candidates == 0:
+            return information
+
+        # with few candidates (or long words) most patterns never occur, so
+        # sorting the codes and counting runs beats a table of every pattern
+        dense = num_patterns <= num_candidates
+        if dense:
+            rows_per_chunk = max(1, min(_CHUNK_COUNTERS // num_patterns, _CHUNK_PAIRS // num_candidates))
+        else:
+            rows_per_chunk = max(1, _CHUNK_PAIRS // num_candidates)
+
+        for start in range(0, len(guess_ids), rows_per_chunk):
+            rows = guess_ids[start:start + rows_per_chunk]
+            codes = self.matrix[rows][:, self.candidates]
+
+            # H = log2(n) - sum(c * log2(c)) / n, where c are the pattern counts
+            if dense:
+                weighted = self._dense_weights(codes, num_patterns)
+            else:
+                weighted = self._sparse_weights(codes)
+            information[start:start + len(rows)] = np.log2(num_candidates) - weighted / num_candidates
+
+        return information
+
+    @staticmethod
+    def _dense_weights(codes: np.ndarray, num_patterns: int) -> np.ndarray:
+        """ Returns sum(c * log2(c)) over the pattern counts c of each row of
+        <codes>, counting into a table of every possible pattern. """
+        codes = codes.astype(np.int64)
+
+        # count each pattern per guess by giving every row its own range
+        # of bins: row r's pattern p goes to bin r * num_patterns + p
+        codes += (np.arange(len(codes), dtype=np.int64) * num_patterns)[:, None]
+        counts = np.bincount(codes.ravel(), minlength=len(codes) * num_patterns)
+        counts = counts.reshape(len(codes), num_patterns)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weighted = np.where(counts > 0, counts * np.log2(counts), 0.0)
+        return weighted.sum(axis=1)
+
+    @staticmethod
+    def _sparse_weights(codes: np.ndarray) -> np.ndarray:
+        """ Returns sum(c * log2(c)) over the pattern counts c of each row of
+        <codes>, counting the runs of equal codes in each sorted row. """
+        codes = np.sort(codes, axis=1)
+        run_starts = np.ones(codes.shape, dtype=bool)
+        run_starts[:, 1:] = codes[:, 1:] != codes[:, :-1]
+
+        # every row starts a run, so no run spans two rows
+        starts = np.flatnonzero(run_starts)
+        counts = np.diff(np.append(starts, codes.size))
+        run_rows = starts // codes.shape[1]
+        return np.bincount(run_rows, weights=counts * np.log2(counts), minlength=len(codes))
+
+    def best_guess(self) -> str:
+        """ Returns the guess that is expected to narrow the candidates down
+        the most. Among equally good guesses, one that could be the answer is
+        preferred.
+
+        Raises:
+            RuntimeError: When no word is consistent with the observed guesses.
+        """
+        if len(self.candidates) == 0:
+            raise RuntimeError("No words match the guesses made so far")
+        if len(self.candidates) <= 2:
+            return self.model.word_list[self.candidates[0]]
+
+        if len(self.candidates) == len(self.model.word_list):
+            # the opening guess doesn't depend on the game, so it is only
+            # worked out once for each word list
+            guess_id = lexicon.derived(self.model.word_list, 'opening_guess', lambda words: self._best_guess_id())
+        else:
+            guess_id = self._best_guess_id()
+        return self.model.word_list[guess_id]
+
+    def _best_guess_id(self) -> int:
+        """ Returns the id of the best guess for the current candidates (see
+        best_guess). """
+        all_ids = np.arange(len(self.model.word_list), dtype=np.int32)
+        information = self.expected_information(all_ids)
+
+        is_candidate = np.zeros(len(all_ids), dtype=bool)
+        is_candidate[self.candidates] = True
+        best = information.max()
+        best_ids = np.flatnonzero(information >= best - 1e-9)
+        preferred = best_ids[is_candidate[best_ids]]
+        return int(preferred[0] if len(preferred) else best_ids[0])
@@ -0,0 +1,131 @@
+"""
+Module: stats
+
+Win statistics from the game journal (see journal).
+
+GameStats is updated incrementally, one finished game at a time, so the
+statistics are always current without re-reading the journal. Two GameStats
+for consecutive runs of games can also be merged (streaks that span the
+boundary included), which is what makes rebuilding from the journal
+parallel: each segment is scanned on its own, in a worker process, and the
+results are merged in order.
+
+    python stats.py journal
+"""
+
+import argparse
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from journal import GAME_END, read_records, segment_paths
+
+# journals smaller than this are scanned in this process, since starting
+# worker processes would take longer than the scan itself
+_PARALLEL_BYTES = 8 * 1024 * 1024
+
+
+class GameStats:
+    """ Win rate, streaks and guess distribution of a run of games. """
+
+    # instance variables
+    games: int                 # games played
+    wins: int                  # games won
+    distribution: Counter[int]  # guesses taken -> games won in that many guesses
+    current_streak: int        # wins since the last loss
+    max_streak: int            # longest run of wins
+    leading_streak: int        # wins before the first loss (used to merge)
+
+    def __init__(self) -> None:
+        self.games = 0
+        self.wins = 0
+        self.distribution = Counter()
+        self.current_streak = 0
+        self.max_streak = 0
+        self.leading_streak = 0
+
+    def add_game(self, won: bool, num_guesses: int) -> None:
+        """ Updates the statistics with one more finished game.
+
+        Parameters:
+            won (bool): Whether the game was won.
+            num_guesses (int): The number of guesses made.
+        """
+        if won:
+            self.wins += 1
+            self.distribution[num_guesses] += 1
+            self.current_streak += 1
+            self.max_streak = max(self.max_streak, self.current_streak)
+            if self.wins == self.games + 1:  # no loss yet
+                self.leading_streak += 1
+        else:
+            self.current_streak = 0
+        self.games += 1
+
+    def merge(self, later: "GameStats") -> None:
+        """ Adds the statistics of <later>, a run of games played after the
+        games counted here. """
+        self.max_streak = max(self.max_streak, later.max_streak, self.current_streak + later.leading_streak)
+        if self.wins == self.games:
+            self.leading_streak += later.leading_streak
+        if later.wins == later.games:
+            self.current_streak += later.current_streak
+        else:
+            self.current_streak = later.current_streak
+
+        self.games += later.games
+        self.wins += later.wins
+        self.distribution += later.distribution
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    def __str__(self) -> str:
+        lines = [f"played {self.games}, won {self.wins} ({100 * self.win_rate:.1f}%)",
+                 f"streak {self.current_streak} (best {self.max_streak})"]
+        for guesses in sorted(self.distribution):
+            lines.append(f"  {guesses}: {self.distribution[guesses]}")
+        return '\n'.join(lines)
+
+
+def scan_segment(path: str) -> GameStats:
+    """ Returns the statistics of the games that ended in the journal segment
+    at <path>, in one streaming pass over it. """
+    stats = GameStats()
+    for kind, num_guesses, _, _, won, _ in read_records(path):
+        if kind == GAME_END:
+            stats.add_game(won == 1, num_guesses)
+    return stats
+
+
+def rebuild(directory: str, processes: Optional[int] = None) -> GameStats:
+    """ Returns the statistics of every game in the journal in <directory>.
+
+    Parameters:
+        directory (str): The journal directory.
+        processes (int): Number of worker processes to scan the segments
+            with, or None for one per CPU core. With 1 (or a single
+            segment, or a small journal), they are scanned in this process.
+    """
+    paths = segment_paths(directory)
+    if processes == 1 or len(paths) <= 1 or sum(os.path.getsize(path) for path in paths) < _PARALLEL_BYTES:
+        results = [scan_segment(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(scan_segment, paths))
+
+    stats = GameStats()
+    for segment_stats in results:
+        stats.merge(segment_stats)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the statistics of a Wordy game journal.")
+    parser.add_argument("directory", help="the journal directory")
+    parser.add_argument("--processes", type=int, help="number of worker processes (default: one per core)")
+    args = parser.parse_args()
+
+    print(rebuild(args.directory, args.processes))
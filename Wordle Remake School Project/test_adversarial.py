@@ -0,0 +1,44 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from adversarial import AdversarialWordyModel
+from models import score_guess
+
+def test_keeps_largest_consistent_group():
+    model = AdversarialWordyModel(4, 'long_wordlist.txt')
+    before = model.remaining()
+
+    is_correct, letter_states, _ = model.check_guess("peat")
+
+    groups = {}
+    for word in before:
+        groups.setdefault(tuple(score_guess("peat", word)), []).append(word)
+    assert not is_correct, "Adversary gave the win away"
+    assert model.remaining() == groups[tuple(letter_states)], "Kept words don't match the result"
+    assert len(model.remaining()) == max(len(group) for group in groups.values()), "Didn't keep the largest group"
+    assert model.word in model.remaining(), "Answer isn't a candidate"
+
+def test_win_only_when_one_candidate_left(tmp_path):
+    word_file = tmp_path / "words.txt"
+    word_file.write_text("cat\ncot\ncut\n")
+    model = AdversarialWordyModel(3, str(word_file))
+
+    assert not model.check_guess("cat")[0], "Won with three candidates left"
+    assert model.remaining() == ["cot", "cut"], "Wrong candidates kept"
+    assert not model.check_guess("cot")[0], "Won with two candidates left"
+    assert model.check_guess("cut")[0], "Last candidate was not accepted"
+
+def test_long_words():
+    # 3 ** 20 possible codes: far too many to count in a dense table
+    model = AdversarialWordyModel(20, 'long_wordlist.txt')
+    before = model.remaining()
+
+    is_correct, letter_states, _ = model.check_guess("electrocardiographic")
+
+    groups = {}
+    for word in before:
+        groups.setdefault(tuple(score_guess("electrocardiographic", word)), []).append(word)
+    assert not is_correct, "Adversary gave the win away"
+    assert model.remaining() == groups[tuple(letter_states)], "Kept words don't match the result"
+    assert len(model.remaining()) == max(len(group) for group in groups.values()), "Didn't keep the largest group"
@@ -0,0 +1,38 @@
+from candidates import CandidateSet
+from models import WordyModel, score_guess
+from pattern_index import get_pattern_index
+from simulate import NullView
+from wordy import WordyController
+
+def test_narrow_and_reset():
+    model = WordyModel(4, 'long_wordlist.txt', preselected_word="help")
+    candidates = CandidateSet(get_pattern_index(model.word_list))
+
+    candidates.narrow("peat", score_guess("peat", "help"))
+    candidates.narrow("cash", score_guess("cash", "help"))
+
+    expected = [word for word in model.word_list
+                if score_guess("peat", word) == score_guess("peat", "help")
+                and score_guess("cash", word) == score_guess("cash", "help")]
+    assert candidates.sample(len(expected) + 1) == expected, "Wrong candidates"
+    assert candidates.count == len(expected), "Wrong count"
+
+    candidates.reset()
+    assert candidates.count == len(model.word_list), "Reset didn't restore every word"
+
+class CandidatesView(NullView):
+    def display_candidates(self, count, sample):
+        self.candidates = (count, sample)
+
+def test_controller_reports_candidates():
+    settings = {'word_size': 4, 'num_guesses': 6}
+    model = WordyModel(4, 'long_wordlist.txt', preselected_word="help")
+    view = CandidatesView(settings)
+    controller = WordyController(view, model, settings)
+
+    view.type_word("peat")
+
+    count, sample = view.candidates
+    assert count == controller.candidates.count, "Wrong count shown"
+    assert "help" in controller.candidates.sample(count), "Answer was ruled out"
+    assert len(sample) <= WordyController.CANDIDATE_SAMPLE_SIZE, "Sample too large"
@@ -0,0 +1,82 @@
+import os
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import feedback_matrix
+from models import WordyModel
+from scoring import encode_pattern
+
+def write_words(path, words):
+    path.write_text('\n'.join(words) + '\n')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def test_matrix_matches_check_guess(tmp_path):
+    word_file = tmp_path / "words.txt"
+    write_words(word_file, ["help", "peat", "cash", "stop", "sits", "mess"])
+    model = WordyModel(4, str(word_file), preselected_word="help")
+
+    matrix = feedback_matrix.load_feedback_matrix(model)
+
+    for a, answer in enumerate(model.word_list):
+        answer_model = WordyModel(4, str(word_file), preselected_word=answer)
+        for g, guess in enumerate(model.word_list):
+            _, letter_states, _ = answer_model.check_guess(guess)
+            assert matrix[g, a] == encode_pattern(letter_states), f"Wrong code for {guess} vs {answer}"
+
+def test_matrix_cached_and_invalidated(tmp_path):
+    word_file = tmp_path / "words.txt"
+    write_words(word_file, ["help", "peat", "cash"])
+    model = WordyModel(4, str(word_file))
+
+    feedback_matrix.load_feedback_matrix(model)
+    first_cache = feedback_matrix.feedback_matrix_path(str(word_file), 4, model.word_list)
+    assert os.path.exists(first_cache), "Matrix was not saved"
+
+    write_words(word_file, ["help", "peat", "cash", "stop"])
+    model = WordyModel(4, str(word_file))
+
+    matrix = feedback_matrix.load_feedback_matrix(model)
+    assert matrix.shape == (4, 4), "Stale matrix was loaded"
+    assert not os.path.exists(first_cache), "Stale cache file was kept"
+
+def test_parallel_build_matches_serial_build(monkeypatch):
+    model = WordyModel(4, 'short_wordlist.txt')
+    words = list(model.word_list)[:300]
+
+    monkeypatch.setattr(feedback_matrix, "_MIN_PARALLEL_WORDS", 0)
+    monkeypatch.setattr(feedback_matrix, "_CHUNK_LETTERS", 300 * 4 * 50)
+
+    serial = feedback_matrix.build_feedback_matrix(words, processes=1)
+    parallel = feedback_matrix.build_feedback_matrix(words, processes=2)
+    assert np.array_equal(serial, parallel), "Parallel build differs"
+
+def test_parallel_build_from_a_thread(monkeypatch):
+    monkeypatch.setattr(feedback_matrix, '_MIN_PARALLEL_WORDS', 10)
+    monkeypatch.setattr(feedback_matrix, '_CHUNK_LETTERS', 4000)
+    words = WordyModel(4, 'short_wordlist.txt').word_list
+    results = []
+
+    thread = threading.Thread(target=lambda: results.append(feedback_matrix.build_feedback_matrix(words, processes=2)))
+    thread.start()
+    thread.join(timeout=120)
+
+    assert results, "Parallel build from a background thread did not finish"
+    assert np.array_equal(results[0], feedback_matrix.build_feedback_matrix(words, processes=1)), \
+        "Parallel build gave a different matrix"
+
+def test_unreadable_cache_is_rebuilt(tmp_path):
+    word_file = tmp_path / "words.txt"
+    write_words(word_file, ["help", "peat", "cash"])
+    model = WordyModel(4, str(word_file))
+    cache = feedback_matrix.feedback_matrix_path(str(word_file), 4, model.word_list)
+    with open(cache, 'wb') as f:
+        f.write(b"\x93NUMPY truncated")
+
+    matrix = feedback_matrix.load_feedback_matrix(model)
+    assert matrix.shape == (3, 3) and matrix[0, 0] == 3 ** 4 - 1, "Damaged cache was not rebuilt"
+    assert np.array_equal(np.load(cache), matrix), "Rebuilt matrix was not saved"
+    assert not list(tmp_path.glob("*.tmp")), "Temporary file left behind"
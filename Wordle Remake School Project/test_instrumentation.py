@@ -0,0 +1,55 @@
+import json
+
+from instrumentation import LatencyHistogram, Tracer, instrument
+from models import WordyModel
+from simulate import NullView
+from wordy import WordyController
+
+def test_histogram_buckets_bound_durations():
+    for ns in [0, 1, 3, 4, 7, 8, 1000, 123456789, 2 ** 40 + 12345]:
+        bucket = LatencyHistogram.bucket(ns)
+        assert LatencyHistogram.bucket_limit(bucket) >= ns, f"Bucket too small for {ns}"
+        assert LatencyHistogram.bucket_limit(bucket) <= ns * 1.25 + 1, f"Bucket too wide for {ns}"
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for us in range(1, 101):
+        histogram.record(us * 1000)
+
+    assert histogram.count == 100 and histogram.max == 100_000, "Wrong count or max"
+    assert 50_000 <= histogram.percentile(0.5) <= 50_000 * 1.25, "Wrong median"
+    assert 99_000 <= histogram.percentile(0.99) <= 100_000, "Wrong p99"
+
+def test_instrumented_game_is_traced(tmp_path):
+    settings = {'word_size': 4, 'num_guesses': 6}
+    model = WordyModel(4, 'short_wordlist.txt', preselected_word="help")
+    view = NullView(settings)
+    tracer = Tracer()
+    instrument(model, view, tracer)
+    WordyController(view, model, settings)
+
+    view.type_word("heat")
+
+    assert tracer.histograms["key_handler"].count == 5, "Key presses not timed"
+    assert tracer.histograms["check_guess"].count == 1, "check_guess not timed"
+
+    trace_file = tmp_path / "trace.json"
+    tracer.save_trace(str(trace_file))
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    assert len(events) == 6 and all(event["ph"] == "X" for event in events), "Wrong trace events"
+    assert "check_guess" in tracer.summary(), "Stage missing from the summary"
+
+def test_pasted_keys_are_timed():
+    settings = {'word_size': 4, 'num_guesses': 6}
+    model = WordyModel(4, 'short_wordlist.txt', preselected_word="help")
+    view = NullView(settings)
+    tracer = Tracer()
+    instrument(model, view, tracer)
+    controller = WordyController(view, model, settings)
+
+    view.press("h")
+    view.clipboard = "elp"
+    view.bindings["<Control-v>"](None)
+
+    assert controller.current_guess == list("help"), "Pasted word not typed"
+    assert tracer.histograms["key_handler"].count == 2, "Paste not timed as one batch"
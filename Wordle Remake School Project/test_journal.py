@@ -0,0 +1,82 @@
+import random
+
+import stats
+import journal as journal_module
+from journal import GAME_END, GUESS, Journal, read_records, segment_paths
+from models import WordyModel
+from simulate import NullView
+from stats import GameStats, rebuild
+from wordy import WordyController
+
+def test_records_round_trip(tmp_path):
+    with Journal(str(tmp_path), 4) as journal:
+        game = journal.new_game()
+        journal.record_guess(game, 0, 17, 42)
+        journal.record_game_end(game, 1, 17, True)
+
+    records = list(read_records(segment_paths(str(tmp_path))[0]))
+    assert [r[:5] for r in records] == [(GUESS, 0, game, 17, 42), (GAME_END, 1, game, 17, 1)], "Wrong records"
+    assert records[0][5] <= records[1][5], "Timestamps out of order"
+
+def test_segments_rotate_and_game_ids_continue(tmp_path):
+    with Journal(str(tmp_path), 4, segment_records=3, buffer_records=2) as journal:
+        for _ in range(4):
+            journal.record_game_end(journal.new_game(), 3, 0, True)
+    assert len(segment_paths(str(tmp_path))) == 2, "Segment not rotated"
+
+    with Journal(str(tmp_path), 4) as journal:
+        assert journal.new_game() == 5, "Game ids restarted"
+
+def test_merged_stats_match_incremental_stats(tmp_path, monkeypatch):
+    rng = random.Random(1)
+    outcomes = [(rng.random() < 0.7, rng.randint(1, 6)) for _ in range(500)]
+
+    expected = GameStats()
+    with Journal(str(tmp_path), 4, segment_records=37) as journal:
+        for won, num_guesses in outcomes:
+            journal.record_game_end(journal.new_game(), num_guesses, 0, won)
+            expected.add_game(won, num_guesses)
+
+    monkeypatch.setattr(stats, '_PARALLEL_BYTES', 0)
+    for processes in (1, 2):
+        rebuilt = rebuild(str(tmp_path), processes)
+        assert (rebuilt.games, rebuilt.wins, rebuilt.current_streak, rebuilt.max_streak) == \
+            (expected.games, expected.wins, expected.current_streak, expected.max_streak), "Wrong totals or streaks"
+        assert rebuilt.distribution == expected.distribution, "Wrong guess distribution"
+
+def test_controller_records_game(tmp_path):
+    settings = {'word_size': 4, 'num_guesses': 6}
+    model = WordyModel(4, 'short_wordlist.txt', preselected_word="help")
+    view = NullView(settings)
+    game_stats = GameStats()
+    with Journal(str(tmp_path), 4) as journal:
+        WordyController(view, model, settings, journal, game_stats)
+        view.type_word("heat")
+        view.type_word("help")
+
+    kinds = [record[0] for record in read_records(segment_paths(str(tmp_path))[0])]
+    assert kinds == [GUESS, GUESS, GAME_END], "Game not journaled"
+    assert (game_stats.games, game_stats.wins, game_stats.distribution[2]) == (1, 1, 1), "Stats not updated"
+
+def test_long_word_codes_fit(tmp_path):
+    # 3 ** 21 - 1 doesn't fit in 32 bits
+    settings = {'word_size': 21, 'num_guesses': 6}
+    model = WordyModel(21, 'long_wordlist.txt', preselected_word="hypercholesterolaemia")
+    view = NullView(settings)
+    with Journal(str(tmp_path), 21) as journal:
+        controller = WordyController(view, model, settings, journal)
+        view.type_word("magnetohydrodynamical")
+        view.type_word("hypercholesterolaemia")
+
+    records = list(read_records(segment_paths(str(tmp_path))[0]))
+    assert controller.current_guess_num == 2 and view.is_over, "Game did not finish"
+    assert [r[0] for r in records] == [GUESS, GUESS, GAME_END], "Game not journaled"
+    assert records[1][4] == 3 ** 21 - 1, "Winning code not stored in full"
+
+def test_version_1_segments_are_read(tmp_path):
+    path = tmp_path / "journal.000001.bin"
+    path.write_bytes(journal_module.HEADER.pack(journal_module.JOURNAL_MAGIC, 1, 4, 1)
+                     + journal_module._RECORDS[1].pack(GUESS, 0, 1, 17, 42, 123))
+
+    assert list(read_records(str(path))) == [(GUESS, 0, 1, 17, 42, 123)], "Old segment not read"
+
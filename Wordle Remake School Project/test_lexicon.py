@@ -0,0 +1,75 @@
+import os
+
+import lexicon
+from models import WordyModel
+
+def test_models_share_word_list():
+    first = WordyModel(4, 'long_wordlist.txt', preselected_word="help")
+    second = WordyModel(4, 'long_wordlist.txt', preselected_word="stop")
+
+    assert first.word_list is second.word_list, "Word list was loaded twice"
+
+def test_word_list_reloaded_when_file_changes(tmp_path):
+    word_file = tmp_path / "words.txt"
+    word_file.write_text("cat\ndog\n")
+    assert lexicon.get_word_list(str(word_file), 3) == ("cat", "dog")
+
+    word_file.write_text("cat\ndog\nemu\n")
+    stat = os.stat(word_file)
+    os.utime(word_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert lexicon.get_word_list(str(word_file), 3) == ("cat", "dog", "emu"), "Stale word list"
+
+def test_compiled_lexicon_matches_text_file(tmp_path):
+    compiled_file = str(tmp_path / "long_wordlist.lex")
+    lexicon.compile_lexicon('long_wordlist.txt', compiled_file)
+
+    text_words = lexicon.get_word_list('long_wordlist.txt', 5)
+    compiled_words = lexicon.get_word_list(compiled_file, 5)
+
+    assert sorted(set(text_words)) == list(compiled_words), "Compiled words differ"
+    assert "hello" in compiled_words, "Binary search missed a word"
+    assert "zzzzz" not in compiled_words, "Binary search found a non-word"
+    assert len(lexicon.get_word_list(compiled_file, 30)) == 0, "Unexpected words"
+
+def test_model_uses_compiled_lexicon(tmp_path):
+    compiled_file = str(tmp_path / "long_wordlist.lex")
+    lexicon.compile_lexicon('long_wordlist.txt', compiled_file)
+
+    model = WordyModel(4, compiled_file, preselected_word="help")
+    is_correct, _, _ = model.check_guess("help")
+    assert is_correct, "Wrong result (answer and guess are both 'help')"
+
+def test_single_pass_loader_normalizes_words(tmp_path):
+    word_file = tmp_path / "words.txt"
+    word_file.write_text("Cat\n  dog \n\ncat\nHorse\r\nemu\n")
+
+    buckets = lexicon.load_buckets(str(word_file))
+    assert buckets == {3: ["cat", "dog", "emu"], 5: ["horse"]}, "Words not normalized"
+
+def test_all_word_sizes_served_from_one_load():
+    lex = lexicon.get_lexicon('long_wordlist.txt')
+
+    for size in (4, 5, 6):
+        model = WordyModel(size, 'long_wordlist.txt')
+        assert model.word_list is lex.words(size), "Word list was not served from the lexicon"
+
+def test_derived_data_is_built_once_per_loaded_list(tmp_path):
+    word_file = tmp_path / "words.txt"
+    word_file.write_text("cat\ndog\n")
+    builds = []
+    def build(words):
+        builds.append(words)
+        return len(words)
+
+    words = lexicon.get_word_list(str(word_file), 3)
+    assert lexicon.derived(words, 'count', build) == 2, "Wrong derived data"
+    assert lexicon.derived(lexicon.get_word_list(str(word_file), 3), 'count', build) == 2, "Wrong cached data"
+    assert len(builds) == 1, "Derived data not shared by the same word list"
+
+    word_file.write_text("cat\ndog\nemu\n")
+    stat = os.stat(word_file)
+    os.utime(word_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert lexicon.derived(lexicon.get_word_list(str(word_file), 3), 'count', build) == 3, \
+        "Derived data kept after the word file changed"
+
@@ -1,6 +1,8 @@
+import threading
+
 import pytest
 
-from models import NotAWordError, LetterState, WordyModel
+from models import NotAWordError, HardModeError, LetterState, WordyModel, ScoreCache, score_guess, score_with_positions
 
 def test_check_guess_correct():
     model = WordyModel(4, 'long_wordlist.txt', preselected_word="help")
@@ -104,6 +106,94 @@ def test_check_guess_raises_notaword_exception():
     with pytest.raises(NotAWordError):
         model.check_guess("fftz")
 
+def test_set_word_raises_notaword_exception():
+    with pytest.raises(NotAWordError):
+        WordyModel(4, 'long_wordlist.txt', preselected_word="fftz")
+
+def test_word_list_keeps_order_for_random_choice():
+    model = WordyModel(4, 'long_wordlist.txt', preselected_word="help")
+
+    assert "help" in model.word_list, "Word missing from index"
+    assert model.word_list[model.word_list.words.index("help")] == "help", "Word list order lost"
+
+def test_hard_mode_requires_revealed_hints():
+    model = WordyModel(4, 'long_wordlist.txt', preselected_word="help", hard_mode=True)
+    model.check_guess("peat")
+
+    with pytest.raises(HardModeError, match="Letter 2 must be E"):
+        model.check_guess("cash")
+    with pytest.raises(HardModeError, match="Guess must contain P"):
+        model.check_guess("heat")
+
+    is_correct, _, _ = model.check_guess("help")
+    assert is_correct, "Valid hard mode guess was rejected"
+
+def test_hard_mode_off_by_default():
+    model = WordyModel(4, 'long_wordlist.txt', preselected_word="help")
+    model.check_guess("peat")
+
+    # "cash" ignores the revealed E and P, which only hard mode rejects
+    is_correct, letter_states, key_states = model.check_guess("cash")
+    assert not is_correct, "Wrong guess reported as correct"
+    assert letter_states == [LetterState.INCORRECT, LetterState.INCORRECT,
+                             LetterState.INCORRECT, LetterState.MISPLACED], "Wrong result for a guess ignoring hints"
+    assert key_states['h'] == LetterState.MISPLACED, "Wrong key state for a guess ignoring hints"
+
+def test_score_with_positions_matches_score_guess():
+    model = WordyModel(4, 'short_wordlist.txt')
+    words = list(model.word_list[:50])
+
+    for word in words:
+        positions = model.letter_positions(word)
+        for guess in words:
+            assert score_with_positions(guess, positions) == score_guess(guess, word), \
+                f"Wrong result for {guess} against {word}"
+
+def test_score_cache_hits_and_misses():
+    cache = ScoreCache()
+
+    assert cache.score("peat", "help") == score_guess("peat", "help"), "Wrong result on a miss"
+    assert cache.score("peat", "help") == score_guess("peat", "help"), "Wrong result on a hit"
+    assert (cache.hits, cache.misses) == (1, 1), "Wrong hit/miss counts"
+    assert cache.hit_rate == 0.5, "Wrong hit rate"
+
+def test_score_cache_evicts_least_recently_used():
+    cache = ScoreCache()
+    cache.max_bytes = 2 * cache.entry_size(("peat", "help"))
+
+    cache.score("peat", "help")
+    cache.score("heat", "help")
+    cache.score("peat", "help")
+    cache.score("lake", "help")
+
+    assert cache.size <= cache.max_bytes, "Cache grew past its bound"
+    assert cache.evictions == 1, "Wrong number of evictions"
+    assert ("heat", "help") not in cache.entries, "Evicted the wrong entry"
+    assert ("peat", "help") in cache.entries, "Evicted a recently used entry"
+
+def test_score_cache_shared_between_threads():
+    cache = ScoreCache()
+    words = list(WordyModel(4, 'short_wordlist.txt').word_list[:40])
+    cache.max_bytes = 100 * cache.entry_size(("peat", "help"))
+    errors = []
+
+    def score_all():
+        for guess in words:
+            for word in words:
+                if cache.score(guess, word) != score_guess(guess, word):
+                    errors.append((guess, word))
+
+    threads = [threading.Thread(target=score_all) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, "Wrong results from a shared cache"
+    assert cache.hits + cache.misses == 4 * len(words) ** 2, "Lookups were lost"
+    assert cache.size == sum(cache.entry_size(key) for key in cache.entries), "Size out of step with the entries"
+    assert cache.size <= cache.max_bytes, "Cache grew past its bound"
+
 
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,73 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from journal import Journal, read_records, segment_paths
+from models import LetterState, score_guess
+from multiboard import MultiWordyController, MultiWordyModel, adjust_settings, combine_key_states
+from simulate import NullView
+from stats import GameStats
+
+def test_scores_every_board():
+    answers = ["help", "stop", "mess", "lake"]
+    model = MultiWordyModel(4, 'short_wordlist.txt', 4, answers)
+
+    all_solved, results, _ = model.check_guess("heat")
+
+    assert not all_solved, "Solved every board with a wrong guess"
+    assert results == [score_guess("heat", answer) for answer in answers], "Board results don't match score_guess"
+
+def test_solved_boards_are_skipped():
+    model = MultiWordyModel(4, 'short_wordlist.txt', 2, ["help", "stop"])
+
+    assert not model.check_guess("help")[0], "Game won with a board left"
+    assert model.word == "stop", "Answer should move to the unsolved board"
+    all_solved, results, _ = model.check_guess("stop")
+    assert all_solved, "Game not won after solving every board"
+    assert results[0] is None, "Solved board was scored again"
+
+def test_combine_key_states():
+    combined = combine_key_states([{'a': LetterState.INCORRECT, 'b': LetterState.CORRECT},
+                                   {'a': LetterState.MISPLACED, 'b': LetterState.INCORRECT},
+                                   {'c': LetterState.INCORRECT}])
+    assert combined == {'a': LetterState.MISPLACED, 'b': LetterState.CORRECT, 'c': LetterState.INCORRECT}, \
+        "Keys should get their best state on any board"
+
+def test_headless_game():
+    settings = {'word_size': 4, 'num_guesses': 9}
+    model = MultiWordyModel(4, 'short_wordlist.txt', 4, ["help", "stop", "mess", "lake"])
+    view = NullView(settings)
+    controller = MultiWordyController(view, model, settings)
+
+    for word in ["help", "stop", "mess", "lake"]:
+        view.type_word(word)
+
+    assert view.is_over, "Game didn't end after solving every board"
+    assert view.messages[-1] == "Correct!!! Word Up, y'all!", "Wrong end message"
+    assert len(controller.guess_history) == 4, "Wrong number of guesses recorded"
+
+def test_games_are_not_journaled(tmp_path):
+    settings = {'word_size': 4, 'num_guesses': 9}
+    model = MultiWordyModel(4, 'short_wordlist.txt', 4, ["help", "stop", "mess", "lake"])
+    view = NullView(settings)
+    stats = GameStats()
+    with Journal(str(tmp_path), 4) as journal:
+        MultiWordyController(view, model, settings, journal, stats)
+        for word in ["help", "stop", "mess", "lake"]:
+            view.type_word(word)
+
+    assert view.is_over, "Game didn't end"
+    assert not [record for path in segment_paths(str(tmp_path)) for record in read_records(path)], \
+        "Multi-board game written to the journal"
+    assert stats.games == 0, "Multi-board game added to the statistics"
+
+def test_adjusted_settings_are_reported():
+    settings = {'boards': 4, 'num_guesses': 6, 'hard_mode': True, 'mode': 'adversarial'}
+    messages = adjust_settings(settings)
+
+    assert settings['num_guesses'] == 9 and not settings['hard_mode'], "Settings not adjusted"
+    assert settings['mode'] == 'classic', "Unsupported mode kept"
+    assert len(messages) == 3 and "num_guesses raised from 6 to 9" in messages[0], "Changes not reported"
+
+    settings = {'boards': 4, 'num_guesses': 12, 'hard_mode': False}
+    assert adjust_settings(settings) == [] and settings['num_guesses'] == 12, "Valid settings were changed"
@@ -0,0 +1,30 @@
+from models import LetterState, WordyModel, score_guess
+from pattern_index import PatternIndex
+
+def test_find_words_matches_scan():
+    model = WordyModel(5, 'long_wordlist.txt')
+    constraints = [('s', 0, LetterState.CORRECT),
+                   ('e', 2, LetterState.MISPLACED),
+                   ('a', None, LetterState.INCORRECT),
+                   ('t', None, LetterState.INCORRECT)]
+
+    expected = [word for word in model.word_list
+                if word[0] == 's' and 'e' in word and word[2] != 'e'
+                and 'a' not in word and 't' not in word]
+
+    assert model.find_words(constraints) == expected, "Query doesn't match a scan of the word list"
+
+def test_consistent_with_matches_scoring():
+    model = WordyModel(4, 'long_wordlist.txt')
+    index = PatternIndex(model.word_list)
+
+    for guess, answer in (("peat", "help"), ("sins", "stop"), ("mess", "sits")):
+        letter_states = score_guess(guess, answer)
+        expected = [word for word in model.word_list if score_guess(guess, word) == letter_states]
+        assert index.words_in(index.consistent_with(guess, letter_states)) == expected, f"Wrong words for {guess}"
+
+def test_letter_counts():
+    index = PatternIndex(["mess", "miss", "mast", "sass"])
+
+    assert index.words_in(index.containing('s', 2)) == ["mess", "miss", "sass"], "Wrong double-letter words"
+    assert index.words_in(index.containing('s', 3)) == ["sass"], "Wrong triple-letter words"
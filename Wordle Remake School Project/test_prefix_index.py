@@ -0,0 +1,46 @@
+from models import WordyModel
+from prefix_index import PrefixIndex, get_prefix_index
+from simulate import NullView
+from wordy import WordyController
+
+def test_prefixes_match_word_list():
+    model = WordyModel(5, 'short_wordlist.txt')
+    index = PrefixIndex(model.word_list)
+    prefixes = {word[:n] for word in model.word_list for n in range(6)}
+
+    for word in model.word_list:
+        assert word in index, f"{word} missing from index"
+        for n in range(6):
+            assert index.has_prefix(word[:n]), f"{word[:n]} should be a prefix"
+
+    for candidate in ("qx", "zzzzz", "hellq", "abcde"):
+        assert index.has_prefix(candidate) == (candidate in prefixes), f"Wrong answer for {candidate}"
+    assert "hel" not in index, "Prefix reported as a word"
+
+def test_suffixes_are_shared():
+    index = PrefixIndex(["tap", "taps", "top", "tops"])
+
+    # root, t, ta/to (merged), tap/top (merged), taps/tops (merged); a plain
+    # trie would need 9 nodes
+    assert index.num_nodes == 5, "Common suffixes were not merged"
+
+class RecordingView(NullView):
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.marks = []
+
+    def mark_invalid_guess(self, guess_num, invalid):
+        self.marks.append((guess_num, invalid))
+
+def test_controller_marks_dead_prefixes():
+    settings = {'word_size': 4, 'num_guesses': 6}
+    model = WordyModel(4, 'long_wordlist.txt', preselected_word="help")
+    view = RecordingView(settings)
+    controller = WordyController(view, model, settings)
+
+    view.press("h")
+    view.press("q")
+    view.press("back")
+
+    assert view.marks == [(0, True), (0, False)], "Dead prefix not marked and unmarked"
+    assert controller.prefix_index is get_prefix_index(model.word_list), "Index was not shared"
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from models import LetterState, WordyModel
+from scoring import check_guess_batch, decode_pattern, encode_pattern, encode_words
+
+def test_batch_matches_check_guess():
+    model = WordyModel(5, 'long_wordlist.txt', preselected_word="hello")
+    rng = random.Random(12)
+    guesses = rng.sample(list(model.word_list), 200)
+    answers = rng.sample(list(model.word_list), 200)
+
+    codes = check_guess_batch(encode_words(guesses), encode_words(answers))
+
+    for guess, answer, code in zip(guesses, answers, codes):
+        model = WordyModel(5, 'long_wordlist.txt', preselected_word=answer)
+        _, letter_states, _ = model.check_guess(guess)
+        assert code == encode_pattern(letter_states), f"Wrong code for {guess} vs {answer}"
+        assert decode_pattern(code, 5) == letter_states, f"Wrong states for {guess} vs {answer}"
+
+def test_batch_broadcasts_every_guess_against_every_answer():
+    guesses = encode_words(["help", "peat", "cash"])
+    answers = encode_words(["help", "stop"])
+
+    codes = check_guess_batch(guesses[:, None, :], answers[None, :, :])
+
+    assert codes.shape == (3, 2), "Wrong result shape"
+    assert codes[0, 0] == encode_pattern([LetterState.CORRECT] * 4), "Wrong code for help vs help"
+    assert codes[1, 0] == encode_pattern([LetterState.MISPLACED, LetterState.CORRECT,
+                                          LetterState.INCORRECT, LetterState.INCORRECT]), "Wrong code for peat vs help"
+
+def test_word_lists_only_hold_letters():
+    with pytest.raises(ValueError):
+        encode_words(["cross-bun"])
+
+    model = WordyModel(9, 'long_wordlist.txt')
+    assert "cross-bun" not in model.word_list, "Word with a hyphen was loaded"
+
+    # the batch scoring agrees with check_guess across the whole bucket
+    words = list(model.word_list)
+    codes = check_guess_batch(encode_words(["crossbars"]), encode_words(words))
+    for answer, code in zip(words, codes):
+        model = WordyModel(9, 'long_wordlist.txt', preselected_word=answer)
+        assert code == encode_pattern(model.check_guess("crossbars")[1]), f"Wrong code for crossbars vs {answer}"
+
+def test_encode_words_rejects_mixed_sizes():
+    with pytest.raises(ValueError):
+        encode_words(["help", "hello"])
+
+def test_encode_words_rejects_sizes_that_add_up():
+    # 2 + 3 + 1 letters would fill a 3x2 matrix if only the total was checked
+    with pytest.raises(ValueError):
+        encode_words(["ab", "abc", "a"])
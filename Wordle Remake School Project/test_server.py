@@ -0,0 +1,102 @@
+import asyncio
+import json
+
+import pytest
+
+from server import GameServer, HintSolver
+from loadgen import percentile, run
+
+SETTINGS = {'word_size': 4, 'num_guesses': 6, 'word_list_file': 'short_wordlist.txt'}
+
+async def send(reader, writer, message):
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+async def play_session():
+    server = GameServer(SETTINGS)
+    listener = await server.serve('127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+    new = await send(reader, writer, {"op": "new"})
+    session = new["session"]
+    server.sessions[session].model.set_word("help")
+
+    bad = await send(reader, writer, {"op": "guess", "session": session, "word": "fftz"})
+    wrong = await send(reader, writer, {"op": "guess", "session": session, "word": "heat"})
+    right = await send(reader, writer, {"op": "guess", "session": session, "word": "help"})
+    state = await send(reader, writer, {"op": "state", "session": session})
+    missing = await send(reader, writer, {"op": "state", "session": session + 1})
+
+    writer.close()
+    await writer.wait_closed()
+    listener.close()
+    await listener.wait_closed()
+    return new, bad, wrong, right, state, missing
+
+def test_server_plays_a_game():
+    new, bad, wrong, right, state, missing = asyncio.run(play_session())
+
+    assert new["ok"] and new["word_size"] == 4, "Session not created"
+    assert not bad["ok"] and bad["error"] == "fftz is not a valid word", "Invalid guess accepted"
+    assert wrong["result"] == [2, 2, 0, 0] and not wrong["over"], "Wrong result for a wrong guess"
+    assert right["won"] and right["over"] and right["answer"] == "help", "Winning guess not reported"
+    assert state["guesses"] == ["heat", "help"] and state["guesses_left"] == 4, "Wrong session state"
+    assert not missing["ok"], "Unknown session accepted"
+
+def broken_check_guess(guess):
+    raise RuntimeError("boom")
+
+async def hint_and_break():
+    server = GameServer(SETTINGS)
+    listener = await server.serve('127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+    session = (await send(reader, writer, {"op": "new"}))["session"]
+    server.sessions[session].model.set_word("help")
+    await send(reader, writer, {"op": "guess", "session": session, "word": "heat"})
+    hint = await send(reader, writer, {"op": "hint", "session": session})
+    solver = server.sessions[session].controller.solver
+
+    server.sessions[session].model.check_guess = broken_check_guess
+    broken = await send(reader, writer, {"op": "guess", "session": session, "word": "help"})
+    state = await send(reader, writer, {"op": "state", "session": session})
+
+    writer.close()
+    await writer.wait_closed()
+    listener.close()
+    await listener.wait_closed()
+    return hint, solver, broken, state
+
+def test_hints_and_failing_requests():
+    if HintSolver is None:
+        pytest.skip("hints need NumPy")
+
+    hint, solver, broken, state = asyncio.run(hint_and_break())
+
+    assert hint["ok"] and hint["hint"] in solver.model.word_list, "Hint is not a word"
+    assert "heat" not in solver.remaining(), "Solver did not observe the guess"
+    assert not broken["ok"] and "boom" in broken["error"], "Failing request not reported"
+    assert state["ok"] and state["guesses"] == ["heat"], "Connection did not survive the failure"
+
+async def load_test():
+    server = GameServer(SETTINGS)
+    listener = await server.serve('127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    report = await run('127.0.0.1', port, 4, 3, ["help", "stop", "mess", "lake"])
+    listener.close()
+    await listener.wait_closed()
+    return report, server
+
+def test_load_generator_plays_every_game():
+    report, server = asyncio.run(load_test())
+
+    assert report.sessions == 12, "Not every game was played"
+    assert len(report.latencies) >= 12, "Guess latencies missing"
+    assert not server.sessions, "Ended sessions were kept"
+
+def test_percentile():
+    assert percentile([1, 2, 3, 4], 0.5) == 2, "Wrong median"
+    assert percentile(list(range(1, 101)), 0.99) == 99, "Wrong p99"
@@ -0,0 +1,55 @@
+import struct
+
+import pytest
+
+import lexicon
+from models import NotAWordError, score_guess
+from sessions import LOST, PLAYING, WON, CompactSession, GameRules, SessionStore
+
+def make_rules(num_guesses=6):
+    return GameRules(lexicon.get_word_list('short_wordlist.txt', 4), 4, num_guesses)
+
+def test_compact_session_plays_by_the_rules():
+    rules = make_rules()
+    session = CompactSession(rules, rules.word_id("help"))
+
+    session.guess(rules, "heat")
+    assert session.history(rules) == [("heat", score_guess("heat", "help"))], "Wrong history"
+    assert session.status == PLAYING, "Game ended early"
+    with pytest.raises(NotAWordError):
+        session.guess(rules, "fftz")
+    session.guess(rules, "help")
+    assert session.status == WON, "Winning guess not detected"
+
+def test_store_plays_and_loses():
+    rules = make_rules(num_guesses=2)
+    store = SessionStore(rules)
+    slot = store.new_session(rules.word_id("help"))
+
+    store.guess(slot, "stop")
+    store.guess(slot, "mess")
+    assert store.status(slot) == LOST, "Game not lost after the last guess"
+    with pytest.raises(ValueError):
+        store.guess(slot, "help")
+
+def test_store_evict_and_restore():
+    rules = make_rules()
+    store = SessionStore(rules)
+    slots = [store.new_session(rules.word_id(word)) for word in ["help", "stop", "mess"]]
+    store.guess(slots[1], "heat")
+    store.guess(slots[1], "lake")
+    before = store.get(slots[1])
+
+    record = store.evict(slots[1])
+    heat, lake = rules.word_id("heat"), rules.word_id("lake")
+    codes = [rules.score(heat, rules.word_id("stop")), rules.score(lake, rules.word_id("stop"))]
+    assert record == struct.pack('<IBBIIBB', rules.word_id("stop"), PLAYING, 2, heat, lake, *codes), \
+        "Record is not little-endian in the documented layout"
+    assert len(store) == 2, "Evicted session still stored"
+    with pytest.raises(KeyError):
+        store.get(slots[1])
+
+    restored = store.get(store.restore(record))
+    assert restored.history(rules) == before.history(rules), "History lost by evict/restore"
+    assert restored.answer == before.answer and restored.status == before.status, "Game lost by evict/restore"
+    assert len(store.in_use) == 3, "Freed slot was not reused"
@@ -0,0 +1,134 @@
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from models import WordyModel, score_cache
+import simulate as simulate_module
+from simulate import GuessStrategy, NullView, RandomStrategy, play_game, simulate
+from wordy import WordyController
+
+SETTINGS = {'word_size': 4, 'num_guesses': 6, 'word_list_file': 'long_wordlist.txt'}
+
+class ScriptedStrategy(GuessStrategy):
+    def __init__(self, guesses):
+        self.guesses = guesses
+
+    def next_guess(self, history):
+        return self.guesses[len(history)]
+
+def test_strategies_must_choose_guesses():
+    with pytest.raises(TypeError):
+        GuessStrategy()
+
+def test_simulation_runs_without_tk():
+    # a None entry in sys.modules makes any import of tkinter fail
+    script = ("import sys; sys.modules['tkinter'] = None\n"
+              "from simulate import RandomStrategy, play_game\n"
+              "print(play_game('help', RandomStrategy(seed=3), {'word_size': 4, 'num_guesses': 6, "
+              "'word_list_file': 'short_wordlist.txt'}))")
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+    assert result.returncode == 0, f"Simulation needed Tk: {result.stderr}"
+
+def test_controller_rules_run_headless():
+    model = WordyModel(4, 'long_wordlist.txt', preselected_word="help")
+    view = NullView(SETTINGS)
+    controller = WordyController(view, model, SETTINGS)
+
+    view.type_word("fftz")
+    assert view.messages[-1] == "fftz is not a valid word", "Invalid word not reported"
+    assert controller.current_guess_num == 0, "Invalid word used up a guess"
+
+    for _ in range(4):
+        view.press("back")
+    view.type_word("help")
+    assert view.is_over, "Game did not end on a correct guess"
+
+class IdleView(NullView):
+    """ A NullView whose idle callbacks wait until run_idle is called. """
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.idle = []
+
+    def schedule_idle(self, callback):
+        self.idle.append(callback)
+
+    def run_idle(self):
+        callbacks, self.idle = self.idle, []
+        for callback in callbacks:
+            callback()
+
+def key_event(keysym, state=0):
+    return SimpleNamespace(keysym=keysym, state=state)
+
+def test_physical_key_bursts_are_coalesced():
+    model = WordyModel(4, 'long_wordlist.txt', preselected_word="help")
+    view = IdleView(SETTINGS)
+    controller = WordyController(view, model, SETTINGS)
+    prefix_checks = []
+    update_prefix_status = controller.update_prefix_status
+    controller.update_prefix_status = lambda: prefix_checks.append(1) or update_prefix_status()
+
+    for keysym in ["H", "e", "a", "t", "Return", "h", "e", "l", "p", "p"]:
+        view.bindings["<KeyPress>"](key_event(keysym))
+    view.bindings["<KeyPress>"](key_event("h", state=0x4))
+    assert controller.current_guess == [], "Keys handled before the event loop was idle"
+    assert len(view.idle) == 1, "Burst scheduled more than once"
+
+    view.run_idle()
+    assert [guess for guess, _ in controller.guess_history] == ["heat"], "Guess not entered"
+    assert controller.current_guess == list("help"), "Keys after ENTER were dropped"
+    assert len(prefix_checks) == 2, "Each letter was handled on its own"
+
+    view.bindings["<KeyPress>"](key_event("Return"))
+    view.run_idle()
+    assert view.is_over, "Game did not end on a correct guess"
+
+def test_on_screen_and_physical_keys_keep_their_order():
+    model = WordyModel(4, 'long_wordlist.txt', preselected_word="help")
+    view = IdleView(SETTINGS)
+    controller = WordyController(view, model, SETTINGS)
+
+    view.press("h")
+    view.bindings["<KeyPress>"](key_event("e"))
+    view.press("l")
+    view.bindings["<KeyPress>"](key_event("p"))
+    view.press("enter")
+    assert controller.current_guess == [], "On-screen keys jumped the queue"
+
+    view.run_idle()
+    assert [guess for guess, _ in controller.guess_history] == ["help"], "Keys were reordered"
+
+def test_paste_types_the_word():
+    model = WordyModel(4, 'long_wordlist.txt', preselected_word="help")
+    view = NullView(SETTINGS)
+    controller = WordyController(view, model, SETTINGS)
+
+    view.clipboard = " Help\n"
+    view.bindings["<Control-v>"](None)
+    assert controller.current_guess == list("help"), "Pasted word not typed"
+
+def test_play_game_counts_guesses():
+    assert play_game("help", ScriptedStrategy(["cash", "peat", "help"]), SETTINGS) == 3, "Wrong guess count"
+    assert play_game("help", ScriptedStrategy(["cash"] * 6), SETTINGS) is None, "Lost game reported as won"
+
+def test_random_strategy_leaves_the_score_cache_alone():
+    score_cache.clear()
+    guesses = play_game("help", RandomStrategy(seed=3), SETTINGS)
+
+    assert guesses is not None, "Random strategy lost with only consistent guesses"
+    assert score_cache.hits + score_cache.misses == guesses, "Strategy filled the shared cache"
+
+def test_simulate_reports_distribution():
+    result = simulate(SETTINGS, RandomStrategy(seed=3), ["help", "stop", "mess"], processes=1)
+
+    assert result.games == 3, "Wrong number of games"
+    assert sum(result.distribution.values()) == 3, "Distribution doesn't cover every game"
+
+def test_worker_strategies_use_a_single_process():
+    strategy = RandomStrategy(seed=1)
+    assert strategy.processes is None, "Strategy not allowed to use every core by default"
+
+    simulate_module._init_worker({'word_size': 4, 'word_list_file': 'short_wordlist.txt'}, strategy)
+    assert strategy.processes == 1, "Worker strategy would start a pool of its own"
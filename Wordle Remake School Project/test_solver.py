@@ -0,0 +1,92 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from feedback_matrix import build_feedback_matrix
+from models import WordyModel
+from simulate import NullView
+from solver import HintSolver
+from wordy import WordyController
+
+def play_with_hints(answer, max_guesses=6):
+    model = WordyModel(4, 'short_wordlist.txt', preselected_word=answer)
+    solver = HintSolver(model, build_feedback_matrix(model.word_list, processes=1))
+
+    for guess_num in range(1, max_guesses + 1):
+        guess = solver.best_guess()
+        is_correct, letter_states, _ = model.check_guess(guess)
+        if is_correct:
+            return guess_num
+        solver.observe(guess, letter_states)
+        assert answer in solver.remaining(), "Answer was ruled out"
+    return None
+
+def test_hints_solve_games():
+    for answer in ("help", "stop", "mess", "lake"):
+        assert play_with_hints(answer) is not None, f"Hints did not find {answer}"
+
+def test_observe_keeps_only_consistent_words():
+    model = WordyModel(4, 'short_wordlist.txt', preselected_word="help")
+    solver = HintSolver(model, build_feedback_matrix(model.word_list, processes=1))
+
+    _, letter_states, _ = model.check_guess("heat")
+    solver.observe("heat", letter_states)
+
+    for word in solver.remaining():
+        other = WordyModel(4, 'short_wordlist.txt', preselected_word=word)
+        assert other.check_guess("heat")[1] == letter_states, f"{word} is not consistent"
+
+def test_sparse_and_dense_counts_agree():
+    codes = np.random.default_rng(1).integers(0, 81, size=(7, 50)).astype(np.uint8)
+    dense = HintSolver._dense_weights(codes, 81)
+    sparse = HintSolver._sparse_weights(codes)
+    assert np.allclose(dense, sparse), "Sorted counting gave different weights"
+
+def test_long_words_are_ranked():
+    # 3 ** 20 possible patterns: far too many for a table per guess
+    model = WordyModel(20, 'long_wordlist.txt', preselected_word="electrocardiographic")
+    solver = HintSolver(model, build_feedback_matrix(model.word_list, processes=1))
+
+    information = solver.expected_information(np.arange(len(model.word_list)))
+    assert np.all(information > 0), "A guess was expected to reveal nothing"
+    assert np.all(information <= np.log2(len(model.word_list)) + 1e-9), "More information than candidates"
+    assert solver.best_guess() in model.word_list, "No hint for long words"
+
+class ScheduledView(NullView):
+    """ A NullView whose scheduled callbacks run when run_scheduled is called. """
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.callbacks = []
+
+    def schedule(self, delay, callback):
+        self.callbacks.append(callback)
+
+    def run_scheduled(self):
+        while self.callbacks:
+            self.callbacks.pop(0)()
+
+def test_hint_is_dropped_when_a_guess_is_entered():
+    settings = {'word_size': 4, 'num_guesses': 6, 'word_list_file': 'short_wordlist.txt'}
+    model = WordyModel(4, 'short_wordlist.txt', preselected_word="help")
+    view = ScheduledView(settings)
+    controller = WordyController(view, model, settings)
+
+    controller.show_hint(None)
+    for future in list(controller.worker.pending):
+        future.result()
+
+    # the hint is ready, but a guess is entered before it is delivered
+    controller.current_guess = list("heat")
+    controller.check_solution()
+    view.run_scheduled()
+    assert not any(msg.startswith("Hint") for msg in view.messages), "Stale hint was shown"
+    assert controller.solver is None, "Stale solver was installed"
+
+    controller.show_hint(None)
+    for future in list(controller.worker.pending):
+        future.result()
+    view.run_scheduled()
+    assert view.messages[-1].startswith("Hint: try"), "Hint was not shown"
+    assert "help" in controller.solver.remaining(), "Answer was ruled out"
+    assert "heat" not in controller.solver.remaining(), "Guess was not observed"
+    controller.worker.shutdown()
@@ -0,0 +1,321 @@
+from collections import deque
+from types import SimpleNamespace
+
+import views
+from models import LetterState, WordyModel
+from views import CanvasGuessesFrame, GuessReveal, RevealAnimation, WidgetUpdates, WordyView
+from wordy import WordyController
+
+class FakeTk:
+    """ Stands in for a Tk window: timers and idle callbacks run when asked
+    to, in the order Tk would run them. """
+
+    def __init__(self):
+        self.timers = []
+        self.idle = []
+        self.bindings = {}
+        self.all_bindings = {}
+        self.next_id = 0
+
+    def after(self, delay, callback):
+        self.next_id += 1
+        self.timers.append((f"after#{self.next_id}", callback))
+        return self.timers[-1][0]
+
+    def after_cancel(self, timer):
+        self.timers = [(id, callback) for id, callback in self.timers if id != timer]
+
+    def after_idle(self, callback):
+        self.idle.append(callback)
+
+    def bind(self, event_type, action):
+        self.bindings[event_type] = action
+
+    def bind_all(self, event_type, action, add=None):
+        self.all_bindings[event_type] = action
+
+    def mainloop(self):
+        pass
+
+    def run_idle(self):
+        while self.idle:
+            self.idle.pop(0)()
+
+    def run_timer(self):
+        self.timers.pop(0)[1]()
+        self.run_idle()
+
+    def run_all(self):
+        self.run_idle()
+        while self.timers:
+            self.run_timer()
+
+class FakeGrid(GuessReveal):
+    """ A guess grid that records the revealed letter states instead of
+    drawing them. """
+
+    def __init__(self, window, settings):
+        self.window = window
+        self.settings = settings
+        self.reveals = deque()
+        self.statuses = []
+
+    def after(self, delay, callback):
+        return self.window.after(delay, callback)
+
+    def after_cancel(self, timer):
+        self.window.after_cancel(timer)
+
+    def set_status(self, guess_num, letter_index, state):
+        self.statuses.append((guess_num, letter_index, state))
+
+    def set_letter(self, letter, guess_num, letter_index):
+        pass
+
+    def set_guess_text_color(self, guess_num, color):
+        pass
+
+class FakeKeyboard:
+    def __init__(self):
+        self.handlers = {}
+        self.colors = []
+        self.disabled = False
+
+    def set_key_handler(self, key, handler):
+        self.handlers[key] = handler
+
+    def set_key_colors(self, letter_states):
+        self.colors.append(letter_states)
+
+    def disable(self):
+        self.disabled = True
+
+class FakeMessages:
+    def __init__(self):
+        self.messages = []
+
+    def set_message(self, msg):
+        self.messages.append(msg)
+
+    def set_candidates(self, text):
+        pass
+
+def make_view(reveal_input='queue'):
+    """ Returns a WordyView whose widgets are fakes, so it runs without a
+    display. """
+    view = WordyView.__new__(WordyView)
+    view.settings = {'ui': {'guesses': {'process_wait_time': 0.1, 'reveal_input': reveal_input,
+                                        'initial_text_color': 'black'}}}
+    view.reveal_input = reveal_input
+    view.queued_input = deque()
+    view.input_enabled = True
+    view.window = FakeTk()
+    view.guess_frame = FakeGrid(view.window, view.settings)
+    view.keyboard_frame = FakeKeyboard()
+    view.message_frame = FakeMessages()
+    view.updates = WidgetUpdates(view.window)
+    view.update_counts = deque(maxlen=WordyView.UPDATE_COUNTS_KEPT)
+    return view
+
+class FakeCanvas(CanvasGuessesFrame):
+    """ A CanvasGuessesFrame drawn on a fake canvas, which keeps its items'
+    options in a dict and counts the itemconfigure calls. """
+
+    def __init__(self, settings):
+        self.window = FakeTk()
+        self.settings = settings
+        self.reveals = deque()
+        self.boxes = []
+        self.texts = []
+        self.items = {}
+        self.configure_calls = 0
+        self.updates = WidgetUpdates(self.window)
+        self.draw_boards()
+
+    def __str__(self):
+        return ".canvas"
+
+    def __getitem__(self, option):
+        return {'width': 300, 'height': 400}[option]
+
+    def after(self, delay, callback):
+        return self.window.after(delay, callback)
+
+    def after_cancel(self, timer):
+        self.window.after_cancel(timer)
+
+    def _create(self, kind, coords, options):
+        item = len(self.items) + 1
+        self.items[item] = dict(options, kind=kind, coords=coords)
+        return item
+
+    def create_rectangle(self, *coords, **options):
+        return self._create('rectangle', coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create('text', coords, options)
+
+    def itemconfigure(self, item, **options):
+        self.configure_calls += 1
+        self.items[item].update(options)
+
+class FakeWidget:
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+
+    def __str__(self):
+        return self.name
+
+    def configure(self, **options):
+        self.calls.append(options)
+
+    def itemconfigure(self, item, **options):
+        self.calls.append(dict(options, item=item))
+
+def test_widget_updates_only_send_changes():
+    window = FakeTk()
+    updates = WidgetUpdates(window)
+    label = FakeWidget(".label")
+    canvas = FakeWidget(".canvas")
+    updates.remember((".label",), text="", fg="black")
+
+    updates.configure(label, text="A")
+    updates.configure(label, fg="black")
+    updates.configure(label, fg="red")
+    updates.itemconfigure(canvas, 1, fill="green")
+    assert label.calls == [] and len(window.idle) == 1, "Changes not held for a single idle flush"
+
+    window.run_idle()
+    assert label.calls == [{'text': "A", 'fg': "red"}], "Label changes not sent as one call"
+    assert canvas.calls == [{'fill': "green", 'item': 1}], "Canvas item change not sent"
+    assert updates.take_counts() == (2, 2), "Wrong counts of calls made and saved"
+
+    updates.configure(label, text="A", fg="red")
+    updates.itemconfigure(canvas, 1, fill="grey")
+    window.run_idle()
+    assert len(label.calls) == 1, "Unchanged options were sent again"
+    assert canvas.calls[-1] == {'fill': "grey", 'item': 1}, "Changed item not sent"
+    assert updates.take_counts() == (1, 1), "Wrong counts after a skipped call"
+    assert updates.take_counts() == (0, 0), "take_counts did not reset the counters"
+
+def test_widget_updates_forget_destroyed_widgets():
+    window = FakeTk()
+    updates = WidgetUpdates(window)
+    label = FakeWidget(".label")
+    updates.configure(label, text="A")
+    window.run_idle()
+
+    window.all_bindings["<Destroy>"](SimpleNamespace(widget=label))
+    assert ".label" not in updates.applied, "Destroyed widget still remembered"
+
+    # a new widget may reuse the name, and has none of the old options
+    updates.configure(label, text="A")
+    window.run_idle()
+    assert label.calls == [{'text': "A"}, {'text': "A"}], "New widget not configured"
+
+def test_widget_updates_are_shared_per_root():
+    window = FakeTk()
+    widget = SimpleNamespace(_root=lambda: window)
+
+    assert views.widget_updates(widget) is views.widget_updates(widget), "Root got two WidgetUpdates"
+    assert views.widget_updates(widget).root() is window and not hasattr(window, '_wordy_updates'), \
+        "Updates not kept outside the root"
+
+def canvas_settings():
+    return {'word_size': 4, 'num_guesses': 6,
+            'ui': {'window_width': 300, 'font_family': 'ariel',
+                   'correct_color': 'green', 'misplaced_color': 'orange', 'incorrect_color': 'grey',
+                   'guesses': {'frame_height': 400, 'letter_box_size': 40, 'letter_padding': 3,
+                               'letter_font_size': 30, 'initial_bg_color': 'white',
+                               'initial_text_color': 'black', 'updated_text_color': 'white',
+                               'process_wait_time': 0.1}}}
+
+def test_canvas_grid_draws_and_updates_items(monkeypatch):
+    monkeypatch.setattr(views, 'cached_font', lambda widget, family, size=None: family)
+    canvas = FakeCanvas(canvas_settings())
+
+    assert len(canvas.boxes) == 6 and all(len(row) == 4 for row in canvas.boxes), "Wrong grid size"
+    left, top, right, bottom = canvas.items[canvas.boxes[0][0]]['coords']
+    assert (right - left, bottom - top) == (40, 40), "Wrong box size"
+    assert left == (300 - 46 * 4) // 2 + 3 and top == (400 - 46 * 6) // 2 + 3, "Grid not centered"
+
+    canvas.set_letter("H", 0, 0)
+    canvas.set_letter("E", 0, 1)
+    canvas.set_letter("", 0, 1)
+    assert canvas.configure_calls == 0, "Canvas changed before the event loop was idle"
+    canvas.window.run_idle()
+    assert canvas.items[canvas.texts[0][0]]['text'] == "H", "Letter not drawn"
+    assert canvas.configure_calls == 1, "Unchanged letter was redrawn"
+
+    canvas.show_guess_result(0, [LetterState.CORRECT, LetterState.MISPLACED,
+                                 LetterState.INCORRECT, LetterState.INCORRECT])
+    canvas.window.run_all()
+    assert canvas.items[canvas.boxes[0][0]]['fill'] == "green", "Correct letter not colored"
+    assert canvas.items[canvas.boxes[0][1]]['fill'] == "orange", "Misplaced letter not colored"
+    assert canvas.items[canvas.texts[0][2]]['fill'] == "white", "Text color not updated"
+    assert not canvas.is_revealing, "Reveal did not finish"
+
+RESULTS = [LetterState.CORRECT, LetterState.INCORRECT, LetterState.MISPLACED, LetterState.INCORRECT]
+
+def test_reveal_animation_runs_one_step_per_timer():
+    window = FakeTk()
+    steps = []
+    done = []
+    animation = RevealAnimation(window, [lambda n=n: steps.append(n) for n in range(3)], 100, lambda: done.append(1))
+
+    animation.start()
+    assert steps == [0] and animation.is_running, "First step did not run right away"
+    window.run_timer()
+    assert steps == [0, 1] and not done, "Steps did not wait for the timer"
+
+    animation.finish()
+    assert steps == [0, 1, 2] and done == [1], "finish did not run the remaining steps"
+    assert not window.timers and not animation.is_running, "Timer left running after finish"
+
+def test_input_is_queued_during_a_reveal():
+    view = make_view()
+    handled = []
+    completed = []
+
+    view.display_guess_result(0, RESULTS, {}, lambda: completed.append(1))
+    view.guard_input(lambda: handled.append("a"))()
+    view.guard_input(lambda: handled.append("b"))()
+    assert handled == [], "Input handled during the reveal"
+    assert len(view.guess_frame.statuses) == 1, "Reveal did not wait for its timers"
+
+    view.window.run_all()
+    assert [state for _, _, state in view.guess_frame.statuses] == RESULTS, "Guess not revealed"
+    assert completed == [1] and len(view.keyboard_frame.colors) == 1, "Reveal did not finish"
+    assert handled == ["a", "b"], "Queued input not handled in order after the reveal"
+    assert list(view.update_counts) == [(0, 0)], "Update counts not taken after the reveal"
+
+def test_input_is_dropped_during_a_reveal_in_lock_mode():
+    view = make_view(reveal_input='lock')
+    handled = []
+
+    view.display_guess_result(0, RESULTS, {})
+    view.guard_input(lambda: handled.append("a"))()
+    view.window.run_all()
+    assert handled == [], "Input handled even though the keyboard was locked"
+
+    view.guard_input(lambda: handled.append("b"))()
+    assert handled == ["b"], "Input after the reveal was not handled"
+
+def test_game_over_waits_for_the_reveal_and_drops_queued_input():
+    settings = {'word_size': 4, 'num_guesses': 6}
+    model = WordyModel(4, 'short_wordlist.txt', preselected_word="help")
+    view = make_view()
+    controller = WordyController(view, model, settings)
+
+    for keysym in ["h", "e", "l", "p", "Return", "h", "e", "a", "t"]:
+        view.window.bindings["<KeyPress>"](SimpleNamespace(keysym=keysym, state=0))
+    view.window.run_idle()
+    assert view.guess_frame.is_revealing, "Winning guess is not being revealed"
+    assert len(view.queued_input) == 1, "Keys after ENTER were not queued"
+    assert view.message_frame.messages == [], "End message shown before the reveal finished"
+
+    view.window.run_all()
+    assert view.message_frame.messages == ["Correct!!! Word Up, y'all!"], "End message not shown"
+    assert view.keyboard_frame.disabled and not view.input_enabled, "Game did not end"
+    assert not view.queued_input and controller.current_guess == [], "Queued keys ran after the game ended"
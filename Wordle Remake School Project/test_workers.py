@@ -0,0 +1,58 @@
+import threading
+import time
+
+from workers import BackgroundWorker
+
+class FakeScheduler:
+    """ Stands in for window.after, running callbacks when asked to. """
+
+    def __init__(self):
+        self.callbacks = []
+
+    def __call__(self, delay, callback):
+        self.callbacks.append(callback)
+
+    def run_until_idle(self, timeout=5):
+        deadline = time.monotonic() + timeout
+        while self.callbacks and time.monotonic() < deadline:
+            time.sleep(0.01)
+            self.callbacks.pop(0)()
+
+def test_result_delivered_through_scheduler():
+    scheduler = FakeScheduler()
+    worker = BackgroundWorker(scheduler)
+    results = []
+
+    worker.submit(lambda: 6 * 7, results.append)
+    assert results == [], "Result delivered outside the scheduler"
+
+    scheduler.run_until_idle()
+    assert results == [42], "Result was not delivered"
+    worker.shutdown()
+
+def test_cancelled_results_are_dropped():
+    scheduler = FakeScheduler()
+    worker = BackgroundWorker(scheduler)
+    release = threading.Event()
+    results = []
+
+    worker.submit(lambda: release.wait() and "stale", results.append)
+    worker.submit(lambda: "also stale", results.append)
+    worker.cancel_pending()
+    worker.submit(lambda: "fresh", results.append)
+    release.set()
+
+    scheduler.run_until_idle()
+    assert results == ["fresh"], "Stale results were delivered"
+    worker.shutdown()
+
+def test_errors_delivered_to_error_handler():
+    scheduler = FakeScheduler()
+    worker = BackgroundWorker(scheduler)
+    errors = []
+
+    worker.submit(lambda: 1 / 0, lambda result: None, errors.append)
+
+    scheduler.run_until_idle()
+    assert len(errors) == 1 and isinstance(errors[0], ZeroDivisionError), "Error was not delivered"
+    worker.shutdown()
@@ -1,14 +1,252 @@
-from typing import Union, Callable
-import string, time
+from typing import Union, Callable, Optional
+from collections import deque
+import string
+import weakref
 import tkinter as tk
 import tkinter.font as font
 from models import LetterState
 
+
+class RevealAnimation:
+    """ Runs a sequence of steps (e.g. revealing one tile each) spaced out
+    with Tk timers, so the event loop keeps running in between. """
+
+    # instance variables
+    widget: tk.Misc  # widget whose after() is used for the timers
+    steps: deque[Callable[[], None]]  # steps that haven't run yet
+    delay: int  # delay (in ms) between steps
+    on_complete: Optional[Callable[[], None]]  # called after the last step
+    timer: Optional[str]  # id of the pending timer, if any
+
+    def __init__(self, widget: tk.Misc, steps: list[Callable[[], None]], delay: int,
+                 on_complete: Optional[Callable[[], None]] = None) -> None:
+        self.widget = widget
+        self.steps = deque(steps)
+        self.delay = delay
+        self.on_complete = on_complete
+        self.timer = None
+
+    @property
+    def is_running(self) -> bool:
+        return self.timer is not None
+
+    def start(self) -> None:
+        """ Runs the first step now and schedules the rest. With no delay, all
+        the steps run immediately. """
+        if self.delay <= 0:
+            self.finish()
+        else:
+            self._step()
+
+    def _step(self) -> None:
+        self.timer = None
+        self.steps.popleft()()
+        if self.steps:
+            self.timer = self.widget.after(self.delay, self._step)
+        else:
+            self._complete()
+
+    def finish(self) -> None:
+        """ Runs all the remaining steps right away. """
+        if self.timer is not None:
+            self.widget.after_cancel(self.timer)
+            self.timer = None
+        while self.steps:
+            self.steps.popleft()()
+        self._complete()
+
+    def _complete(self) -> None:
+        if self.on_complete is not None:
+            on_complete, self.on_complete = self.on_complete, None
+            on_complete()
+
+
+# fonts created by cached_font, per Tk root. Fonts can't outlive their root,
+# so the roots are held weakly and their fonts go with them.
+_fonts: "weakref.WeakKeyDictionary[tk.Misc, dict[tuple[str, Optional[int]], font.Font]]" = weakref.WeakKeyDictionary()
+
+
+def cached_font(widget: tk.Misc, family: str, size: Optional[int] = None) -> font.Font:
+    """ Returns a Font for the given family (and size), creating it only the
+    first time it is asked for in <widget>'s Tk root.
+
+    Parameters:
+        widget: (tk.Misc) Any widget of the Tk root the font is used in.
+        family: (str) The font family.
+        size: (int) The font size, or None for the default size.
+    """
+    root = widget._root()
+    fonts = _fonts.setdefault(root, {})
+    if (family, size) not in fonts:
+        if size is None:
+            fonts[(family, size)] = font.Font(root, family=family)
+        else:
+            fonts[(family, size)] = font.Font(root, family=family, size=size)
+    return fonts[(family, size)]
+
+
+class WidgetUpdates:
+    """ A thin layer between the views and Tk that remembers the last value
+    applied to each widget (or canvas item) option, and only sends real
+    changes to Tk.
+
+    Changes made while handling one event are coalesced: they are kept until
+    the event loop is idle, then each widget gets a single configure call
+    with all of its changed options. What is known about a widget is
+    forgotten when it is destroyed.
+    """
+
+    # instance variables
+    root: "weakref.ref[tk.Misc]"  # the Tk root, used to schedule flushes
+    applied: dict[str, dict[tuple, object]]  # widget path -> (target, option) -> the value Tk has
+    pending: dict[tuple, tuple[Callable[..., object], dict[str, object]]]  # target -> (configure function, options)
+    requests: dict[tuple, int]  # target -> configure requests since the last flush
+    flush_scheduled: bool  # whether a flush is waiting for the event loop
+    calls_made: int  # configure calls sent to Tk
+    calls_saved: int  # configure requests that didn't become a call to Tk
+
+    def __init__(self, root: tk.Misc) -> None:
+        # held weakly, since the root's Tk callbacks hold on to this
+        self.root = weakref.ref(root)
+        self.applied = {}
+        self.pending = {}
+        self.requests = {}
+        self.flush_scheduled = False
+        self.calls_made = 0
+        self.calls_saved = 0
+        root.bind_all('<Destroy>', self.forget, add='+')
+
+    def remember(self, target: tuple, **options) -> None:
+        """ Records values that Tk already has for <target> (e.g. the options
+        it was created with). """
+        applied = self.applied.setdefault(target[0], {})
+        for option, value in options.items():
+            applied[(target, option)] = value
+
+    def forget(self, event: tk.Event) -> None:
+        """ Drops the values remembered for a widget that was destroyed. """
+        self.applied.pop(str(event.widget), None)
+
+    def configure(self, widget: tk.Misc, **options) -> None:
+        """ Sets options of <widget> at the next flush. """
+        self._queue((str(widget),), widget.configure, options)
+
+    def itemconfigure(self, canvas: tk.Canvas, item: int, **options) -> None:
+        """ Sets options of canvas item <item> at the next flush. """
+        self._queue((str(canvas), item), lambda **o: canvas.itemconfigure(item, **o), options)
+
+    def _queue(self, target: tuple, configure: Callable[..., object], options: dict[str, object]) -> None:
+        if target in self.pending:
+            self.pending[target][1].update(options)
+        else:
+            self.pending[target] = (configure, dict(options))
+        self.requests[target] = self.requests.get(target, 0) + 1
+
+        root = self.root()
+        if not self.flush_scheduled and root is not None:
+            self.flush_scheduled = True
+            root.after_idle(self.flush)
+
+    def flush(self) -> None:
+        """ Sends all the pending changes to Tk. """
+        self.flush_scheduled = False
+        pending, self.pending = self.pending, {}
+        requests, self.requests = self.requests, {}
+
+        for target, (configure, options) in pending.items():
+            applied = self.applied.get(target[0], {})
+            changed = {option: value for option, value in options.items()
+                       if applied.get((target, option), self) != value}
+            if not changed:
+                self.calls_saved += requests[target]
+                continue
+
+            # every request for this target is sent as this one call
+            self.calls_made += 1
+            self.calls_saved += requests[target] - 1
+            try:
+                configure(**changed)
+            except tk.TclError:
+                # the widget was destroyed before the flush
+                continue
+            self.remember(target, **changed)
+
+    def take_counts(self) -> tuple[int, int]:
+        """ Returns (calls made, calls saved) since the last time this was
+        called, and resets both counters. """
+        counts = (self.calls_made, self.calls_saved)
+        self.calls_made = self.calls_saved = 0
+        return counts
+
+
+# WidgetUpdates of each Tk root, held weakly like the fonts above
+_updates: "weakref.WeakKeyDictionary[tk.Misc, WidgetUpdates]" = weakref.WeakKeyDictionary()
+
+
+def widget_updates(widget: tk.Misc) -> WidgetUpdates:
+    """ Returns the WidgetUpdates shared by every widget of <widget>'s Tk root. """
+    root = widget._root()
+    if root not in _updates:
+        _updates[root] = WidgetUpdates(root)
+    return _updates[root]
+
+
+class GuessReveal:
+    """ Mixin for guess grids that reveals guess results one letter at a time.
+
+    Subclasses provide settings and set_status(guess_num, letter_index, state).
+    """
+
+    # instance variables
+    reveals: deque[RevealAnimation]  # the running reveal, followed by the ones waiting for it
+
+    def show_guess_result(self, guess_num: int, results: list[LetterState],
+                          on_complete: Optional[Callable[[], None]] = None) -> None:
+        """ Updates the specific guess based on the given results.
+
+        Note that there should be a delay between the update of each letter in
+        the guess; this delay time is located in self.settings. The letters
+        are revealed by Tk timers, so this returns right away and the GUI
+        stays responsive during the reveal. If another guess is still being
+        revealed, this one starts when it is done.
+
+        Preconditon: len(results) == word size
+
+        Parameters:
+            guess_num: (int) The number of the guess to update
+            results: (list[LetterState]) The state of each letter in the guess.
+            on_complete: (Callable[[], None]) Called once every letter has been revealed.
+
+        """
+        def reveal_letter(n):
+            return lambda: self.set_status(guess_num, n, results[n])
+
+        def reveal_done():
+            self.reveals.popleft()
+            if on_complete is not None:
+                on_complete()
+            if self.reveals:
+                self.reveals[0].start()
+
+        steps = [reveal_letter(n) for n in range (0, len(results))]
+        delay = int(self.settings['ui']['guesses']['process_wait_time'] * 1000)
+        self.reveals.append(RevealAnimation(self, steps, delay, reveal_done))
+
+        if len(self.reveals) == 1:
+            self.reveals[0].start()
+
+    @property
+    def is_revealing(self) -> bool:
+        """ Whether a guess result is still being revealed. """
+        return len(self.reveals) > 0
+
+
 class GuessLetter(tk.Frame):
 
     # instance variables
     settings: dict  # the dictionary with all the UI settings
     label: tk.Label  # the label containing the text for this frame
+    updates: WidgetUpdates  # applies changes to the frame and label
 
     def __init__(self, parent: Union[tk.Tk, tk.Frame], row: int, col: int, settings: dict) -> None:
         super().__init__(parent)
@@ -33,7 +271,7 @@ class GuessLetter(tk.Frame):
         self.grid_propagate(False)
         
 
-        f = font.Font(family=settings['ui']['font_family'])
+        f = cached_font(self, settings['ui']['font_family'])
 
         # TODO: create the label, setting the bg to initial_bg_color and fg to
         # initial_text_color in settings. Set the font parameter to a tuple of
@@ -43,6 +281,11 @@ class GuessLetter(tk.Frame):
                                font=(f,settings['ui']['guesses']['letter_font_size']))
 
 
+        self.updates = widget_updates(self)
+        self.updates.remember((str(self),), bg=settings['ui']['guesses']['initial_bg_color'])
+        self.updates.remember((str(self.label),), text="", bg=settings['ui']['guesses']['initial_bg_color'],
+                              fg=settings['ui']['guesses']['initial_text_color'])
+
         # don't change anything below here
         self.label.grid(row=1, column=1, sticky='ewns')
 
@@ -61,9 +304,16 @@ class GuessLetter(tk.Frame):
             letter: (str) The letter to set this to.
         """
 
-        self.label['text'] = letter
- 
-        pass # TODO implement this method
+        self.updates.configure(self.label, text=letter)
+
+
+    def set_text_color(self, color: str) -> None:
+        """ Sets the label's text (fg) color.
+
+        Parameter:
+            color: (str) The color to use.
+        """
+        self.updates.configure(self.label, fg=color)
 
 
     def set_status(self, state: LetterState) -> None:
@@ -76,20 +326,17 @@ class GuessLetter(tk.Frame):
         """
 
         if state == LetterState.CORRECT:
-            self['bg'] = self.settings['ui']['correct_color']
-            self.label['bg'] = self.settings['ui']['correct_color']
-            self.label['fg'] = self.settings['ui']['guesses']['updated_text_color']
+            bg = self.settings['ui']['correct_color']
         elif state == LetterState.MISPLACED:
-            self['bg'] = self.settings['ui']['misplaced_color']
-            self.label['bg'] = self.settings['ui']['misplaced_color']
-            self.label['fg'] = self.settings['ui']['guesses']['updated_text_color']
+            bg = self.settings['ui']['misplaced_color']
         else:
-            self['bg'] = self.settings['ui']['incorrect_color']
-            self.label['bg'] = self.settings['ui']['incorrect_color']
-            self.label['fg'] = self.settings['ui']['guesses']['updated_text_color']
+            bg = self.settings['ui']['incorrect_color']
 
+        self.updates.configure(self, bg=bg)
+        self.updates.configure(self.label, bg=bg, fg=self.settings['ui']['guesses']['updated_text_color'])
 
-class GuessesFrame(tk.Frame):
+
+class GuessesFrame(GuessReveal, tk.Frame):
     """ A Tk Frame used to display the guesses that user has made. """
 
     # instance variables
@@ -108,6 +355,7 @@ class GuessesFrame(tk.Frame):
         self.pack_propagate(False)
 
         self.guess_letters = []
+        self.reveals = deque()
 
         # TODO: create a GuessLetter for all the guesses, adding them to
         # self.guess_letters. This should be a matrix of word size by num
@@ -140,24 +388,250 @@ class GuessesFrame(tk.Frame):
         """
         self.guess_letters [guess_num][letter_index].set_letter(letter)
 
-    def show_guess_result(self, guess_num: int, results: list[LetterState]) -> None:
-        """ Updates the specific guess based on the given results.
+    def set_status(self, guess_num: int, letter_index: int, state: LetterState) -> None:
+        """ Sets the status (i.e. colors) of one letter of a guess.
 
-        Note that there should be a delay between the update of each letter in
-        the guess; this delay time is located in self.settings.
+        Parameters:
+            guess_num: (int) The number of the guess to update
+            letter_index: (int) The index in the guess that will be updated
+            state: (LetterState) The state of the letter.
+        """
+        self.guess_letters[guess_num][letter_index].set_status(state)
 
-        Preconditon: len(results) == word size
+    def set_guess_text_color(self, guess_num: int, color: str) -> None:
+        """ Sets the text color of every letter in a guess.
 
         Parameters:
             guess_num: (int) The number of the guess to update
-            results: (list[LetterState]) The state of each letter in the guess.
+            color: (str) The color to use.
+        """
+        for guess_letter in self.guess_letters[guess_num]:
+            guess_letter.set_text_color(color)
+
+
+class CanvasGuessesFrame(GuessReveal, tk.Canvas):
+    """ Displays the guesses that the user has made, drawn on a single Tk
+    Canvas instead of a Frame and Label per letter.
+
+    This has the same interface as GuessesFrame, but creating it is much
+    cheaper for large boards, and (through WidgetUpdates) only the canvas
+    items of letters that actually change are updated.
+    """
+
+    # instance variables
+    settings: dict  # the dictionary with all the UI settings
+    boxes: list[list[int]]  # canvas ids of the letter boxes, by guess and letter
+    texts: list[list[int]]  # canvas ids of the letter texts, by guess and letter
+    updates: WidgetUpdates  # applies changes to the canvas items
+
+    def __init__(self, parent: Union[tk.Tk, tk.Frame], settings: dict) -> None:
+        super().__init__(parent, highlightthickness=0,
+                         height=settings['ui']['guesses']['frame_height'],
+                         width=settings['ui']['window_width'])
+
+        self.settings = settings
+        self.reveals = deque()
+
+        self.pack(pady=(20, 0))
+
+        self.boxes = []
+        self.texts = []
+        self.updates = widget_updates(self)
+        self.draw_boards()
+
+    def draw_boards(self) -> None:
+        """ Draws the empty guess grid. """
+        self.draw_board(self.settings['num_guesses'], self.settings['word_size'])
+
+    def draw_board(self, num_guesses: int, word_size: int, x: Optional[int] = None, y: Optional[int] = None,
+                   box_size: Optional[int] = None, font_size: Optional[int] = None) -> None:
+        """ Draws an empty board of <num_guesses> rows of <word_size> letters
+        and appends its items to boxes and texts. The board is
+        centered in the canvas unless its top left corner (x, y) is given,
+        and uses the box and font sizes from the settings unless
+        <box_size> and <font_size> are given.
+        """
+        guess_settings = self.settings['ui']['guesses']
+        if box_size is None:
+            box_size = guess_settings['letter_box_size']
+        if font_size is None:
+            font_size = guess_settings['letter_font_size']
+        step = box_size + 2 * guess_settings['letter_padding']
+        bg = guess_settings['initial_bg_color']
+        fg = guess_settings['initial_text_color']
+        f = (cached_font(self, self.settings['ui']['font_family']), font_size)
+
+        if x is None:
+            x = (int(self['width']) - step * word_size) // 2
+        if y is None:
+            y = (int(self['height']) - step * num_guesses) // 2
+
+        for row in range(num_guesses):
+            boxes, texts = [], []
+            top = y + row * step + guess_settings['letter_padding']
+            for col in range(word_size):
+                left = x + col * step + guess_settings['letter_padding']
+                boxes.append(self.create_rectangle(left, top, left + box_size, top + box_size,
+                                                   fill=bg, outline=bg))
+                texts.append(self.create_text(left + box_size // 2, top + box_size // 2,
+                                              text="", fill=fg, font=f))
+                self.updates.remember((str(self), boxes[-1]), fill=bg, outline=bg)
+                self.updates.remember((str(self), texts[-1]), text="", fill=fg)
+            self.boxes.append(boxes)
+            self.texts.append(texts)
+
+    def set_letter(self, letter: str, guess_num: int, letter_index: int) -> None:
+        """ Sets the letter at <letter_index> in guess <guess_num> to <letter>,
+        redrawing it only if it changed.
+
+        Parameters:
+            letter: (str) The letter to show
+            guess_num: (int) The number of the guess to update
+            letter_index: (int) The index in the guess that will be updated
+        """
+        self.updates.itemconfigure(self, self.texts[guess_num][letter_index], text=letter)
+
+    def set_status(self, guess_num: int, letter_index: int, state: LetterState) -> None:
+        """ Sets the colors of one letter of a guess based on its state,
+        redrawing it only if they changed.
+
+        Parameters:
+            guess_num: (int) The number of the guess to update
+            letter_index: (int) The index in the guess that will be updated
+            state: (LetterState) The state of the letter.
+        """
+        if state == LetterState.CORRECT:
+            bg = self.settings['ui']['correct_color']
+        elif state == LetterState.MISPLACED:
+            bg = self.settings['ui']['misplaced_color']
+        else:
+            bg = self.settings['ui']['incorrect_color']
+        fg = self.settings['ui']['guesses']['updated_text_color']
+
+        self.updates.itemconfigure(self, self.boxes[guess_num][letter_index], fill=bg, outline=bg)
+        self.updates.itemconfigure(self, self.texts[guess_num][letter_index], fill=fg)
+
+    def set_guess_text_color(self, guess_num: int, color: str) -> None:
+        """ Sets the text color of every letter in a guess.
+
+        Parameters:
+            guess_num: (int) The number of the guess to update
+            color: (str) The color to use.
+        """
+        for text in self.texts[guess_num]:
+            self.updates.itemconfigure(self, text, fill=color)
+
+
+class MultiGuessesCanvas(CanvasGuessesFrame):
+    """ Displays the guesses of a multi-board game (see multiboard): one board
+    per hidden word, all drawn on a single canvas, so the cost of the widgets
+    doesn't grow with the number of boards.
+
+    Every guess is typed on all the boards that are not solved yet. The board
+    results passed to show_guess_result are lists with one entry per board:
+    the letter states of the guess on that board, or None if it was already
+    solved.
+    """
+
+    # instance variables
+    num_boards: int      # number of boards
+    solved: list[bool]   # whether each board has been solved
 
+    MAX_COLUMNS = 4  # boards per row of the grid
+    BOARD_GAP = 10   # space between boards, in pixels
+
+    def __init__(self, parent: Union[tk.Tk, tk.Frame], settings: dict) -> None:
+        self.num_boards = settings['boards']
+        self.solved = [False] * self.num_boards
+        super().__init__(parent, settings)
+
+    def draw_boards(self) -> None:
+        """ Draws the boards in a grid, scaling the letter boxes down so that
+        every board fits in the canvas. Rows board * num_guesses to
+        (board + 1) * num_guesses - 1 of boxes and texts belong to each board.
+        """
+        guess_settings = self.settings['ui']['guesses']
+        num_guesses = self.settings['num_guesses']
+        word_size = self.settings['word_size']
+        padding = 2 * guess_settings['letter_padding']
+
+        columns = min(self.num_boards, self.MAX_COLUMNS)
+        rows = -(-self.num_boards // columns)
+        board_width = (int(self['width']) - self.BOARD_GAP * (columns + 1)) // columns
+        board_height = (int(self['height']) - self.BOARD_GAP * (rows + 1)) // rows
+        step = min(board_width // word_size, board_height // num_guesses,
+                   guess_settings['letter_box_size'] + padding)
+
+        box_size = max(1, step - padding)
+        font_size = max(1, guess_settings['letter_font_size'] * box_size // guess_settings['letter_box_size'])
+
+        left = (int(self['width']) - columns * step * word_size - (columns - 1) * self.BOARD_GAP) // 2
+        top = (int(self['height']) - rows * step * num_guesses - (rows - 1) * self.BOARD_GAP) // 2
+        for board in range(self.num_boards):
+            row, column = divmod(board, columns)
+            self.draw_board(num_guesses, word_size,
+                            left + column * (step * word_size + self.BOARD_GAP),
+                            top + row * (step * num_guesses + self.BOARD_GAP),
+                            box_size, font_size)
+
+    def unsolved_rows(self, guess_num: int) -> list[int]:
+        """ Returns the rows of boxes and texts that show guess <guess_num> on
+        the boards that are not solved yet. """
+        num_guesses = self.settings['num_guesses']
+        return [board * num_guesses + guess_num for board in range(self.num_boards) if not self.solved[board]]
+
+    def show_guess_result(self, guess_num: int, results: list[Optional[list[LetterState]]],
+                          on_complete: Optional[Callable[[], None]] = None) -> None:
+        """ Updates a guess on every board based on the board results,
+        revealing one letter (on all boards at once) at a time.
+
+        Parameters:
+            guess_num: (int) The number of the guess to update
+            results: (list[list[LetterState] | None]) The state of each letter
+                on each board, or None for boards that were already solved.
+            on_complete: (Callable[[], None]) Called once every letter has been revealed.
+        """
+        rows = self.unsolved_rows(guess_num)
+        scored = [states for states in results if states is not None]
+        letter_results = [[(row, states[n]) for row, states in zip(rows, scored)]
+                          for n in range(self.settings['word_size'])]
+
+        for board, states in enumerate(results):
+            if states is not None and all(state == LetterState.CORRECT for state in states):
+                self.solved[board] = True
+
+        super().show_guess_result(guess_num, letter_results, on_complete)
+
+    def set_letter(self, letter: str, guess_num: int, letter_index: int) -> None:
+        for row in self.unsolved_rows(guess_num):
+            super().set_letter(letter, row, letter_index)
+
+    def set_status(self, guess_num: int, letter_index: int, states: list[tuple[int, LetterState]]) -> None:
+        """ Sets the colors of one letter of a guess on several boards.
+
+        Parameters:
+            guess_num: (int) The number of the guess to update
+            letter_index: (int) The index in the guess that will be updated
+            states: (list[tuple[int, LetterState]]) The row of the guess on
+                each scored board, with the state of the letter there.
         """
-        for n in range (0, int (self.settings['word_size'])):
-            self.guess_letters[guess_num][n].set_status (results[n])
-            time.sleep (self.settings ['ui']['guesses']['process_wait_time'])
-            self.update()
-            
+        for row, state in states:
+            super().set_status(row, letter_index, state)
+
+    def set_guess_text_color(self, guess_num: int, color: str) -> None:
+        for row in self.unsolved_rows(guess_num):
+            super().set_guess_text_color(row, color)
+
+
+def create_guesses_frame(parent: Union[tk.Tk, tk.Frame], settings: dict) -> Union[GuessesFrame, CanvasGuessesFrame]:
+    """ Creates the guess grid using the renderer chosen in the settings
+    ("frames" for GuessesFrame, "canvas" for CanvasGuessesFrame), or a
+    MultiGuessesCanvas when there is more than one board. """
+    if settings.get('boards', 1) > 1:
+        return MultiGuessesCanvas(parent, settings)
+    if settings['ui']['guesses'].get('renderer', 'frames') == 'canvas':
+        return CanvasGuessesFrame(parent, settings)
+    return GuessesFrame(parent, settings)
 
 
 
@@ -173,11 +647,15 @@ class MessageFrame(tk.Frame):
         self.pack_propagate(False)
 
         self.message_str = tk.StringVar()
-        f = font.Font(family=settings['ui']['font_family'])
+        f = cached_font(self, settings['ui']['font_family'])
         message_label = tk.Label(self, textvariable=self.message_str,
                                  font=(f, settings['ui']['messages']['font_size']))
         message_label.place(relx=.5, rely=.5, anchor="center")
 
+        self.candidates_str = tk.StringVar()
+        candidates_label = tk.Label(self, textvariable=self.candidates_str, font=f)
+        candidates_label.place(relx=1, rely=.5, anchor="e")
+
         self.message_timer = None
         self.set_message("It's Wordy time. Let's GO!!!")
 
@@ -210,6 +688,10 @@ class MessageFrame(tk.Frame):
         self.message_str.set("")
         self.message_timer = None
 
+    def set_candidates(self, text: str) -> None:
+        """ Sets the text describing the remaining possible answers. """
+        self.candidates_str.set(text)
+
 
 
 class KeyboardFrame(tk.Frame):
@@ -233,6 +715,7 @@ class KeyboardFrame(tk.Frame):
         self.pack_propagate(False)
 
         self.keyboard_buttons = {}
+        self.updates = widget_updates(self)
         self.add_keyboard_buttons()
 
 
@@ -254,7 +737,7 @@ class KeyboardFrame(tk.Frame):
 
         layout = self.settings['ui']['keyboard']['key_layout']
 
-        f = font.Font(family=self.settings['ui']['font_family'])
+        f = cached_font(self, self.settings['ui']['font_family'])
 
         # Create keyboard buttons
         for r in range(3):
@@ -282,6 +765,7 @@ class KeyboardFrame(tk.Frame):
                 button.grid(row=r, column=c)
 
                 self.keyboard_buttons[layout[r][c].lower()] = button
+                self.updates.remember((str(button),), fg=self.settings['ui']['keyboard']['text_color'])
 
     def set_key_colors(self, key_states: dict[str, LetterState]) -> None:
         """ Updates the colors of keys based on their states.
@@ -297,7 +781,7 @@ class KeyboardFrame(tk.Frame):
             else:
                 text_color = self.settings["ui"]["misplaced_color"]
 
-            self.keyboard_buttons[letter]['fg'] = text_color
+            self.updates.configure(self.keyboard_buttons[letter], fg=text_color)
 
     def set_key_handler(self, key: str, handler: Callable[[], None]) -> None:
         """ Sets the handler for the given keyboard key.
@@ -319,9 +803,23 @@ class KeyboardFrame(tk.Frame):
 
 
 class WordyView:
+
+    # instance variables
+    settings: dict  # the dictionary with all the UI settings
+    reveal_input: str  # what to do with key presses during a reveal: "queue" them or "lock" the keyboard
+    queued_input: deque[Callable[[], None]]  # key handlers waiting for the reveal to finish
+    input_enabled: bool  # False once the game is over
+    updates: WidgetUpdates  # applies widget changes, skipping the ones that change nothing
+    update_counts: deque[tuple[int, int]]  # (Tcl calls made, Tcl calls saved) for each recent guess
+
+    UPDATE_COUNTS_KEPT = 100  # guesses whose update counts are kept
+
     def __init__(self, settings):
 
         self.settings = settings
+        self.reveal_input = settings['ui']['guesses'].get('reveal_input', 'queue')
+        self.queued_input = deque()
+        self.input_enabled = True
 
         # Create window and set title
         self.window = tk.Tk()
@@ -329,11 +827,14 @@ class WordyView:
 
         # Create three primary window frames: guesses, messages, and keyboard
 
-        self.guess_frame = GuessesFrame(self.window,settings)
+        self.guess_frame = create_guesses_frame(self.window,settings)
 
         self.message_frame = MessageFrame(self.window, settings)
         self.keyboard_frame = KeyboardFrame(self.window, settings)
 
+        self.updates = widget_updates(self.window)
+        self.update_counts = deque(maxlen=self.UPDATE_COUNTS_KEPT)
+
     def set_key_handler(self, key: str, handler: Callable[[], None]) -> None:
         """ Sets the handler using the keyboard frame's set_key_handler.
 
@@ -343,6 +844,33 @@ class WordyView:
         """
         self.keyboard_frame.set_key_handler (key, handler)
 
+    def guard_input(self, handler: Callable[[], None]) -> Callable[[], None]:
+        """ Wraps a key handler so that, while a guess is being revealed, the
+        key press is queued until the reveal is done (or ignored, if
+        reveal_input is "lock" in the settings). The controller runs every
+        key press (on-screen, physical or pasted) through here.
+
+        Parameters:
+            handler: (Callable[[], None]) The key handler to wrap.
+        """
+        def guarded():
+            if not self.input_enabled:
+                return
+            if self.guess_frame.is_revealing or self.queued_input:
+                if self.reveal_input == 'queue':
+                    self.queued_input.append(handler)
+                return
+            handler()
+
+        return guarded
+
+    def run_queued_input(self) -> None:
+        """ Runs the key presses that were queued during a reveal. """
+        while self.queued_input and self.input_enabled and not self.guess_frame.is_revealing:
+            self.queued_input.popleft()()
+        if not self.input_enabled:
+            self.queued_input.clear()
+
     def create_binding(self, event_type: str, action: Callable[[tk.Event], None]):
         """ Sets the function to call when the given event type happens. """
         self.window.bind(event_type, action)
@@ -362,6 +890,47 @@ class WordyView:
         self.guess_frame.set_letter(letter.capitalize(), guess_num, letter_index)
 
 
+    def mark_invalid_guess(self, guess_num: int, invalid: bool) -> None:
+        """ Marks (or unmarks) a guess whose letters so far can't be the start
+        of any valid word, by changing its text color.
+
+        Parameters:
+            guess_num: (int) The number of the guess to update
+            invalid: (bool) Whether the guess can no longer become a word.
+        """
+        guess_settings = self.settings['ui']['guesses']
+        if invalid:
+            color = guess_settings.get('invalid_text_color', 'red')
+        else:
+            color = guess_settings['initial_text_color']
+        self.guess_frame.set_guess_text_color(guess_num, color)
+
+
+    def schedule(self, delay: int, callback: Callable[[], None]) -> str:
+        """ Calls <callback> on the GUI thread after <delay> milliseconds.
+
+        Returns:
+            (str) An id that can be passed to window.after_cancel.
+        """
+        return self.window.after(delay, callback)
+
+    def schedule_idle(self, callback: Callable[[], None]) -> str:
+        """ Calls <callback> once the events that are already waiting (e.g. a
+        burst of key presses) have been handled.
+
+        Returns:
+            (str) An id that can be passed to window.after_cancel.
+        """
+        return self.window.after_idle(callback)
+
+    def get_clipboard(self) -> str:
+        """ Returns the text on the clipboard ("" if there is none). """
+        try:
+            return self.window.clipboard_get()
+        except tk.TclError:
+            return ""
+
+
     def start_gui(self):
         """ Starts the GUI. """
         self.window.mainloop()
@@ -372,16 +941,29 @@ class WordyView:
         self.window.destroy()
 
 
-    def display_guess_result(self, guess_num: int, guess_results: list[LetterState], letter_states: dict[str, LetterState]) -> None:
+    def display_guess_result(self, guess_num: int, guess_results: list[LetterState], letter_states: dict[str, LetterState],
+                             on_complete: Optional[Callable[[], None]] = None) -> None:
         """ Updates the guess frame to show the results for the given guess number.
 
+        The guess is revealed one letter at a time; once it is fully revealed
+        the keyboard colors are updated, <on_complete> is called, and any key
+        presses queued during the reveal are handled.
+
         Parameters:
              guess_num: (int) The number of the guess to update.
              guess_results: (list[LetterState]) The state of each letter in the guess.
              letter_states: (dict[str, LetterState]) The state of each letter in the guess.
+             on_complete: (Callable[[], None]) Called when the reveal is done.
         """
-        
-        pass # TODO: implement this a two lines of codes!
+        def reveal_done():
+            self.keyboard_frame.set_key_colors(letter_states)
+            if on_complete is not None:
+                on_complete()
+            # runs after the pending widget updates have been flushed
+            self.window.after_idle(lambda: self.update_counts.append(self.updates.take_counts()))
+            self.window.after_idle(self.run_queued_input)
+
+        self.guess_frame.show_guess_result(guess_num, guess_results, reveal_done)
 
 
     def display_message(self, msg: str) -> None:
@@ -393,7 +975,23 @@ class WordyView:
         self.message_frame.set_message(msg)
 
 
+    def display_candidates(self, count: int, sample: list[str]) -> None:
+        """ Displays how many answers are still possible, along with a few of
+        them.
+
+        Parameters:
+            count: (int) The number of possible answers.
+            sample: (list[str]) Some of the possible answers.
+        """
+        text = f"{count} left: " + ", ".join(word.upper() for word in sample)
+        if count > len(sample):
+            text += ", ..."
+        self.message_frame.set_candidates(text)
+
+
     def game_over(self) -> None:
         """ Ends the game by disabling all further keyboard input. """
+        self.input_enabled = False
+        self.queued_input.clear()
         self.keyboard_frame.disable()
 
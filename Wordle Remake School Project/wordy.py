@@ -8,26 +8,75 @@ Authors:
 - Luka Berg lberg@sandiego.edu
 """
 
-import string, json
-from typing import Callable
-from tkinter import Event
+import string, json, sys
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Sequence
+
+import lexicon
+from models import WordyModel, NotAWordError, HardModeError, LetterState, encode_pattern
+from journal import Journal
+from stats import GameStats, rebuild
+from workers import BackgroundWorker
+from prefix_index import PrefixIndex, get_prefix_index
+from pattern_index import get_pattern_index
+from candidates import CandidateSet
+
+# the view (and so Tk) is only imported when the app is run, so the
+# controller can also be used headless (see simulate and server)
+if TYPE_CHECKING:
+    from tkinter import Event
+    from views import WordyView
+
+try:
+    from solver import HintSolver
+except ImportError:  # NumPy isn't installed, so hints just show the answer
+    HintSolver = None
+
+# Tk event state bit set while Control is held
+CONTROL_MASK = 0x4
+
+
+def physical_key(e: "Event") -> Optional[str]:
+    """ Returns the Wordy key ("a" to "z", "back" or "enter") for a physical
+    key press, or None if the key doesn't type anything in the game. """
+    if e.state & CONTROL_MASK:
+        return None
+    keysym = e.keysym
+    if len(keysym) == 1 and keysym.lower() in string.ascii_lowercase:
+        return keysym.lower()
+    if keysym == "BackSpace":
+        return "back"
+    if keysym in ("Return", "KP_Enter"):
+        return "enter"
+    return None
 
-from views import WordyView
-from models import WordyModel, NotAWordError
 
 class WordyController:
     """ Controller class for WordyController. """
 
     WORD_SIZE: int    # number of characters in the correct word
     NUM_GUESSES: int  # number of guesses allowed by the user
+    CANDIDATE_SAMPLE_SIZE = 3  # number of remaining answers shown after each guess
 
     model: WordyModel  # the model used to verify the guess
-    view: WordyView    # the GUI view
+    view: "WordyView"  # the GUI view
 
     current_guess_num: int    # the guess number the user is currently on (starts at 0)
     current_guess: list[str]  # list of characters in the current guess
-
-    def __init__(self, view: WordyView, model: WordyModel, settings: dict) -> None:
+    guess_history: list[tuple[str, list[LetterState]]]  # each guess made and its result
+    solver: "HintSolver"      # the hint engine (created the first time a hint is asked for)
+    worker: BackgroundWorker  # runs hint computations off the GUI thread
+    prefix_index: PrefixIndex  # used to spot guesses that can't become a word
+    guess_is_dead: bool       # whether the current guess can no longer become a word
+    candidates: CandidateSet  # the answers that are still possible
+    journal: Optional[Journal]  # records every guess and game end (None to record nothing)
+    stats: Optional[GameStats]  # win statistics, updated when a game ends
+    game_id: int              # id of this game in the journal
+    pending_keys: deque[str]  # key presses (and pasted letters) not handled yet
+    keys_scheduled: bool      # whether handling the pending keys is scheduled
+
+    def __init__(self, view: "WordyView", model: WordyModel, settings: dict,
+                 journal: Optional[Journal] = None, stats: Optional[GameStats] = None) -> None:
         """ Initialize the controller. """
 
         self.WORD_SIZE = settings['word_size']
@@ -37,20 +86,35 @@ class WordyController:
 
         self.current_guess_num = 0
         self.current_guess = []
+        self.guess_history = []
+        self.solver = None
+        self.prefix_index = get_prefix_index(model.word_list)
+        self.guess_is_dead = False
+        self.candidates = CandidateSet(get_pattern_index(model.word_list))
+        self.journal = journal
+        self.stats = stats
+        self.game_id = 0 if journal is None else journal.new_game()
+        self.pending_keys = deque()
+        self.keys_scheduled = False
 
         # Create the view
         self.view = view
+        self.worker = BackgroundWorker(view.schedule)
 
         # TODO: use the set_key_handler method in your view to set up the
         # event handlers for all of the keyboard keys (A-Z, BACK, ENTER)
         for ch in string.ascii_lowercase:
             view.set_key_handler (ch, self.create_letter_handler(ch))
-        view.set_key_handler ("back", self.delete_last_letter)
-        view.set_key_handler ("enter", self.check_solution)
+        view.set_key_handler ("back", lambda: self.queue_keys(["back"]))
+        view.set_key_handler ("enter", lambda: self.queue_keys(["enter"]))
 
         # TODO: use create_binding to set Control-H to show the hint
 
         view.create_binding ("<Control-h>",self.show_hint)
+
+        # the physical keyboard, and pasting a word
+        view.create_binding ("<KeyPress>", self.physical_key_pressed)
+        view.create_binding ("<Control-v>", self.paste)
         # Start GUI
         self.view.start_gui()
 
@@ -61,9 +125,43 @@ class WordyController:
             self.current_guess.pop()
 
 
-    def show_hint(self, e: Event):
-        """ Secret function to display the answer in the messages frame. """
-        view.display_message (model.word)
+    def show_hint(self, e: "Event"):
+        """ Displays a hint in the messages frame: the guess that is expected
+        to rule out the most of the remaining possible answers.
+
+        The hint is computed in the background so the window stays
+        responsive; typing another letter or entering a guess cancels it,
+        so a hint is never shown for an outdated board. If the hint engine
+        isn't available, the answer itself is shown.
+        """
+        if HintSolver is None:
+            self.view.display_message (self.model.word)
+            return
+
+        self.worker.cancel_pending()
+        self.view.display_message ("Thinking...")
+
+        solver = None if self.solver is None else self.solver.copy()
+        history = list(self.guess_history)
+
+        def compute_hint():
+            nonlocal solver
+            if solver is None:
+                solver = HintSolver(self.model)
+                for guess, results in history:
+                    solver.observe(guess, results)
+            return solver, solver.best_guess()
+
+        def hint_ready(result):
+            solver, guess = result
+            if self.solver is None:
+                self.solver = solver
+            self.view.display_message ("Hint: try " + guess.upper())
+
+        def hint_failed(error):
+            self.view.display_message ("No hint available")
+
+        self.worker.submit(compute_hint, hint_ready, hint_failed)
         
 
     def create_letter_handler(self, letter: str) -> Callable[[], None]:
@@ -76,6 +174,10 @@ class WordyController:
         Note that if the current guess already is already at the WORD_SIZE,
         the handler shouldn't do anything.
 
+        The letter is queued behind any other pending key presses (see
+        queue_keys), so on-screen and physical key presses are handled in the
+        order they were made.
+
         Precondition: letter is a single character.
 
         Parameters:
@@ -88,13 +190,88 @@ class WordyController:
         """
         def call ():
             assert len(letter) ==1
-            if len(self.current_guess) <= self.WORD_SIZE -1:
-                self.current_guess.append(letter)
-                view.set_letter (letter, self.current_guess_num, len (self.current_guess)-1)
+            self.queue_keys(letter)
             return None
 
         return call
 
+    def type_letters(self, letters: str) -> None:
+        """ Adds <letters> to the current guess (as many as fit) and shows
+        them in the view. The guess is only checked against the prefix index
+        once, after all of the letters have been added.
+
+        Parameters:
+            letters (str): The letters to add, in order.
+        """
+        self.worker.cancel_pending()
+        room = self.WORD_SIZE - len(self.current_guess)
+        if room <= 0 or not letters:
+            return
+        for letter in letters[:room]:
+            self.current_guess.append(letter)
+            self.view.set_letter (letter, self.current_guess_num, len (self.current_guess)-1)
+        self.update_prefix_status()
+
+    def physical_key_pressed(self, e: "Event") -> None:
+        """ An event handler for presses of the physical keyboard. The key is
+        queued, and every key queued before the event loop is idle again is
+        handled in one go (see handle_pending_keys). """
+        key = physical_key(e)
+        if key is not None:
+            self.queue_keys([key])
+
+    def paste(self, e: "Event") -> str:
+        """ An event handler that types the word on the clipboard, as if its
+        letters had been typed one after the other (as many as fit in the
+        current guess). """
+        text = self.view.get_clipboard().strip().lower()
+        self.queue_keys([ch for ch in text if ch in string.ascii_lowercase])
+        return "break"
+
+    def queue_keys(self, keys: Iterable[str]) -> None:
+        """ Queues key presses ("a" to "z", "back" or "enter") from the
+        on-screen keyboard, the physical keyboard or the clipboard, and makes
+        sure they are handled when the event loop is idle. """
+        self.pending_keys.extend(keys)
+        if self.pending_keys and not self.keys_scheduled:
+            self.keys_scheduled = True
+            self.view.schedule_idle(self.handle_pending_keys)
+
+    def handle_pending_keys(self) -> None:
+        """ Handles every pending key, in order. Runs of letters are added
+        together (see type_letters), so a burst of typing updates the guess
+        once instead of once per key.
+
+        The keys up to and including each ENTER are handled as one input of
+        the view (see WordyView.guard_input), so while that guess is being
+        revealed the keys after it wait their turn.
+        """
+        self.keys_scheduled = False
+        while self.pending_keys:
+            keys = []
+            while self.pending_keys:
+                keys.append(self.pending_keys.popleft())
+                if keys[-1] == "enter":
+                    break
+            self.view.guard_input(lambda keys=keys: self.handle_keys(keys))()
+
+    def handle_keys(self, keys: Sequence[str]) -> None:
+        """ Handles key presses ("a" to "z", "back" or "enter") in order. """
+        letters = []
+        for key in keys:
+            if len(key) == 1:
+                letters.append(key)
+                continue
+            if letters:
+                self.type_letters(''.join(letters))
+                letters = []
+            if key == "back":
+                self.delete_last_letter()
+            else:
+                self.check_solution()
+        if letters:
+            self.type_letters(''.join(letters))
+
     def delete_last_letter(self) -> None:
         """ An event handler that will delete the last letter from the current
         guess and remove it from the view.
@@ -104,7 +281,50 @@ class WordyController:
         """
         if len(self.current_guess) >= 0:
             self.current_guess = self.current_guess[:-1]
-            view.set_letter ("", self.current_guess_num, len (self.current_guess))
+            self.view.set_letter ("", self.current_guess_num, len (self.current_guess))
+            self.update_prefix_status()
+
+    def update_prefix_status(self) -> None:
+        """ Checks whether the current guess can still be completed into a
+        valid word, and has the view mark the guess when that changes. """
+        is_dead = not self.prefix_index.has_prefix(''.join(self.current_guess))
+        if is_dead != self.guess_is_dead:
+            self.guess_is_dead = is_dead
+            self.view.mark_invalid_guess(self.current_guess_num, is_dead)
+
+
+    def record_guess(self, word: str, results: list[LetterState]) -> None:
+        """ Records an accepted guess and its result, and updates the hint
+        solver and the remaining candidates with it.
+
+        Parameters:
+            word (str): The guess.
+            results (list[LetterState]): The state of each letter in the guess.
+        """
+        self.guess_history.append((word, results))
+        if self.solver is not None:
+            self.solver.observe(word, results)
+        self.candidates.narrow(word, results)
+        if self.journal is not None:
+            self.journal.record_guess(self.game_id, len(self.guess_history) - 1,
+                                      lexicon.word_id(self.model.word_list, word), encode_pattern(results))
+
+    def record_game_end(self, won: bool) -> None:
+        """ Records the end of the game in the journal and the statistics.
+
+        Parameters:
+            won (bool): Whether the answer was guessed.
+        """
+        if self.journal is not None:
+            self.journal.record_game_end(self.game_id, self.current_guess_num,
+                                         lexicon.word_id(self.model.word_list, self.model.word), won)
+        if self.stats is not None:
+            self.stats.add_game(won, self.current_guess_num)
+
+    def show_candidates(self) -> None:
+        """ Displays the number of remaining possible answers in the view. """
+        self.view.display_candidates(self.candidates.count,
+                                     self.candidates.sample(self.CANDIDATE_SAMPLE_SIZE))
 
 
     def check_solution(self) -> None:
@@ -117,7 +337,9 @@ class WordyController:
 
         If the wordy model indicates that the guess is not a word, this
         function should ONLY display a message in the view that reads, "XXX is
-        not a valid word." (where XXX is the guess).
+        not a valid word." (where XXX is the guess). Likewise, in hard mode, a
+        guess that ignores a revealed hint only displays the model's message
+        about that hint.
 
         If the guess was correct, in addition to updating the colors of the
         guess, the view should display a message that reads, "Correct!!! Wordy
@@ -129,29 +351,44 @@ class WordyController:
 
         In the case of a correct guess or running out of guesses, the view's
         game_over method should be called to disable the user from further
-        interacting with the keyboard.
+        interacting with the keyboard. Both the message and game_over wait
+        until the view has finished revealing the guess.
         """
+        # a hint still being computed would be for the guesses before this one
+        self.worker.cancel_pending()
+
         if len (self.current_guess) == self.WORD_SIZE:
             word = ''.join(self.current_guess)
             try:
-                check = model.check_guess(word)
-                view.guess_frame.show_guess_result(self.current_guess_num, check[1])
-                view.keyboard_frame.set_key_colors (check[2])
+                check = self.model.check_guess(word)
+                self.record_guess(word, check[1])
                 self.current_guess_num+=1
                 self.current_guess=[]
+                self.guess_is_dead = False
                 if check[0]:
-                    view.display_message ("Correct!!! Word Up, y'all!")
-                    view.game_over()
+                    end_message = "Correct!!! Word Up, y'all!"
+                elif self.current_guess_num >= self.NUM_GUESSES:
+                    end_message = "Darn. You are out of guesses. Better luck next time!"
                 else:
-                    if self.current_guess_num >= self.NUM_GUESSES:
-                        view.display_message ("Darn. You are out of guesses. Better luck next time!")
-                        view.game_over()
-            except:
-                word in model.word_list
-                if word not in model.word_list:
-                    view.display_message (word + " is not a valid word")
+                    end_message = None
+
+                if end_message is not None:
+                    self.record_game_end(check[0])
+
+                # wait for the guess to be revealed before ending the game
+                def reveal_done():
+                    self.show_candidates()
+                    if end_message is not None:
+                        self.view.display_message (end_message)
+                        self.view.game_over()
+
+                self.view.display_guess_result(self.current_guess_num-1, check[1], check[2], reveal_done)
+            except NotAWordError:
+                self.view.display_message (word + " is not a valid word")
+            except HardModeError as e:
+                self.view.display_message (str(e))
         else:   
-            view.display_message("Word Not Finished !!!!!!!!!!")
+            self.view.display_message("Word Not Finished !!!!!!!!!!")
 
 
 
@@ -160,7 +397,46 @@ if __name__ == "__main__":
         settings = json.load(settings_file)
 
     # create model, view, then controller
-    model = WordyModel(settings['word_size'], settings['word_list_file'])
+    controller_class = WordyController
+    if settings.get('boards', 1) > 1:
+        from multiboard import MultiWordyModel, MultiWordyController as controller_class, adjust_settings
+
+        for message in adjust_settings(settings):
+            print(f"settings.json: {message}", file=sys.stderr)
+        model = MultiWordyModel(settings['word_size'], settings['word_list_file'], settings['boards'])
+    else:
+        if settings.get('mode', 'classic') == 'adversarial':
+            from adversarial import AdversarialWordyModel as model_class
+        else:
+            model_class = WordyModel
+
+        model = model_class(settings['word_size'], settings['word_list_file'],
+                            hard_mode=settings.get('hard_mode', False))
+    # the journal and statistics are kept across runs, unless turned off;
+    # multi-board games aren't recorded (see MultiWordyController)
+    journal_dir = settings.get('journal_dir')
+    journal = stats = None
+    if journal_dir and controller_class is WordyController:
+        stats = rebuild(journal_dir)
+        journal = Journal(journal_dir, settings['word_size'])
+
+    from views import WordyView
     view = WordyView(settings)
-    controller = WordyController(view, model, settings)
+
+    # latency instrumentation is only installed when a trace file is set
+    tracer = None
+    if settings.get('trace_file'):
+        from instrumentation import Tracer, instrument
+        tracer = Tracer()
+        instrument(model, view, tracer)
+
+    controller = controller_class(view, model, settings, journal, stats)
+
+    # the window has been closed
+    if journal is not None:
+        journal.close()
+        print(stats)
+    if tracer is not None:
+        tracer.save_trace(settings['trace_file'])
+        print(tracer.summary())
 
@@ -0,0 +1,109 @@
+"""
+Module: workers
+
+Runs costly work (such as computing hints) off the Tk main thread.
+
+Tk may only be touched from the thread running mainloop, so tasks run on a
+background thread and their results are handed back to the main thread
+through a queue that is polled with the view's timer (window.after). Every
+task belongs to a generation; cancel_pending starts a new generation, and
+results from older generations are dropped instead of being delivered.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class BackgroundWorker:
+    """ A single background thread whose results are delivered on the Tk main
+    thread. """
+
+    # instance variables
+    schedule: Callable[[int, Callable[[], None]], Any]  # runs a callback after a delay (in ms) on the main thread
+    poll_interval: int          # how often (in ms) to check for finished tasks
+    generation: int             # tasks submitted before the last cancel_pending have an older generation
+    pending: set[Future]        # tasks that haven't been delivered yet
+    results: queue.Queue        # finished tasks waiting to be delivered
+    polling: bool               # whether a poll is currently scheduled
+
+    def __init__(self, schedule: Callable[[int, Callable[[], None]], Any], poll_interval: int = 20) -> None:
+        self.schedule = schedule
+        self.poll_interval = poll_interval
+        self.generation = 0
+        self.pending = set()
+        self.results = queue.Queue()
+        self.polling = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wordy-worker")
+        self._lock = threading.Lock()
+
+    def submit(self, task: Callable[[], Any], on_done: Callable[[Any], None],
+               on_error: Optional[Callable[[BaseException], None]] = None) -> None:
+        """ Runs <task> on the background thread, then calls <on_done> with its
+        result on the main thread (or <on_error> with the exception it raised).
+
+        Neither callback is called if cancel_pending is called first.
+
+        Parameters:
+            task (Callable[[], Any]): The work to do in the background.
+            on_done (Callable[[Any], None]): Called with the task's result.
+            on_error (Callable[[BaseException], None]): Called with the
+                exception raised by the task, if any.
+        """
+        generation = self.generation
+        future = self._executor.submit(task)
+
+        with self._lock:
+            self.pending.add(future)
+
+        def finished(f: Future) -> None:
+            # called on the worker thread: only hand the result over
+            self.results.put((generation, f, on_done, on_error))
+
+        future.add_done_callback(finished)
+
+        if not self.polling:
+            self.polling = True
+            self.schedule(self.poll_interval, self.poll)
+
+    def cancel_pending(self) -> None:
+        """ Cancels all tasks that haven't been delivered yet. Tasks that are
+        already running finish, but their results are dropped. """
+        self.generation += 1
+        with self._lock:
+            for future in self.pending:
+                future.cancel()
+
+    def poll(self) -> None:
+        """ Delivers the results of finished tasks. Runs on the main thread. """
+        while True:
+            try:
+                generation, future, on_done, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            with self._lock:
+                self.pending.discard(future)
+
+            if generation != self.generation or future.cancelled():
+                continue
+
+            error = future.exception()
+            if error is None:
+                on_done(future.result())
+            elif on_error is not None:
+                on_error(error)
+
+        with self._lock:
+            has_pending = len(self.pending) > 0
+
+        if has_pending:
+            self.schedule(self.poll_interval, self.poll)
+        else:
+            self.polling = False
+
+    def shutdown(self) -> None:
+        """ Cancels pending tasks and stops the background thread. """
+        self.cancel_pending()
+        self._executor.shutdown(wait=False)